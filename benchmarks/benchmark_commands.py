@@ -0,0 +1,262 @@
+"""Measure the symmetry table build and the geometry commands on large meshes.
+
+The meshes are held in memory by the numpy mesh backend, so this benchmark only
+needs numpy and can be run outside of Maya with :
+
+    python benchmarks/benchmark_commands.py --output results.json
+
+Each case reports its wall time, the peak memory allocated while it runs and
+its throughput in vertices per second. The results written with ``--output``
+can be compared between releases with ``--compare``.
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from benchmark_matching import uv_sphere
+from sym_mesh.domain import backend, executor, table
+from sym_mesh.domain.commands import deformation_commands
+from sym_mesh.domain.commands.geometry_commands import ExtractAxesCommand
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000, 5000000]
+
+COMMANDS = (
+    ("bake", deformation_commands.BakeDifferenceCommand),
+    ("revert", deformation_commands.RevertToBaseCommand),
+    ("symmetrize", deformation_commands.SymmetrizeCommand),
+    ("flip", deformation_commands.FlipCommand),
+)
+
+# Number of percentage changes applied in the live slider case.
+SLIDER_STEPS = 20
+
+
+def measure(function):
+    """Run a function once and measure it.
+
+    :param function: function to measure.
+    :type function: callable
+
+    :return: result of the function, wall time in seconds and peak memory in
+    bytes allocated while it ran.
+    :rtype: tuple
+    """
+    tracemalloc.start()
+    try:
+        start = time.perf_counter()
+        result = function()
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, seconds, peak
+
+
+def create_meshes(mesh_backend, vertex_count, seed=0):
+    """Add a symmetrical base mesh and an asymmetrical target mesh to a backend.
+
+    :param mesh_backend: backend holding the meshes.
+    :type mesh_backend: sym_mesh.domain.backend.MemoryBackend
+
+    :param vertex_count: approximate number of vertices of the meshes.
+    :type vertex_count: int
+
+    :param seed: seed of the noise added to the target mesh.
+    :type seed: int
+
+    :return: number of vertices of the meshes.
+    :rtype: int
+    """
+    positions = uv_sphere(vertex_count)
+    noise = np.random.default_rng(seed).normal(scale=0.05, size=positions.shape)
+    mesh_backend.add_mesh("base", positions)
+    mesh_backend.add_mesh("target", positions + noise)
+    return len(positions)
+
+
+def run_size(vertex_count, engine, repeat, workers=1):
+    """Run every benchmark case on meshes of the given size.
+
+    :param vertex_count: approximate number of vertices of the meshes.
+    :type vertex_count: int
+
+    :param engine: engine used to build the symmetry table.
+    :type engine: str
+
+    :param repeat: number of runs of each case, the fastest one is kept.
+    :type repeat: int
+
+    :param workers: number of threads used to build the symmetry table.
+    :type workers: int
+
+    :return: results of the cases.
+    :rtype: list[dict]
+    """
+    mesh_backend = backend.MemoryBackend()
+    backend.set_backend(mesh_backend)
+    vertex_count = create_meshes(mesh_backend, vertex_count)
+    results = []
+
+    def record(case, function, operations=1, teardown=None):
+        best = None
+        for _ in range(repeat):
+            result, seconds, peak = measure(function)
+            if teardown is not None:
+                teardown()
+            if best is None or seconds < best[1]:
+                best = (result, seconds, peak)
+        result, seconds, peak = best
+        results.append(
+            {
+                "case": case,
+                "vertices": vertex_count,
+                "seconds": seconds / operations,
+                "peak_bytes": peak,
+                "vertices_per_second": vertex_count * operations / seconds,
+            }
+        )
+        return result
+
+    base_table = record(
+        "table_build",
+        lambda: table.GeometryTable("base", engine=engine, workers=workers),
+    )
+    target_table = table.GeometryTable("target", lazy=True)
+    executor_ = executor.Executor()
+    original_positions = mesh_backend.get_path("target").points.copy()
+
+    def undo_command():
+        executor_.stash_command()
+        executor_.undo()
+
+    for name, command in COMMANDS:
+        record(
+            name,
+            lambda: executor_.execute(
+                command, base_table=base_table, target_table=target_table
+            ),
+            teardown=undo_command,
+        )
+
+    executor_.execute(
+        deformation_commands.SymmetrizeCommand,
+        base_table=base_table,
+        target_table=target_table,
+    )
+    command = executor_.command
+
+    def drag_slider():
+        for step in range(SLIDER_STEPS):
+            command.percentage = 100.0 * step / (SLIDER_STEPS - 1)
+
+    record("slider", drag_slider, operations=SLIDER_STEPS)
+    executor_.stash_command()
+    record("undo", executor_.undo, teardown=executor_.redo)
+    executor_.undo()
+    record("redo", executor_.redo, teardown=executor_.undo)
+
+    record(
+        "extract_axes",
+        lambda: executor_.execute(
+            ExtractAxesCommand, base_table=base_table, target_table=target_table
+        ),
+        teardown=lambda: executor_.command.undo(),
+    )
+
+    if not np.array_equal(mesh_backend.get_path("target").points, original_positions):
+        raise RuntimeError("The target mesh was not restored by the undo commands.")
+    backend.set_backend(None)
+    return results
+
+
+def compare(results, reference, tolerance):
+    """Print the cases that are slower than in the reference results.
+
+    :param results: results of the current run.
+    :type results: list[dict]
+
+    :param reference: results of a previous run.
+    :type reference: list[dict]
+
+    :param tolerance: relative slowdown above which a case is reported.
+    :type tolerance: float
+
+    :return: number of slower cases.
+    :rtype: int
+    """
+    previous = {(entry["case"], entry["vertices"]): entry for entry in reference}
+    regressions = 0
+    for entry in results:
+        old = previous.get((entry["case"], entry["vertices"]))
+        if old is None:
+            continue
+        ratio = entry["seconds"] / old["seconds"]
+        if ratio > 1.0 + tolerance:
+            regressions += 1
+            print(
+                "Regression : {} on {} vertices is {:.0%} slower".format(
+                    entry["case"], entry["vertices"], ratio - 1.0
+                )
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument(
+        "--engine", default="vectorized", choices=table.GeometryTable.ENGINES
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--output", help="path of the json file to write")
+    parser.add_argument("--compare", help="path of the json results to compare to")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    row = "{:>10} {:>14} {:>12} {:>12} {:>14}"
+    print(row.format("vertices", "case", "seconds", "peak MB", "vertices/s"))
+    results = []
+    for size in args.sizes:
+        for entry in run_size(size, args.engine, args.repeat, args.workers):
+            results.append(entry)
+            print(
+                row.format(
+                    entry["vertices"],
+                    entry["case"],
+                    "{:.4f}".format(entry["seconds"]),
+                    "{:.1f}".format(entry["peak_bytes"] / 1024.0**2),
+                    "{:.3g}".format(entry["vertices_per_second"]),
+                )
+            )
+
+    if args.output:
+        report = {
+            "date": datetime.datetime.now().isoformat(),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "engine": args.engine,
+            "repeat": args.repeat,
+            "workers": args.workers,
+            "results": results,
+        }
+        with open(args.output, "w") as stream:
+            json.dump(report, stream, indent=2)
+
+    if args.compare:
+        with open(args.compare) as stream:
+            reference = json.load(stream)["results"]
+        if compare(results, reference, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
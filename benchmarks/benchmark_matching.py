@@ -0,0 +1,98 @@
+"""Compare the symmetry matching engines on dense and sparse meshes.
+
+This benchmark only needs numpy and can be run outside of Maya with :
+
+    python benchmarks/benchmark_matching.py
+"""
+
+import argparse
+import math
+import time
+
+import numpy as np
+
+from sym_mesh.domain import matching
+
+
+def uv_sphere(vertex_count, radius=10.0):
+    """Build the vertices of a UV sphere symmetrical on the X, Y and Z axes.
+
+    :param vertex_count: approximate number of vertices of the sphere.
+    :type vertex_count: int
+
+    :param radius: radius of the sphere.
+    :type radius: float
+
+    :return: positions of the vertices of the sphere.
+    :rtype: numpy.ndarray
+    """
+    rings = max(int(math.sqrt(vertex_count / 2.0)), 2)
+    segments = 2 * rings
+    theta = np.linspace(0.0, math.pi, rings + 1)[1:-1]
+    phi = np.arange(segments) * (2.0 * math.pi / segments)
+    theta, phi = np.meshgrid(theta, phi, indexing="ij")
+    positions = np.stack(
+        [np.sin(theta) * np.cos(phi), np.cos(theta), np.sin(theta) * np.sin(phi)],
+        axis=-1,
+    ).reshape(-1, 3)
+    poles = np.array([[0.0, 1.0, 0.0], [0.0, -1.0, 0.0]])
+    return np.concatenate([positions, poles]) * radius
+
+
+def run(engine, positions, threshold):
+    """Match the symmetrical vertices of a mesh on the X axis with an engine.
+
+    :param engine: "spatial_hash" or "nearest".
+    :type engine: str
+
+    :param positions: positions of all the mesh vertices.
+    :type positions: numpy.ndarray
+
+    :param threshold: maximum distance between a mirrored vertex and its match.
+    :type threshold: float
+
+    :return: duration of the matching in seconds, number of targets and number
+    of ambiguous vertices.
+    :rtype: tuple[float, int, int]
+    """
+    start = time.perf_counter()
+    if engine == "spatial_hash":
+        targets, _ = matching.match_spatial_hash(positions, 0, threshold, True)
+        ambiguous = 0
+    else:
+        targets, _, ambiguous = matching.match_nearest(positions, 0, threshold, True)
+        ambiguous = int(ambiguous.sum())
+    return time.perf_counter() - start, len(targets), ambiguous
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10000, 100000, 1000000]
+    )
+    args = parser.parse_args()
+
+    row = "{:>10} {:>8} {:>12} {:>10} {:>10} {:>10}"
+    print(row.format("vertices", "mesh", "engine", "seconds", "targets", "ambiguous"))
+    for size in args.sizes:
+        positions = uv_sphere(size)
+        spacing = 10.0 * math.pi / math.sqrt(size / 2.0)
+        # Sparse: the threshold is much smaller than the vertex spacing, dense:
+        # every mirror position has several vertices within the threshold.
+        for mesh, threshold in (("sparse", 0.001), ("dense", 3.0 * spacing)):
+            for engine in ("spatial_hash", "nearest"):
+                seconds, targets, ambiguous = run(engine, positions, threshold)
+                print(
+                    row.format(
+                        len(positions),
+                        mesh,
+                        engine,
+                        "{:.3f}".format(seconds),
+                        targets,
+                        ambiguous,
+                    )
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,645 @@
+"""Access to the meshes of the host application.
+
+Every read and write of mesh data done by the domain goes through the active
+:class:`MeshBackend`. :class:`MayaBackend` works on the meshes of the current
+Maya session, :class:`MemoryBackend` on numpy arrays held in memory, which
+allows running the domain outside of Maya, for example to profile it.
+"""
+
+import abc
+import ctypes
+import itertools
+import logging
+import uuid
+
+import numpy as np
+
+try:
+    from maya import cmds as mc
+    from maya.api import OpenMaya as om2
+
+    from sym_mesh.domain import shading
+except ImportError:  # pragma: no cover
+    mc = om2 = shading = None
+
+log = logging.getLogger(__name__)
+
+# Spaces in which the point positions can be queried, with the values of the
+# corresponding maya.api.OpenMaya.MSpace constants.
+OBJECT_SPACE = 2
+WORLD_SPACE = 4
+
+# Plugs of a Maya mesh shape that hold its points or its topology.
+MESH_CHANGE_PLUGS = ("inMesh", "pnts", "vrts", "edge", "face")
+
+_backend = None
+
+
+def get_backend():
+    """Get the active mesh backend. When none was set, this is a
+    :class:`MayaBackend` inside Maya and an empty :class:`MemoryBackend`
+    everywhere else.
+
+    :rtype: MeshBackend
+    """
+    global _backend
+    if _backend is None:
+        _backend = MayaBackend() if om2 is not None else MemoryBackend()
+    return _backend
+
+
+def set_backend(backend):
+    """Set the mesh backend used by the domain.
+
+    :param backend: backend to use, None to go back to the default backend.
+    :type backend: MeshBackend
+    """
+    global _backend
+    _backend = backend
+
+
+class CopyStats(object):
+    def __init__(self):
+        """Count the copies of point positions made by the point I/O functions,
+        to measure how much memory traffic an operation generates."""
+        self.count = 0
+        self.nbytes = 0
+
+    def __str__(self):
+        return "{} point copies, {} bytes".format(  # pragma: no cover
+            self.count, self.nbytes
+        )
+
+    def record(self, array):
+        """Record a copy of point positions.
+
+        :param array: copied positions.
+        :type array: numpy.ndarray
+        """
+        self.count += 1
+        self.nbytes += array.nbytes
+
+    def reset(self):
+        self.count = 0
+        self.nbytes = 0
+
+
+copy_stats = CopyStats()
+
+
+class MeshBackend(metaclass=abc.ABCMeta):
+    """Operations on meshes needed by the domain.
+
+    Meshes are designated by the path objects returned by :meth:`get_path`,
+    which remain valid when the mesh is renamed.
+    """
+
+    @abc.abstractmethod
+    def get_path(self, name):
+        """Get the path of a mesh.
+
+        :param name: name of the mesh.
+        :type name: str
+
+        :return: path of the mesh.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_name(self, path):
+        """Get the full name of a mesh.
+
+        :param path: path of the mesh.
+
+        :rtype: str
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_node_id(self, path):
+        """Get the identifier of the node of a mesh, which is kept when the mesh
+        is renamed and differs from the identifier of any other mesh, even one
+        created later with the same name.
+
+        :param path: path of the mesh.
+
+        :rtype: str
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_points(self, path, space=OBJECT_SPACE):
+        """Get the positions of the points of a mesh, without copying them when
+        possible. The returned array must not be modified nor kept.
+
+        :param path: path of the mesh.
+
+        :param space: space in which the positions are queried.
+        :type space: int
+
+        :return: ``(n, 3)`` positions of the points.
+        :rtype: numpy.ndarray
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def set_points(self, path, positions, space=OBJECT_SPACE):
+        """Set the positions of the points of a mesh.
+
+        :param path: path of the mesh.
+
+        :param positions: ``(n, 3)`` positions of the points.
+        :type positions: numpy.ndarray
+
+        :param space: space in which the positions are set.
+        :type space: int
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_topology(self, path):
+        """Get the numbers describing the topology of a mesh.
+
+        :param path: path of the mesh.
+
+        :return: number of vertices, edges, polygons and face vertices.
+        :rtype: tuple[int, int, int, int]
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_face_vertices(self, path):
+        """Get the connectivity of a mesh.
+
+        :param path: path of the mesh.
+
+        :return: number of vertices of each polygon and indices of the vertices
+        of all the polygons, one after the other.
+        :rtype: numpy.ndarray, numpy.ndarray
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def duplicate(self, path):
+        """Duplicate a mesh.
+
+        :param path: path of the mesh to duplicate.
+
+        :return: path of the new mesh.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def rename(self, path, name):
+        """Rename a mesh.
+
+        :param path: path of the mesh to rename.
+
+        :param name: new name of the mesh.
+        :type name: str
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def delete(self, path):
+        """Delete a mesh.
+
+        :param path: path of the mesh to delete.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def create_blendshape(self, paths, name):
+        """Create a blendshape on the last mesh, with the other meshes as targets.
+
+        :param paths: paths of the target meshes followed by the base mesh.
+        :type paths: list
+
+        :param name: name of the blendshape.
+        :type name: str
+
+        :return: name of the blendshape.
+        :rtype: str
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_translation(self, path):
+        """Get the world space translation of a mesh.
+
+        :param path: path of the mesh.
+
+        :rtype: list[float]
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def translate(self, path, translation):
+        """Move a mesh relatively to its current position.
+
+        :param path: path of the mesh.
+
+        :param translation: translation to add to the mesh position.
+        :type translation: list[float]
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def assign_default_shader(self, path):
+        """Assign the default shader to a mesh.
+
+        :param path: path of the mesh.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_selected_vertices(self):
+        """Get the currently selected vertices.
+
+        :return: path of the mesh and indices of its selected vertices, or None
+        and no indices if no vertex is selected.
+        :rtype: tuple
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def select_vertices(self, path, indices):
+        """Replace the current selection by vertices of a mesh.
+
+        :param path: path of the mesh.
+
+        :param indices: indices of the vertices to select.
+        :type indices: numpy.ndarray
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def add_change_callback(self, path, callback):
+        """Call a function whenever the points or the topology of a mesh change,
+        or when the mesh is deleted.
+
+        :param path: path of the mesh.
+
+        :param callback: function called without arguments.
+        :type callback: callable
+
+        :return: identifier of the callback, see :meth:`remove_change_callback`.
+        """
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def remove_change_callback(self, callback_id):
+        """Stop calling a function added with :meth:`add_change_callback`.
+
+        :param callback_id: identifier of the callback.
+        """
+        raise NotImplementedError
+
+
+class MayaBackend(MeshBackend):
+    """Meshes of the current Maya session, designated by their MDagPath."""
+
+    def get_path(self, name):
+        selection_list = om2.MSelectionList()
+        selection_list.add(name)
+        return selection_list.getDagPath(0)
+
+    def get_name(self, path):
+        return path.fullPathName()
+
+    def get_node_id(self, path):
+        return om2.MFnDependencyNode(path.node()).uuid().asString()
+
+    def get_points(self, path, space=OBJECT_SPACE):
+        """Get the positions of the points of a mesh.
+
+        The object space positions are read in place from the internal point
+        buffer of the mesh when the legacy API exposes it, which avoids creating
+        a python object per point. Otherwise, and for world space positions,
+        they are converted from the point array returned by the API.
+        """
+        mfn_object = om2.MFnMesh(path)
+
+        if space in (None, OBJECT_SPACE):
+            try:
+                return self._get_raw_points(path, mfn_object.numVertices)
+            except Exception as error:  # pragma: no cover
+                log.debug("Unable to read the raw points : %s", error)
+
+        # Point arrays hold homogeneous (x, y, z, w) points.
+        point_array = mfn_object.getPoints(space=space or OBJECT_SPACE)
+        positions = np.array(point_array, dtype=np.float64).reshape(-1, 4)
+        copy_stats.record(positions)
+        return positions[:, :3]
+
+    @staticmethod
+    def _get_raw_points(path, vertex_count):
+        """Get a view on the internal float buffer holding the object space
+        positions of the points of a mesh. The view is only valid until the mesh
+        is modified.
+
+        :param path: path of the mesh.
+        :type path: maya.api.OpenMaya.MDagPath
+
+        :param vertex_count: number of vertices of the mesh.
+        :type vertex_count: int
+
+        :return: ``(n, 3)`` float32 view on the point positions.
+        :rtype: numpy.ndarray
+        """
+        # The python API 2.0 has no access to the raw points of a mesh.
+        from maya import OpenMaya as om1
+
+        selection_list = om1.MSelectionList()
+        selection_list.add(path.fullPathName())
+        legacy_dag_path = om1.MDagPath()
+        selection_list.getDagPath(0, legacy_dag_path)
+        pointer = om1.MFnMesh(legacy_dag_path).getRawPoints()
+
+        buffer = (ctypes.c_float * (vertex_count * 3)).from_address(int(pointer))
+        return np.frombuffer(buffer, dtype=np.float32).reshape(vertex_count, 3)
+
+    def set_points(self, path, positions, space=OBJECT_SPACE):
+        point_array = om2.MPointArray(positions.tolist())
+        copy_stats.record(positions)
+        om2.MFnMesh(path).setPoints(point_array, space or OBJECT_SPACE)
+
+    def get_topology(self, path):
+        mfn_object = om2.MFnMesh(path)
+        return (
+            mfn_object.numVertices,
+            mfn_object.numEdges,
+            mfn_object.numPolygons,
+            mfn_object.numFaceVertices,
+        )
+
+    def get_face_vertices(self, path):
+        counts, indices = om2.MFnMesh(path).getVertices()
+        return np.array(counts, dtype=np.int32), np.array(indices, dtype=np.int32)
+
+    def duplicate(self, path):
+        mesh = om2.MFnMesh(path).duplicate()
+        return om2.MFnDagNode(mesh).getPath()
+
+    def rename(self, path, name):
+        dag_modifier = om2.MDagModifier()
+        dag_modifier.renameNode(path.node(), name)
+        dag_modifier.doIt()
+
+    def delete(self, path):
+        dag_modifier = om2.MDagModifier()
+        dag_modifier.deleteNode(path.node())
+        dag_modifier.doIt()
+
+    def create_blendshape(self, paths, name):
+        # TODO : update this method to use maya API 2.0 instead of cmds
+        blendshape = mc.blendShape([self.get_name(path) for path in paths])[0]
+        return mc.rename(blendshape, name)
+
+    def get_translation(self, path):
+        return mc.xform(
+            self.get_name(path), query=True, worldSpace=True, translation=True
+        )
+
+    def translate(self, path, translation):
+        mc.xform(self.get_name(path), relative=True, translation=translation)
+
+    def assign_default_shader(self, path):
+        shading.assign_default_shader(self.get_name(path))
+
+    def get_selected_vertices(self):
+        # Get current selection
+        selection_list = om2.MGlobal.getActiveSelectionList()
+        log.info("Selection list is : %s" % selection_list)
+
+        # Get the dag dir_path and components of the first item in the list
+        if selection_list.length() == 0:
+            log.warning("No selection found.")
+            return None, np.zeros(0, dtype=np.int32)
+
+        obj_dag_path, components = selection_list.getComponent(0)
+        # If no vertices selected
+        if components.isNull():
+            return None, np.zeros(0, dtype=np.int32)
+
+        # Query vertex indices
+        fn_components = om2.MFnSingleIndexedComponent(components)
+        indices = np.array(fn_components.getElements(), dtype=np.int32)
+        return selection_list.getDagPath(0), indices
+
+    def select_vertices(self, path, indices):
+        """Select the vertices from a single indexed component holding all
+        their indices, built in bulk in time linear in the number of selected
+        vertices instead of visiting every vertex of the mesh."""
+        fn_component = om2.MFnSingleIndexedComponent()
+        component = fn_component.create(om2.MFn.kMeshVertComponent)
+        fn_component.addElements(np.asarray(indices, dtype=np.int64).tolist())
+        vtcs_to_select = om2.MSelectionList()
+        vtcs_to_select.add((path, component))
+        om2.MGlobal.setActiveSelectionList(vtcs_to_select)
+
+    def add_change_callback(self, path, callback):
+        """Call a function when a plug holding the points or the topology of
+        the mesh shape is dirtied, see ``MESH_CHANGE_PLUGS``, or when the shape
+        is about to be deleted."""
+        shape_path = om2.MDagPath(path)
+        if shape_path.hasFn(om2.MFn.kTransform):
+            shape_path.extendToShape()
+        shape = shape_path.node()
+
+        def plug_dirty(node, plug, client_data):
+            name = plug.partialName(useLongNames=True)
+            if name.split("[", 1)[0].split(".", 1)[0] in MESH_CHANGE_PLUGS:
+                callback()
+
+        return (
+            om2.MNodeMessage.addNodeDirtyPlugCallback(shape, plug_dirty),
+            om2.MNodeMessage.addNodeAboutToDeleteCallback(
+                shape, lambda node, modifier, client_data: callback()
+            ),
+        )
+
+    def remove_change_callback(self, callback_id):
+        om2.MMessage.removeCallbacks(list(callback_id))
+
+
+class MemoryMesh(object):
+    def __init__(
+        self,
+        name,
+        positions,
+        topology=None,
+        translation=(0.0, 0.0, 0.0),
+        face_vertices=None,
+    ):
+        """Mesh held in memory by a :class:`MemoryBackend`.
+
+        :param name: name of the mesh.
+        :type name: str
+
+        :param positions: ``(n, 3)`` object space positions of the points.
+        :type positions: numpy.ndarray
+
+        :param topology: number of vertices, edges, polygons and face vertices
+        of the mesh. Only the number of vertices is known when not specified.
+        :type topology: tuple[int, int, int, int]
+
+        :param translation: world space translation of the mesh.
+        :type translation: tuple[float, float, float]
+
+        :param face_vertices: number of vertices of each polygon and indices of
+        the vertices of all the polygons. The mesh has no polygon when not
+        specified.
+        :type face_vertices: tuple[numpy.ndarray, numpy.ndarray]
+        """
+        self.name = name
+        self.uuid = str(uuid.uuid4())
+        self.points = np.array(positions, dtype=np.float64).reshape(-1, 3)
+        self.topology = tuple(topology or (len(self.points), 0, 0, 0))
+        self.translation = np.array(translation, dtype=np.float64)
+        counts, indices = face_vertices or ((), ())
+        self.face_vertices = (
+            np.array(counts, dtype=np.int32),
+            np.array(indices, dtype=np.int32),
+        )
+        self.callbacks = {}
+
+    def __str__(self):
+        return self.name  # pragma: no cover
+
+
+class MemoryBackend(MeshBackend):
+    def __init__(self):
+        """Meshes held in memory as numpy arrays, designated by
+        :class:`MemoryMesh` objects.
+
+        Meshes only have points and a translation, the world space positions
+        being the object space positions moved by this translation.
+        """
+        self.meshes = {}
+        self.blendshapes = {}
+        self.selection = (None, np.zeros(0, dtype=np.int32))
+        self._counter = itertools.count(1)
+        self._callback_ids = itertools.count(1)
+        self._callback_meshes = {}
+
+    def add_mesh(
+        self,
+        name,
+        positions,
+        topology=None,
+        translation=(0.0, 0.0, 0.0),
+        face_vertices=None,
+    ):
+        """Add a mesh to the backend.
+
+        See :class:`MemoryMesh` for the parameters.
+
+        :return: path of the new mesh.
+        :rtype: MemoryMesh
+        """
+        if name in self.meshes:
+            raise ValueError("A mesh named '{}' already exists.".format(name))
+        mesh = MemoryMesh(name, positions, topology, translation, face_vertices)
+        self.meshes[name] = mesh
+        return mesh
+
+    def get_path(self, name):
+        if isinstance(name, MemoryMesh):
+            return name
+        try:
+            return self.meshes[name.rsplit("|", 1)[-1]]
+        except KeyError:
+            raise ValueError("No mesh named '{}'.".format(name))
+
+    def get_name(self, path):
+        return path.name
+
+    def get_node_id(self, path):
+        return path.uuid
+
+    def get_points(self, path, space=OBJECT_SPACE):
+        if space == WORLD_SPACE:
+            positions = path.points + path.translation
+            copy_stats.record(positions)
+            return positions
+        return path.points
+
+    def set_points(self, path, positions, space=OBJECT_SPACE):
+        if len(positions) != len(path.points):
+            raise ValueError(
+                "Mesh '{}' has {} points, got {} positions.".format(
+                    path.name, len(path.points), len(positions)
+                )
+            )
+        if space == WORLD_SPACE:
+            points = np.subtract(positions, path.translation, dtype=np.float64)
+        else:
+            points = np.array(positions, dtype=np.float64)
+        copy_stats.record(points)
+        path.points = points
+        self._notify(path)
+
+    def get_topology(self, path):
+        return path.topology
+
+    def get_face_vertices(self, path):
+        return path.face_vertices
+
+    def duplicate(self, path):
+        name = "{}{}".format(path.name, next(self._counter))
+        while name in self.meshes:
+            name = "{}{}".format(path.name, next(self._counter))
+        return self.add_mesh(
+            name, path.points, path.topology, path.translation, path.face_vertices
+        )
+
+    def rename(self, path, name):
+        name = name.rsplit("|", 1)[-1]
+        if name != path.name and name in self.meshes:
+            raise ValueError("A mesh named '{}' already exists.".format(name))
+        del self.meshes[path.name]
+        path.name = name
+        self.meshes[name] = path
+
+    def delete(self, path):
+        del self.meshes[path.name]
+        self._notify(path)
+
+    def create_blendshape(self, paths, name):
+        self.blendshapes[name] = {
+            "base": paths[-1],
+            "targets": {path.name: path.points.copy() for path in paths[:-1]},
+        }
+        return name
+
+    def get_translation(self, path):
+        return path.translation.tolist()
+
+    def translate(self, path, translation):
+        path.translation = path.translation + translation
+
+    def assign_default_shader(self, path):
+        pass
+
+    def get_selected_vertices(self):
+        return self.selection
+
+    def select_vertices(self, path, indices):
+        self.selection = (path, np.array(indices, dtype=np.int32))
+
+    def add_change_callback(self, path, callback):
+        callback_id = next(self._callback_ids)
+        path.callbacks[callback_id] = callback
+        self._callback_meshes[callback_id] = path
+        return callback_id
+
+    def remove_change_callback(self, callback_id):
+        path = self._callback_meshes.pop(callback_id)
+        del path.callbacks[callback_id]
+
+    @staticmethod
+    def _notify(path):
+        """Call the change callbacks of a mesh."""
+        for callback in list(path.callbacks.values()):
+            callback()
@@ -0,0 +1,101 @@
+import logging
+import threading
+
+log = logging.getLogger(__name__)
+
+
+class BuildCancelled(Exception):
+    """Raised in the thread of a :class:`BackgroundBuild` to stop it once it is
+    cancelled."""
+
+
+class BackgroundBuild(object):
+    def __init__(self, geometry_table):
+        """Build the symmetry tables of a geometry table in a worker thread.
+
+        The table must have been created lazily, so that its point positions are
+        read by the calling thread. The rest of what the build needs from the
+        mesh is read before the thread starts, see
+        :meth:`domain.table.GeometryTable.prefetch`, so only the matching runs
+        in the worker thread and the mesh is never accessed from it.
+
+        The table must not be used until the build is done, :attr:`result`
+        then returns it.
+
+        :param geometry_table: lazy geometry table to build.
+        :type geometry_table: domain.table.GeometryTable
+        """
+        self.table = geometry_table
+        self.progress = 0.0
+        self.error = None
+        self._cancelled = threading.Event()
+
+        geometry_table.prefetch()
+        self._thread = threading.Thread(
+            target=self._run, name="Build symmetry table of {}".format(geometry_table)
+        )
+        self._thread.daemon = True
+        self._thread.start()
+
+    @property
+    def done(self):
+        """Return whether the build is over, finished, cancelled or failed.
+
+        :rtype: bool
+        """
+        return not self._thread.is_alive()
+
+    @property
+    def cancelled(self):
+        """Return whether the build was cancelled.
+
+        :rtype: bool
+        """
+        return self._cancelled.is_set()
+
+    @property
+    def result(self):
+        """Return the built table, None while the build runs or if it was
+        cancelled or failed.
+
+        :rtype: domain.table.GeometryTable
+        """
+        if not self.done or self.cancelled or self.error is not None:
+            return None
+        return self.table
+
+    def cancel(self):
+        """Ask the build to stop, it stops after the chunk of vertices being
+        matched."""
+        self._cancelled.set()
+
+    def wait(self, timeout=None):
+        """Wait for the end of the build.
+
+        :param timeout: maximum time to wait in seconds, no limit when not
+        specified.
+        :type timeout: float
+
+        :return: the built table, see :attr:`result`.
+        :rtype: domain.table.GeometryTable
+        """
+        self._thread.join(timeout)
+        return self.result
+
+    def _report_progress(self, fraction):
+        if self._cancelled.is_set():
+            raise BuildCancelled()
+        self.progress = fraction
+
+    def _run(self):
+        try:
+            self.table.build(progress=self._report_progress)
+        except BuildCancelled:
+            log.info("Cancelled the build of the symmetry table of '%s'.", self.table)
+        except Exception as error:
+            log.exception(
+                "Unable to build the symmetry table of '%s' : %s", self.table, error
+            )
+            self.error = error
+        else:
+            self.progress = 1.0
@@ -2,8 +2,9 @@ import abc
 import logging
 from pprint import pformat
 
-from maya.api import OpenMaya as om2
+import numpy as np
 
+from sym_mesh.domain import history
 from sym_mesh.domain import selection
 
 log = logging.getLogger(__name__)
@@ -18,6 +19,7 @@ class AbstractGeometryCommand(metaclass=abc.ABCMeta):
         vertex_selection=selection.VertexSelection(from_list=()),
         percentage=100,
         target_dag_path=None,
+        live=False,
     ):
         """Initialize the deformation command with the proper attributes.
 
@@ -38,6 +40,11 @@ class AbstractGeometryCommand(metaclass=abc.ABCMeta):
 
         :param target_dag_path: MDagPath of the target
         :type target_dag_path: maya.api.OpenMaya.MDagPath
+
+        :param live: True if the command is driven interactively through its
+        percentage, for example by a slider. Only live commands are merged in
+        the undo history, see :meth:`can_merge`.
+        :type live: bool
         """
         log.debug("base_table : %s", base_table)
         log.debug("target_table : %s", target_table)
@@ -50,6 +57,7 @@ class AbstractGeometryCommand(metaclass=abc.ABCMeta):
         self.vertex_selection = vertex_selection
         self._percentage = percentage
         self.target_dag_path = target_dag_path
+        self.live = live
         self.space = base_table.space
         self.current_point_array = selection.get_points_positions(
             target_dag_path, base_table.space
@@ -68,6 +76,66 @@ class AbstractGeometryCommand(metaclass=abc.ABCMeta):
         self.result = self.do_it()
         self.redo_action = self.result
 
+    def finalize(self, compress=False):
+        """Release what the command only needs while it is active, once it is
+        stored in the undo history. The percentage cannot be changed anymore.
+
+        :param compress: if True, the undo data of the command is compressed.
+        :type compress: bool
+        """
+        self.base_table = None
+        self.target_table = None
+        self.current_point_array = None
+        self.undo_action = None
+
+    @property
+    def nbytes(self):
+        """Return the memory used by the undo data of the finalized command.
+
+        :rtype: int
+        """
+        return 0
+
+    @property
+    def disk_nbytes(self):
+        """Return the size of the scratch files holding the undo data of the
+        finalized command.
+
+        :rtype: int
+        """
+        return 0
+
+    def spill(self, prefix):
+        """Move the undo data of the finalized command to scratch files.
+
+        :param prefix: path prefix of the scratch files.
+        :type prefix: str
+        """
+
+    def release(self):
+        """Release the undo data of the command when it is dropped from the
+        history, the command cannot be undone nor redone anymore."""
+
+    def can_merge(self, command):
+        """Return whether a finalized command that ran right after this one can
+        be merged into it, as a single entry of the undo history.
+
+        :param command: command that ran after this one.
+        :type command: AbstractGeometryCommand
+
+        :rtype: bool
+        """
+        return False
+
+    def merge(self, command):
+        """Merge a finalized command that ran right after this one into it, see
+        :meth:`can_merge`. Undoing this command then undoes both commands.
+
+        :param command: command that ran after this one.
+        :type command: AbstractGeometryCommand
+        """
+        raise NotImplementedError
+
     @abc.abstractmethod
     def do_it(self):
         raise NotImplementedError
@@ -82,32 +150,169 @@ class AbstractGeometryCommand(metaclass=abc.ABCMeta):
 
 
 class AbstractDeformationCommand(AbstractGeometryCommand, metaclass=abc.ABCMeta):
+    def __init__(self, *args, **kwargs):
+        """Initialize the deformation command with the proper attributes, see
+        :class:`AbstractGeometryCommand`.
+
+        The deformation is computed once as an anchor position and a full
+        strength delta per point, the positions for any percentage being
+        ``anchor + delta * factor``. Changing the percentage, for example while
+        dragging a slider, then only evaluates this expression and writes the
+        points on the mesh.
+
+        Once the command is finalized, only the points it moved are kept to
+        undo and redo it, see :class:`domain.history.PointDelta`.
+        """
+        self.delta = None
+        self._anchor_positions = None
+        self._delta_positions = None
+        self._destination_positions = None
+        super().__init__(*args, **kwargs)
+
     def do_it(self):
         """
         Set the positions of the points of the mesh based on the computation algorithm.
         """
-        base_point_array = self.base_table.point_array
-        log.debug("base_point_array :\n%s", pformat(list(base_point_array)))
-        target_point_array = self.target_table.point_array
-        log.debug("target_point_array :\n%s", pformat(list(target_point_array)))
-        destination_point_array = self.compute_point_position(
-            base_point_array, target_point_array
-        )
+        if self._anchor_positions is None:
+            base_point_array = self.base_table.point_array
+            target_point_array = self.target_table.point_array
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("base_point_array :\n%s", pformat(base_point_array.tolist()))
+                log.debug(
+                    "target_point_array :\n%s", pformat(target_point_array.tolist())
+                )
+            self._anchor_positions, self._delta_positions = self.compute_deltas(
+                base_point_array, target_point_array
+            )
+            self._destination_positions = np.empty_like(self._anchor_positions)
+
+        destination_point_array = self.compute_point_position()
 
         # Modify points position using the new coordinates
-        tgt_mesh_functionset = om2.MFnMesh(self.target_dag_path)
-        tgt_mesh_functionset.setPoints(destination_point_array, self.space)
+        selection.set_points_positions(
+            self.target_dag_path, destination_point_array, self.space
+        )
 
         return destination_point_array
 
+    def finalize(self, compress=False):
+        """Replace the positions of the mesh before and after the command by
+        the rows that changed, and release the deformation buffers and the
+        geometry tables, see :meth:`AbstractGeometryCommand.finalize`."""
+        self.delta = history.PointDelta.from_positions(
+            self.undo_action, self.redo_action, compress=compress
+        )
+        self._anchor_positions = None
+        self._delta_positions = None
+        self._destination_positions = None
+        self.result = None
+        self.redo_action = None
+        super().finalize(compress=compress)
+
+    @property
+    def nbytes(self):
+        return self.delta.nbytes if self.delta is not None else 0
+
+    @property
+    def disk_nbytes(self):
+        return self.delta.disk_nbytes if self.delta is not None else 0
+
+    def spill(self, prefix):
+        if self.delta is not None:
+            self.delta.spill(prefix)
+
+    def release(self):
+        if self.delta is not None:
+            self.delta.release()
+
+    def can_merge(self, command):
+        """Live commands of the same type can be merged when they deform the
+        same target in the same space with the same vertex selection. Commands
+        run with a fixed percentage, like the buttons, are never merged."""
+        return (
+            self.live
+            and command.live
+            and type(command) is type(self)
+            and self.delta is not None
+            and command.delta is not None
+            and command.target_dag_path == self.target_dag_path
+            and command.space == self.space
+            and np.array_equal(
+                command.vertex_selection.indices, self.vertex_selection.indices
+            )
+        )
+
+    def merge(self, command):
+        delta = self.delta.merge(command.delta)
+        self.delta.release()
+        self.delta = delta
+
     def undo(self):
-        tgt_mesh_functionset = om2.MFnMesh(self.target_dag_path)
-        tgt_mesh_functionset.setPoints(self.undo_action, self.space)
+        positions = self.undo_action
+        if self.delta is not None:
+            positions = self.delta.undo(self.get_current_positions())
+        selection.set_points_positions(self.target_dag_path, positions, self.space)
 
     def redo(self):
-        tgt_mesh_functionset = om2.MFnMesh(self.target_dag_path)
-        tgt_mesh_functionset.setPoints(self.redo_action, self.space)
+        positions = self.redo_action
+        if self.delta is not None:
+            positions = self.delta.redo(self.get_current_positions())
+        selection.set_points_positions(self.target_dag_path, positions, self.space)
+
+    def get_current_positions(self):
+        """Get a copy of the current positions of the points of the target mesh.
+
+        :rtype: numpy.ndarray
+        """
+        return selection.get_points_positions(self.target_dag_path, self.space)
+
+    def get_selection_mask(self, vertex_count):
+        """Get a boolean mask of the vertices to modify. Every vertex is modified
+        when no vertex is selected.
+
+        :param vertex_count: number of vertices of the mesh.
+        :type vertex_count: int
+
+        :return: mask that is True for the vertices to modify.
+        :rtype: numpy.ndarray
+        """
+        if len(self.vertex_selection.indices) == 0:
+            return np.ones(vertex_count, dtype=bool)
+        return self.vertex_selection.get_mask(vertex_count)
+
+    def get_factor(self):
+        """Get the factor of the delta to apply for the current percentage.
+
+        :rtype: float
+        """
+        return self._percentage / 100.0
+
+    def compute_point_position(self):
+        """Compute the positions of the points for the current percentage.
+
+        The positions are computed in place in a buffer allocated once per
+        command, the returned array is overwritten on each percentage change.
+
+        :return: ``(n, 3)`` new positions of the points.
+        :rtype: numpy.ndarray
+        """
+        np.multiply(
+            self._delta_positions, self.get_factor(), out=self._destination_positions
+        )
+        self._destination_positions += self._anchor_positions
+        return self._destination_positions
 
     @abc.abstractmethod
-    def compute_point_position(self, base_point_array, target_point_array):
+    def compute_deltas(self, base_point_array, target_point_array):
+        """Compute the anchor position and the full strength delta of each point.
+
+        :param base_point_array: ``(n, 3)`` positions of the points of the base mesh.
+        :type base_point_array: numpy.ndarray
+
+        :param target_point_array: ``(n, 3)`` positions of the points of the target mesh.
+        :type target_point_array: numpy.ndarray
+
+        :return: ``(n, 3)`` anchor positions and deltas of the points.
+        :rtype: numpy.ndarray, numpy.ndarray
+        """
         raise NotImplementedError
@@ -1,7 +1,9 @@
 import logging
 
-from maya.api import OpenMaya as om2
+import numpy as np
 
+from sym_mesh.domain import matching
+from sym_mesh.domain import selection
 from sym_mesh.domain.commands.abstract_commands import AbstractDeformationCommand
 
 log = logging.getLogger(__name__)
@@ -10,157 +12,99 @@ log = logging.getLogger(__name__)
 class BakeDifferenceCommand(AbstractDeformationCommand):
     """Bake the difference between 2 mesh on a list of vertices on a mesh."""
 
-    def compute_point_position(self, base_point_array, target_point_array):
-        destination_table = om2.MPointArray()
-        # Loop in MPointArray
-        for i in range(len(self.current_point_array)):
-            # If the current point is also in selection
-            if (
-                i in self.vertex_selection.indices
-                or self.vertex_selection.indices.__len__() == 0
-            ):
-                # Modify new position
-                destination_table.append(
-                    self.current_point_array[i]
-                    + (
-                        (target_point_array[i] - base_point_array[i])
-                        * (self._percentage / 100.0)
-                    )
-                )
-            # If the current point is not selected
-            else:
-                # Do nothing
-                destination_table.append(self.current_point_array[i])
-        return destination_table
+    def compute_deltas(self, base_point_array, target_point_array):
+        current_positions = selection.as_positions(self.current_point_array)
+        count = len(current_positions)
+        mask = self.get_selection_mask(count)
+
+        # Only the selected points are moved, the others keep their position.
+        deltas = np.zeros_like(current_positions)
+        deltas[mask] = (
+            selection.as_positions(target_point_array)[:count][mask]
+            - selection.as_positions(base_point_array)[:count][mask]
+        )
+        return current_positions, deltas
 
 
 class RevertToBaseCommand(AbstractDeformationCommand):
     """Revert selected vertices on the target mesh to the base position."""
 
-    def compute_point_position(self, base_point_array, target_point_array):
-        destination_table = om2.MPointArray()
-        # Loop in MPointArray
-        for i in range(base_point_array.__len__()):
-            # If the current point is also in selection
-            if (
-                i in self.vertex_selection.indices
-                or self.vertex_selection.indices.__len__() == 0
-            ):
-                # Modify new position
-                base_position = base_point_array[i]
-                new_position = base_position + (
-                    (target_point_array[i] - base_position)
-                    * ((100 - self._percentage) / 100.0)
-                )
-                log.debug("New position : %s", new_position)
-                destination_table.append(new_position)
-            # If the current point is not selected
-            else:
-                # Do nothing
-                destination_table.append(target_point_array[i])
-        return destination_table
+    def get_factor(self):
+        return (100 - self._percentage) / 100.0
+
+    def compute_deltas(self, base_point_array, target_point_array):
+        count = len(base_point_array)
+        base_positions = selection.as_positions(base_point_array)
+        target_positions = selection.as_positions(target_point_array)[:count]
+        mask = self.get_selection_mask(count)
+
+        # The selected points go from the base position towards their current
+        # position, the others keep their current position.
+        anchors = target_positions.copy()
+        anchors[mask] = base_positions[mask]
+        deltas = np.zeros_like(target_positions)
+        deltas[mask] = target_positions[mask] - base_positions[mask]
+        return anchors, deltas
 
 
 class SymmetrizeCommand(AbstractDeformationCommand):
     """Symmetrize selected vertices on the target mesh."""
 
-    def compute_point_position(self, base_point_array, target_point_array):
+    def compute_deltas(self, base_point_array, target_point_array):
         axis = self.base_table.axis
+        count = len(base_point_array)
+        positions = selection.as_positions(target_point_array)[:count]
 
-        symmetry_table = self.base_table.symmetry_table
-        log.debug("Symmetry table is : %s", symmetry_table)
-
-        destination_point_array = om2.MPointArray()
-        # Loop in MPointArray
-        for i in range(len(base_point_array)):
-            current_position = symmetry_position = target_point_array[i]
-            # If the current point is also in selection
-            if (
-                i in self.vertex_selection.indices
-                or self.vertex_selection.indices.__len__() == 0
-            ) and i in symmetry_table:
-                # Modify new position
-                source_index = symmetry_table[i]
-                target_vertex_position = target_point_array[source_index]
-                symmetry_position = list(target_vertex_position)
-                symmetry_position[axis] = -target_vertex_position[axis]
-                symmetry_position = om2.MPoint(symmetry_position)
-                log.debug(
-                    "Mirroring position of vtx %s from vtx %s. Current position : %s, target position : %s",
-                    i,
-                    source_index,
-                    current_position,
-                    symmetry_position,
-                )
-                symmetry_position = current_position + (
-                    (symmetry_position - current_position) * (self._percentage / 100.0)
-                )
-            else:
-                log.debug("Not mirroring the position of vtx %s", i)
-
-            log.debug(
-                "Modifying position from %s to %s", current_position, symmetry_position
-            )
-            destination_point_array.append(symmetry_position)
-        return destination_point_array
+        targets, sources = self.base_table.symmetry_pairs
+        selected = self.get_selection_mask(count)[targets]
+        targets = targets[selected]
+        sources = sources[selected]
+        log.debug("Mirroring the position of %d vertices.", len(targets))
+
+        # Gather the mirrored source positions and scatter their offset from
+        # the current target positions on the targets.
+        deltas = np.zeros_like(positions)
+        deltas[targets] = matching.mirror(positions[sources], axis) - positions[targets]
+        return positions, deltas
 
 
 class FlipCommand(AbstractDeformationCommand):
     """Flip selected vertices on the target mesh."""
 
-    def compute_point_position(self, base_point_array, target_point_array):
+    def compute_deltas(self, base_point_array, target_point_array):
         axis = self.base_table.axis
-
-        symmetry_table = self.base_table.symmetry_table
-        log.debug("Symmetry table is : %s", symmetry_table)
-
-        destination_point_array = om2.MPointArray(
-            [(0.0, 0.0, 0.0)] * len(base_point_array)
+        count = len(base_point_array)
+        positions = selection.as_positions(target_point_array)[:count]
+
+        # Vertices without a counterpart are not flipped and end up at the origin.
+        anchors = np.zeros((count, 3))
+        deltas = np.zeros((count, 3))
+
+        targets, sources = self.base_table.symmetry_pairs
+        mask = self.get_selection_mask(count)
+        # TODO : could be worth only flipping the points that are ACTUALLY
+        #  selected, instead of flipping the selected points AND their
+        #  counterpart. Ask Sebastien about this.
+        selected = (mask[targets] | mask[sources])[:, np.newaxis]
+        log.debug("Flipping %d pairs of vertices.", np.count_nonzero(selected))
+
+        source_positions = positions[sources]
+        target_positions = positions[targets]
+        source_deltas = np.where(
+            selected, matching.mirror(target_positions, axis) - source_positions, 0.0
+        )
+        target_deltas = np.where(
+            selected, matching.mirror(source_positions, axis) - target_positions, 0.0
         )
 
-        # Loop in MPointArray
-        for target_index in symmetry_table:
-            source_index = symmetry_table[target_index]
-            source_vertex_position = target_point_array[source_index]
-            target_vertex_position = target_point_array[target_index]
-            # If the current point is also in selection
-            if (
-                target_index in self.vertex_selection.indices
-                or source_index in self.vertex_selection.indices
-                or self.vertex_selection.indices.__len__() == 0
-            ):
-                # TODO : could be worth doing a conditional here to only flip
-                #  the points that are ACTUALLY selected, instead of flipping
-                #  the selected points AND their counterpart
-                #  Ask Sebastien about this.
-
-                # target point's new position
-                new_target_position = list(source_vertex_position)
-                new_target_position[axis] = -new_target_position[axis]
-                new_target_position = om2.MPoint(new_target_position)
-                new_target_position = target_vertex_position + (
-                    (new_target_position - target_vertex_position)
-                    * (self._percentage / 100.0)
-                )
-
-                # source point's new position
-                new_source_position = list(target_vertex_position)
-                new_source_position[axis] = -new_source_position[axis]
-                new_source_position = om2.MPoint(new_source_position)
-                new_source_position = source_vertex_position + (
-                    (new_source_position - source_vertex_position)
-                    * (self._percentage / 100.0)
-                )
-
-                destination_point_array[source_index] = new_source_position
-                destination_point_array[target_index] = new_target_position
-            else:
-                log.debug(
-                    "Not mirroring the position of vertices %s and %s",
-                    source_index,
-                    target_index,
-                )
-                destination_point_array[source_index] = source_vertex_position
-                destination_point_array[target_index] = target_vertex_position
-
-        return destination_point_array
+        # Pairs are written one after the other, the source then the target, so
+        # a vertex that belongs to several pairs keeps its last written position.
+        indices = np.column_stack((sources, targets)).ravel()
+        _, last_writes = np.unique(indices[::-1], return_index=True)
+        last_writes = len(indices) - 1 - last_writes
+        written = indices[last_writes]
+        pair_positions = np.stack((source_positions, target_positions), axis=1)
+        pair_deltas = np.stack((source_deltas, target_deltas), axis=1)
+        anchors[written] = pair_positions.reshape(-1, 3)[last_writes]
+        deltas[written] = pair_deltas.reshape(-1, 3)[last_writes]
+        return anchors, deltas
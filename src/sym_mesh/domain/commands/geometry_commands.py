@@ -1,9 +1,8 @@
 import logging
 
-from maya.api import OpenMaya as om2
-from maya import cmds as mc
+from sym_mesh.domain import backend
+from sym_mesh.domain import history
 from sym_mesh.domain import selection
-from sym_mesh.domain import shading
 from sym_mesh.domain.commands.abstract_commands import AbstractGeometryCommand
 from sym_mesh.domain.dag_path import create_MDagPath
 
@@ -33,6 +32,7 @@ class ExtractAxesCommand(AbstractGeometryCommand):
         """
         self.base_dag_path = base_table.dag_path
         self.point_arrays = list()
+        self._files = list()
         self.meshes = list()
         self.translate = translate
         super().__init__(
@@ -49,30 +49,25 @@ class ExtractAxesCommand(AbstractGeometryCommand):
         :return: names of the newly created geometries
         :rtype: str, str, str
         """
-        target_name = self.target_table.dag_path.fullPathName().split("|")[-1]
+        mesh_backend = backend.get_backend()
+        target_name = mesh_backend.get_name(self.target_table.dag_path).split("|")[-1]
         base_point_array = self.base_table.point_array
         target_point_array = self.target_table.point_array
 
         for i, axis in enumerate(["x", "y", "z"]):
             dag_path = self.duplicate_mesh(self.base_dag_path, target_name, suffix=axis)
-            path = dag_path.fullPathName()
+            path = mesh_backend.get_name(dag_path)
             self.meshes.append(path)
 
-            # Init MFnMesh
-            destination_table = om2.MPointArray()
-
-            # Loop in MPointArray
-            for j in range(len(base_point_array)):
-                base_point = base_point_array[j]
-                target_point = target_point_array[j]
-                new_point = list(base_point)
-                new_point[i] = target_point[i]
-                destination_table.append(new_point)
+            # Only keep the delta of the target along the current axis
+            destination_table = base_point_array.copy()
+            destination_table[:, i] = target_point_array[:, i]
             self.point_arrays.append(destination_table)
 
             # Modify points position using the new coordinates
-            tgt_mesh_functionset = om2.MFnMesh(dag_path)
-            tgt_mesh_functionset.setPoints(destination_table, self.base_table.space)
+            selection.set_points_positions(
+                dag_path, destination_table, self.base_table.space
+            )
 
         # Adding base point array to point arrays list for redo purposes
         self.point_arrays.append(base_point_array)
@@ -80,7 +75,7 @@ class ExtractAxesCommand(AbstractGeometryCommand):
         dag_path = self.duplicate_mesh(
             self.base_dag_path, target_name, suffix="extracted"
         )
-        self.meshes.append(dag_path.fullPathName())
+        self.meshes.append(mesh_backend.get_name(dag_path))
 
         return self.create_blendshape()
 
@@ -99,14 +94,10 @@ class ExtractAxesCommand(AbstractGeometryCommand):
         :return: dag path of the new mesh
         :rtype: maya.api.OpenMaya.MDagPath
         """
-        mesh_function_set = om2.MFnMesh(dag_path)
-        mesh = mesh_function_set.duplicate()
-        duplicate_function_set = om2.MFnDagNode(mesh)
-        dag_path = duplicate_function_set.getPath()
+        mesh_backend = backend.get_backend()
+        dag_path = mesh_backend.duplicate(dag_path)
         new_path = self.get_new_name(name, dag_path, suffix=suffix)
-        dag_modifier = om2.MDagModifier()
-        dag_modifier.renameNode(mesh, new_path)
-        dag_modifier.doIt()
+        mesh_backend.rename(dag_path, new_path)
         return dag_path
 
     def get_new_name(self, target_name, dag_path, suffix=""):
@@ -125,7 +116,7 @@ class ExtractAxesCommand(AbstractGeometryCommand):
         :return: new long name to give to the object
         :rtype: str
         """
-        path = dag_path.fullPathName()
+        path = backend.get_backend().get_name(dag_path)
         new_path = path.rsplit("|", 1)[:-1]
         if suffix:
             target_name = "{}_{}".format(target_name, suffix)
@@ -133,11 +124,34 @@ class ExtractAxesCommand(AbstractGeometryCommand):
         new_path = "|".join(new_path)
         return new_path
 
+    @property
+    def nbytes(self):
+        return sum(history.array_nbytes(array) for array in self.point_arrays)
+
+    @property
+    def disk_nbytes(self):
+        return sum(
+            array.nbytes for array in self.point_arrays if history.is_spilled(array)
+        )
+
+    def spill(self, prefix):
+        if self._files:
+            return
+        self._files = [
+            "{}_{}.npy".format(prefix, i) for i in range(len(self.point_arrays))
+        ]
+        self.point_arrays = [
+            history.spill_array(array, path)
+            for array, path in zip(self.point_arrays, self._files)
+        ]
+
+    def release(self):
+        self.point_arrays = []
+        history.remove_files(self._files)
+        self._files = []
+
     def undo(self):
-        node = create_MDagPath(self.result[0]).node()
-        dag_modifier = om2.MDagModifier()
-        dag_modifier.deleteNode(node)
-        dag_modifier.doIt()
+        backend.get_backend().delete(create_MDagPath(self.result[0]))
 
     def redo(self):
         for i, path in enumerate(self.meshes):
@@ -145,26 +159,23 @@ class ExtractAxesCommand(AbstractGeometryCommand):
             dag_path = self.duplicate_mesh(self.base_dag_path, name)
 
             # Modify points position using the new coordinates
-            tgt_mesh_functionset = om2.MFnMesh(dag_path)
-            tgt_mesh_functionset.setPoints(self.point_arrays[i], self.base_table.space)
+            selection.set_points_positions(dag_path, self.point_arrays[i], self.space)
         mesh, blendshape = self.create_blendshape()
         return mesh, blendshape
 
     def create_blendshape(self):
-        # TODO : update this method to use maya API 2.0 instead of cmds
-        blendshape = mc.blendShape(self.meshes)[0]
-        blendshape = mc.rename(blendshape, "{}_blendShape".format(self.meshes[-1]))
+        mesh_backend = backend.get_backend()
+        paths = [create_MDagPath(mesh) for mesh in self.meshes]
+        blendshape = mesh_backend.create_blendshape(
+            paths, "{}_blendShape".format(self.meshes[-1])
+        )
 
         # Move the mesh 20 units in Y, placing this here to avoid doing it both
         # in __init__ and redo methods
-        mc.delete(self.meshes[:-1])
-        position = mc.xform(
-            self.target_table.dag_path.fullPathName(),
-            query=True,
-            worldSpace=True,
-            translation=True,
-        )
+        for path in paths[:-1]:
+            mesh_backend.delete(path)
+        position = mesh_backend.get_translation(self.target_dag_path)
         new_position = [position[0], position[1] + self.translate, position[2]]
-        mc.xform(self.meshes[-1], relative=True, translation=new_position)
-        shading.assign_default_shader(self.meshes[-1])
+        mesh_backend.translate(paths[-1], new_position)
+        mesh_backend.assign_default_shader(paths[-1])
         return self.meshes[-1], blendshape
@@ -1,4 +1,4 @@
-from maya.api import OpenMaya as om2
+from sym_mesh.domain import backend
 
 
 def create_MDagPath(path_to_dag_object):
@@ -7,11 +7,8 @@ def create_MDagPath(path_to_dag_object):
     :param path_to_dag_object: path to the dag object for which we want the MDagPath.
     :type path_to_dag_object: str
 
-    :return: MDagPath of the object at the specified path or None.
+    :return: MDagPath of the object at the specified path, or the path of the
+    mesh in the active mesh backend.
     :rtype: maya.api.OpenMaya.MDagPath
     """
-    selection_list = om2.MSelectionList()
-    selection_list.add(path_to_dag_object)
-    dag_path = selection_list.getDagPath(0)
-
-    return dag_path
+    return backend.get_backend().get_path(path_to_dag_object)
@@ -1,6 +1,11 @@
-import maya.api.OpenMaya as om2
+import itertools
 import logging
+import os
+import shutil
+import tempfile
+import weakref
 
+from sym_mesh.domain import history
 from sym_mesh.domain.dag_path import create_MDagPath
 
 log = logging.getLogger(__name__)
@@ -22,7 +27,53 @@ log.setLevel(logging.INFO)
 
 
 class Executor(object):
-    def __init__(self):
+    def __init__(
+        self,
+        compress=False,
+        max_size=None,
+        hard_limit=None,
+        directory=None,
+        coalesce=True,
+    ):
+        """Execute the commands and keep their undo history.
+
+        Once the undo data of the history exceeds its memory budget, the oldest
+        entries are moved to memory-mapped scratch files, their data being read
+        back from these files on undo or redo. Once the whole history exceeds
+        its hard limit, the oldest entries are dropped.
+
+        :param compress: if True, the undo data of the commands stored in the
+        history is compressed, see :class:`domain.history.PointDelta`.
+        :type compress: bool
+
+        :param max_size: memory budget of the history in bytes, see
+        :func:`domain.history.default_max_size` when not specified.
+        :type max_size: int
+
+        :param hard_limit: maximum size of the history in bytes, in memory and
+        on disk, see :func:`domain.history.default_hard_limit` when not specified.
+        :type hard_limit: int
+
+        :param directory: directory of the scratch files, a temporary directory
+        removed with the executor when not specified.
+        :type directory: str
+
+        :param coalesce: if True, a live command stashed right after a live
+        command of the same type on the same target and vertex selection is
+        merged into it, they are then undone and redone as a single entry, see
+        :meth:`domain.commands.abstract_commands.AbstractGeometryCommand.can_merge`.
+        Commands are not merged across an undo or a redo.
+        :type coalesce: bool
+        """
+        self.compress = compress
+        self.max_size = history.default_max_size() if max_size is None else max_size
+        self.hard_limit = (
+            history.default_hard_limit() if hard_limit is None else hard_limit
+        )
+        self._directory = directory
+        self._file_counter = itertools.count()
+        self.coalesce = coalesce
+        self._last_stashed = None
         self._current_command = None
         self.undo_queue = list()
         self.redo_queue = list()
@@ -49,6 +100,7 @@ class Executor(object):
 
         last_action.undo()
         self.redo_queue.append(last_action)
+        self._last_stashed = None
 
     def redo(self):
         """Redo the last move stored in the redo queue."""
@@ -60,6 +112,7 @@ class Executor(object):
 
         last_action.redo()
         self.undo_queue.append(last_action)
+        self._last_stashed = None
 
     def execute(self, command, **kwargs):
         """
@@ -71,11 +124,11 @@ class Executor(object):
         """
         target_dag_path = kwargs.get("target_dag_path")
         if target_dag_path:
-            if not isinstance(target_dag_path, om2.MDagPath):
+            if isinstance(target_dag_path, str):
                 target_dag_path = create_MDagPath(target_dag_path)
         else:
             target_table = kwargs.get("target_table")
-            target_dag_path = target_table.dag_path.getPath()
+            target_dag_path = target_table.dag_path
         kwargs["target_dag_path"] = target_dag_path
 
         self._current_command = command(**kwargs)
@@ -83,6 +136,116 @@ class Executor(object):
         return self._current_command.result
 
     def stash_command(self):
-        """Add the current command to the undo queue and remove it from self._current_command."""
-        self.undo_queue.append(self._current_command)
+        """Add the current command to the undo queue and remove it from
+        self._current_command. The command is finalized, which only keeps what
+        it needs to be undone and redone."""
+        if self._current_command is None:
+            log.debug("No active command to stash.")
+            return
+        command = self._current_command
         self._current_command = None
+        command.finalize(compress=self.compress)
+
+        previous = self._last_stashed
+        if (
+            self.coalesce
+            and previous is not None
+            and self.undo_queue
+            and self.undo_queue[-1] is previous
+            and previous.can_merge(command)
+        ):
+            log.debug("Merging %s into the previous entry.", type(command).__name__)
+            previous.merge(command)
+            command.release()
+        else:
+            self.undo_queue.append(command)
+            self._last_stashed = command
+        self._apply_budget()
+
+    def get_history_stats(self):
+        """Get the size of each entry of the undo history and of the whole
+        history, in memory and on disk.
+
+        :return: ``entries``, a list of dicts with the ``queue``, ``command``,
+        ``memory`` and ``disk`` of each entry from the oldest undo entry to the
+        oldest redo entry, and the total ``memory`` and ``disk`` in bytes.
+        :rtype: dict
+        """
+        entries = [
+            {
+                "queue": queue_name,
+                "command": type(command).__name__,
+                "memory": command.nbytes,
+                "disk": command.disk_nbytes,
+            }
+            for queue_name, command in self._iter_history()
+        ]
+        return {
+            "entries": entries,
+            "memory": sum(entry["memory"] for entry in entries),
+            "disk": sum(entry["disk"] for entry in entries),
+        }
+
+    def clear_history(self):
+        """Drop every entry of the undo and redo queues."""
+        for _, command in list(self._iter_history()):
+            command.release()
+        self.undo_queue = list()
+        self.redo_queue = list()
+        self._last_stashed = None
+
+    def _iter_history(self):
+        """Iterate over the entries of the history, from the oldest undo entry
+        to the undo entry most recently done, then from the redo entry undone
+        first to the next one to redo.
+
+        :return: name of the queue of each entry and its command.
+        :rtype: iterator
+        """
+        for command in self.undo_queue:
+            yield "undo", command
+        for command in self.redo_queue:
+            yield "redo", command
+
+    def _apply_budget(self):
+        """Spill the oldest entries of the history to scratch files while it
+        exceeds its memory budget, then drop the oldest entries while it
+        exceeds its hard limit."""
+        stats = self.get_history_stats()
+        memory = stats["memory"]
+        total = memory + stats["disk"]
+
+        for _, command in self._iter_history():
+            if memory <= self.max_size:
+                break
+            size = command.nbytes
+            if not size:
+                continue
+            command.spill(self._get_scratch_prefix())
+            memory -= size - command.nbytes
+            log.debug("Moved %d bytes of undo history to disk.", size)
+
+        # The most recent entry, at the end of the undo queue, is always kept.
+        for queue in (self.undo_queue, self.redo_queue):
+            while total > self.hard_limit and len(queue) > (queue is self.undo_queue):
+                command = queue.pop(0)
+                total -= command.nbytes + command.disk_nbytes
+                command.release()
+                log.info(
+                    "Dropped the oldest entry of the history, it exceeds %d MB.",
+                    self.hard_limit // 1024**2,
+                )
+
+    def _get_scratch_prefix(self):
+        """Get a new path prefix for the scratch files of an entry.
+
+        :rtype: str
+        """
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix="sym_mesh_history_")
+            weakref.finalize(self, shutil.rmtree, self._directory, True)
+        elif not os.path.isdir(self._directory):
+            os.makedirs(self._directory)
+        return os.path.join(
+            self._directory, "{:x}_{:06d}".format(id(self), next(self._file_counter))
+        )
@@ -0,0 +1,250 @@
+import logging
+import os
+import zlib
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+
+def default_max_size():
+    """Get the memory budget of the undo history in bytes, from the
+    ``SYM_MESH_HISTORY_MAX_SIZE`` environment variable (in MB) if it is set,
+    512 MB otherwise.
+
+    :rtype: int
+    """
+    return int(float(os.environ.get("SYM_MESH_HISTORY_MAX_SIZE", 512)) * 1024**2)
+
+
+def default_hard_limit():
+    """Get the maximum size of the undo history in bytes, in memory and on disk,
+    from the ``SYM_MESH_HISTORY_HARD_LIMIT`` environment variable (in MB) if it
+    is set, 4096 MB otherwise.
+
+    :rtype: int
+    """
+    return int(float(os.environ.get("SYM_MESH_HISTORY_HARD_LIMIT", 4096)) * 1024**2)
+
+
+def spill_array(array, path):
+    """Write an array to a scratch file and map it back in memory. Its pages
+    are then read from the file when it is accessed, and can be dropped from
+    memory by the system.
+
+    :param array: array to spill.
+    :type array: numpy.ndarray
+
+    :param path: path of the ``.npy`` file to write.
+    :type path: str
+
+    :return: read-only memory-mapped array, or the array itself when it is
+    empty.
+    :rtype: numpy.memmap
+    """
+    if not array.size:
+        return array
+    np.save(path, array)
+    return np.load(path, mmap_mode="r")
+
+
+def is_spilled(array):
+    """Return whether an array is mapped from a scratch file.
+
+    :type array: numpy.ndarray
+
+    :rtype: bool
+    """
+    return isinstance(array, np.memmap)
+
+
+def array_nbytes(array):
+    """Get the memory used by an array, zero for a memory-mapped array.
+
+    :type array: numpy.ndarray
+
+    :rtype: int
+    """
+    return 0 if is_spilled(array) else array.nbytes
+
+
+def remove_files(paths):
+    """Remove scratch files, ignoring the files that are still in use.
+
+    :param paths: paths of the files.
+    :type paths: list[str]
+    """
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError as error:  # pragma: no cover
+            log.debug("Unable to remove scratch file %s : %s", path, error)
+
+
+class PointDelta(object):
+    def __init__(self, indices, before, after, compress=False):
+        """Change of the positions of some points of a mesh, used to undo and
+        redo a command without keeping full copies of the mesh.
+
+        Only the rows that changed are stored, with their exact positions
+        before and after the change, so both states are restored bit for bit.
+
+        :param indices: ascending indices of the points that changed.
+        :type indices: numpy.ndarray
+
+        :param before: ``(k, 3)`` positions of these points before the change.
+        :type before: numpy.ndarray
+
+        :param after: ``(k, 3)`` positions of these points after the change.
+        :type after: numpy.ndarray
+
+        :param compress: if True, the rows are stored compressed with zlib,
+        which trades some time on undo and redo for memory.
+        :type compress: bool
+        """
+        self.count = len(indices)
+        self.dtype = np.result_type(before, after)
+        self.shape = np.shape(before)
+        self.compressed = compress
+        self.files = []
+        self._indices = self._pack(np.asarray(indices, dtype=np.int32))
+        self._before = self._pack(np.asarray(before, dtype=self.dtype))
+        self._after = self._pack(np.asarray(after, dtype=self.dtype))
+
+    @classmethod
+    def from_positions(cls, before, after, compress=False):
+        """Create the delta between two states of the points of a mesh.
+
+        :param before: ``(n, 3)`` positions of the points before the change.
+        :type before: numpy.ndarray
+
+        :param after: ``(n, 3)`` positions of the points after the change.
+        :type after: numpy.ndarray
+
+        :param compress: see :class:`PointDelta`.
+        :type compress: bool
+
+        :rtype: PointDelta
+        """
+        before = np.asarray(before)
+        after = np.asarray(after)
+        if before.shape != after.shape:
+            raise ValueError(
+                "Cannot compute the delta between {} and {} positions.".format(
+                    len(before), len(after)
+                )
+            )
+        indices = np.flatnonzero((before != after).any(axis=1))
+        return cls(indices, before[indices], after[indices], compress=compress)
+
+    @property
+    def nbytes(self):
+        """Return the memory used to store the delta, zero once it is spilled.
+
+        :rtype: int
+        """
+        return sum(array_nbytes(data) for data in self._arrays() if data is not None)
+
+    @property
+    def disk_nbytes(self):
+        """Return the size of the scratch files of the delta, zero until it is
+        spilled.
+
+        :rtype: int
+        """
+        return sum(data.nbytes for data in self._arrays() if is_spilled(data))
+
+    def merge(self, later):
+        """Get the delta of this change followed by a later change of the same
+        points. Undoing or redoing it is the same as undoing or redoing both
+        changes one after the other.
+
+        :param later: delta of the later change.
+        :type later: PointDelta
+
+        :rtype: PointDelta
+        """
+        indices = np.union1d(self.indices, later.indices)
+        first = np.searchsorted(indices, self.indices)
+        second = np.searchsorted(indices, later.indices)
+        dtype = np.result_type(self.dtype, later.dtype)
+        before = np.empty((len(indices),) + self.shape[1:], dtype=dtype)
+        after = np.empty_like(before)
+
+        before[second] = later._unpack(later._before, later.dtype, later.shape)
+        before[first] = self._unpack(self._before, self.dtype, self.shape)
+        after[first] = self._unpack(self._after, self.dtype, self.shape)
+        after[second] = later._unpack(later._after, later.dtype, later.shape)
+
+        # Points moved back to their original position are left out.
+        changed = (before != after).reshape(len(indices), -1).any(axis=1)
+        return PointDelta(
+            indices[changed], before[changed], after[changed], compress=self.compressed
+        )
+
+    def spill(self, prefix):
+        """Move the delta to scratch files, mapped back in memory when the delta
+        is applied.
+
+        :param prefix: path prefix of the scratch files.
+        :type prefix: str
+        """
+        if self.files:
+            return
+        self.files = ["{}_{}.npy".format(prefix, name) for name in ("i", "b", "a")]
+        self._indices, self._before, self._after = [
+            spill_array(data, path) for data, path in zip(self._arrays(), self.files)
+        ]
+
+    def release(self):
+        """Release the data of the delta and remove its scratch files, the delta
+        cannot be applied anymore."""
+        self._indices = self._before = self._after = None
+        remove_files(self.files)
+        self.files = []
+
+    @property
+    def indices(self):
+        """Return the indices of the points that changed.
+
+        :rtype: numpy.ndarray
+        """
+        return self._unpack(self._indices, np.int32, (self.count,))
+
+    def undo(self, positions):
+        """Restore the positions of the changed points before the change.
+
+        :param positions: ``(n, 3)`` positions of the points, modified in place.
+        :type positions: numpy.ndarray
+
+        :return: the modified positions.
+        :rtype: numpy.ndarray
+        """
+        positions[self.indices] = self._unpack(self._before, self.dtype, self.shape)
+        return positions
+
+    def redo(self, positions):
+        """Set the positions of the changed points after the change.
+
+        :param positions: ``(n, 3)`` positions of the points, modified in place.
+        :type positions: numpy.ndarray
+
+        :return: the modified positions.
+        :rtype: numpy.ndarray
+        """
+        positions[self.indices] = self._unpack(self._after, self.dtype, self.shape)
+        return positions
+
+    def _arrays(self):
+        return self._indices, self._before, self._after
+
+    def _pack(self, array):
+        if self.compressed:
+            data = zlib.compress(np.ascontiguousarray(array).tobytes(), 1)
+            return np.frombuffer(data, dtype=np.uint8)
+        return array
+
+    def _unpack(self, data, dtype, shape):
+        if self.compressed:
+            return np.frombuffer(zlib.decompress(data), dtype=dtype).reshape(shape)
+        return data
@@ -0,0 +1,791 @@
+import collections
+import concurrent.futures
+import itertools
+import logging
+import math
+import os
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+# Neighbouring cell offsets, in the exact order the spatial hash reference
+# engine visits them (di, then dj, then dk, each in (-1, 0, 1)).
+NEIGHBOUR_OFFSETS = np.array(
+    list(itertools.product((-1, 0, 1), repeat=3)), dtype=np.int64
+)
+
+# Average number of vertices per occupied cell aimed for by the nearest mirror
+# search grid.
+TARGET_OCCUPANCY = 4
+
+# Number of query vertices processed at once, this bounds the size of the
+# temporary candidate arrays to a few tens of MB.
+CHUNK_SIZE = 1 << 16
+
+# Role of each vertex in an array-backed symmetry table. Targets and centers
+# are the keys of the ``{target: source}`` symmetry map, centers being mapped
+# to themselves.
+ROLE_UNMATCHED = 0
+ROLE_SOURCE = 1
+ROLE_TARGET = 2
+ROLE_CENTER = 3
+
+
+def default_workers():
+    """Get the number of threads to use for a parallel match, one per CPU.
+
+    :rtype: int
+    """
+    return os.cpu_count() or 1
+
+
+def map_chunks(function, chunks, workers=1, progress=None):
+    """Apply a function to chunks of queries, in a pool of threads when several
+    workers are requested.
+
+    The heavy lifting of the matching functions is done by numpy kernels that
+    release the GIL, so threads scale with the cores while sharing the grid
+    and positions instead of copying them to other processes. Results are
+    yielded in the order of the chunks whatever the order in which they are
+    computed, so that merging them gives the same output as a serial run.
+
+    :param function: function processing one chunk.
+    :type function: callable
+
+    :param chunks: chunks to process.
+    :type chunks: list
+
+    :param workers: number of threads, 1 to process the chunks serially.
+    :type workers: int
+
+    :param progress: optional function called with the number of processed
+    chunks and the number of chunks after each chunk. An exception raised by it
+    stops the processing, the chunks that did not start yet are skipped.
+    :type progress: callable
+
+    :return: result of the function for each chunk, in order.
+    :rtype: iterator
+    """
+    count = len(chunks)
+    if workers is None or workers <= 1 or count < 2:
+        for index, chunk in enumerate(chunks):
+            result = function(chunk)
+            if progress is not None:
+                progress(index + 1, count)
+            yield result
+        return
+    with concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(workers, count)
+    ) as executor:
+        futures = [executor.submit(function, chunk) for chunk in chunks]
+        try:
+            for index, future in enumerate(futures):
+                result = future.result()
+                if progress is not None:
+                    progress(index + 1, count)
+                yield result
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def quantize(positions, inv_cell):
+    """Quantize an array of 3D positions into integer grid cell keys.
+
+    This is the vectorized equivalent of
+    :meth:`domain.table.GeometryTable._compute_cell_key`, each coordinate is
+    rounded half away from zero, using the exact same floating point
+    operations so that both produce identical cells.
+
+    :param positions: positions to quantize.
+    :type positions: numpy.ndarray
+
+    :param inv_cell: inverse of the grid cell size (``1.0 / cell_size``).
+    :type inv_cell: float
+
+    :return: integer grid cell indices, one row per position.
+    :rtype: numpy.ndarray
+    """
+    scaled = positions * inv_cell
+    scaled += np.where(positions >= 0, 0.5, -0.5)
+    return scaled.astype(np.int64)
+
+
+class SpatialGrid(object):
+    def __init__(self, positions, cell_size):
+        """Sorted uniform grid used to find the vertices in a given cell.
+
+        Every position is quantized into an integer cell, cells are then
+        encoded as a single integer key and sorted so that the content of any
+        cell can be found with a binary search. Within a cell vertices are
+        kept in ascending index order, like the insertion order of the
+        dictionary based spatial hash.
+
+        A small occupancy bitmap indexed by the low bits of the keys is kept
+        alongside the sorted keys, it discards most of the empty neighbour
+        cells before running the comparatively expensive binary searches.
+
+        :param positions: positions of all the mesh vertices.
+        :type positions: numpy.ndarray
+
+        :param cell_size: size of a grid cell.
+        :type cell_size: float
+        """
+        self.positions = positions
+        self.cell_size = cell_size
+        self.inv_cell = 1.0 / cell_size
+
+        cells = quantize(positions, self.inv_cell)
+        if len(cells):
+            self._origin = cells.min(axis=0)
+            self._shape = cells.max(axis=0) - self._origin + 1
+        else:
+            self._origin = np.zeros(3, dtype=np.int64)
+            self._shape = np.ones(3, dtype=np.int64)
+
+        # Mirrored cells can lie up to twice the grid extent away from the
+        # origin, keep enough headroom so that their keys never overflow.
+        if int(self._shape[0]) * int(self._shape[1]) * int(self._shape[2]) >= 2**58:
+            raise OverflowError(
+                "Grid of {} cells is too large to be encoded, "
+                "the cell size is too small for the mesh bounds.".format(
+                    self._shape.tolist()
+                )
+            )
+        self._strides = np.array(
+            [self._shape[1] * self._shape[2], self._shape[2], 1], dtype=np.int64
+        )
+
+        keys = self.encode(cells)
+        self.order = np.argsort(keys, kind="stable")
+        self.keys, self.starts, self.counts = np.unique(
+            keys[self.order], return_index=True, return_counts=True
+        )
+
+        bitmap_size = 1 << max(int(len(self.keys) * 8).bit_length(), 10)
+        self._bitmap_mask = bitmap_size - 1
+        self._bitmap = np.zeros(bitmap_size, dtype=bool)
+        self._bitmap[self.keys & self._bitmap_mask] = True
+
+    def __len__(self):
+        return len(self.positions)
+
+    @property
+    def occupancy(self):
+        """Average number of vertices in the cell of a vertex.
+
+        :rtype: float
+        """
+        if not len(self.positions):
+            return 0.0
+        return float(np.dot(self.counts, self.counts)) / len(self.positions)
+
+    def chunk_size(self, cell_count):
+        """Get the number of queries to process at once when looking up cells.
+
+        :param cell_count: number of cells looked up for each query.
+        :type cell_count: int
+
+        :return: number of queries that keeps the candidate arrays of a chunk
+        in the same order of magnitude as :data:`CHUNK_SIZE` 27 cells queries
+        on a sparse grid.
+        :rtype: int
+        """
+        candidates = cell_count * max(self.occupancy, 1.0)
+        return max(int(CHUNK_SIZE * len(NEIGHBOUR_OFFSETS) / candidates), 1)
+
+    def encode(self, cells):
+        """Encode integer cells as a single integer key.
+
+        :param cells: integer cell indices, one row per cell.
+        :type cells: numpy.ndarray
+
+        :return: key of each cell, or -1 for cells outside of the grid bounds.
+        :rtype: numpy.ndarray
+        """
+        local = cells - self._origin
+        inside = np.all((local >= 0) & (local < self._shape), axis=1)
+        keys = local @ self._strides
+        keys[~inside] = -1
+        return keys
+
+    def neighbour_keys(self, cells, offsets=NEIGHBOUR_OFFSETS):
+        """Encode the cells surrounding each of the specified cells.
+
+        :param cells: integer cell indices, one row per cell.
+        :type cells: numpy.ndarray
+
+        :param offsets: integer offsets of the neighbouring cells to encode.
+        :type offsets: numpy.ndarray
+
+        :return: keys of the neighbouring cells, one row per cell and one
+        column per offset, -1 for neighbours outside of the grid bounds.
+        :rtype: numpy.ndarray
+        """
+        local = cells - self._origin
+        keys = (local @ self._strides)[:, None] + (offsets @ self._strides)[None, :]
+
+        inside = np.ones(keys.shape, dtype=bool)
+        for dim in range(3):
+            steps = np.unique(offsets[:, dim])
+            coords = local[:, dim, None] + steps[None, :]
+            valid = (coords >= 0) & (coords < self._shape[dim])
+            inside &= valid[:, np.searchsorted(steps, offsets[:, dim])]
+        keys[~inside] = -1
+        return keys
+
+    def lookup(self, keys):
+        """Get every vertex contained in the cells with the specified keys.
+
+        :param keys: keys of the cells, as returned by :meth:`encode`.
+        :type keys: numpy.ndarray
+
+        :return: for each vertex found, the position of its cell in ``keys``
+        and the index of the vertex. Results are ordered by cell position,
+        then by vertex index.
+        :rtype: numpy.ndarray, numpy.ndarray
+        """
+        keys = keys.ravel()
+        rows = np.flatnonzero(keys >= 0)
+        rows = rows[self._bitmap[keys[rows] & self._bitmap_mask]]
+
+        slots = np.searchsorted(self.keys, keys[rows])
+        slots = np.minimum(slots, len(self.keys) - 1)
+        found = self.keys[slots] == keys[rows]
+        rows = rows[found]
+        slots = slots[found]
+
+        counts = self.counts[slots]
+        group_starts = np.cumsum(counts) - counts
+        within = np.arange(counts.sum()) - np.repeat(group_starts, counts)
+        vertices = self.order[np.repeat(self.starts[slots], counts) + within]
+
+        return np.repeat(rows, counts), vertices
+
+
+def mirror(positions, axis):
+    """Mirror positions across the symmetry plane of the specified axis.
+
+    :param positions: positions to mirror.
+    :type positions: numpy.ndarray
+
+    :param axis: index of the symmetry axis (0 = X, 1 = Y, 2 = Z).
+    :type axis: int
+
+    :return: mirrored copy of the positions.
+    :rtype: numpy.ndarray
+    """
+    mirrored = positions.copy()
+    mirrored[:, axis] = -mirrored[:, axis]
+    return mirrored
+
+
+def match_spatial_hash(
+    positions,
+    axis,
+    threshold,
+    positive,
+    grid=None,
+    return_ambiguous=False,
+    workers=1,
+    progress=None,
+):
+    """Vectorized equivalent of the spatial hash symmetry matching.
+
+    The pairing is identical to the one of
+    :meth:`domain.table.GeometryTable._build_spatial_hash_map`: all positions
+    are quantized in one array operation, candidates are gathered from the 27
+    cells around each mirror position with batched binary searches and, when
+    several candidates claim the same target, the last one in the reference
+    visiting order (vertex, neighbour cell, candidate index) wins.
+
+    :param positions: positions of all mesh vertices.
+    :type positions: numpy.ndarray
+
+    :param axis: index of the symmetry axis (0 = X, 1 = Y, 2 = Z).
+    :type axis: int
+
+    :param threshold: maximum distance between a mirrored vertex and its match.
+    :type threshold: float
+
+    :param positive: True if the sources are on the negative side of the axis.
+    :type positive: bool
+
+    :param grid: optional grid built from ``positions`` with a cell size equal
+    to the threshold, to share it between several matches.
+    :type grid: SpatialGrid
+
+    :param return_ambiguous: if True, also return a mask of the vertices that
+    have several candidates within the threshold of their mirror position.
+    :type return_ambiguous: bool
+
+    :param workers: number of threads matching chunks of vertices in parallel,
+    the result does not depend on it.
+    :type workers: int
+
+    :param progress: optional function called with the number of matched
+    vertices and the number of vertices after each chunk, see :func:`map_chunks`.
+    :type progress: callable
+
+    :return: target indices and their matching source indices, followed by the
+    ambiguous mask if requested.
+    :rtype: numpy.ndarray, numpy.ndarray
+    """
+    n = len(positions)
+    ambiguous = np.zeros(n, dtype=bool)
+    if n == 0:
+        pairs = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return pairs + (ambiguous,) if return_ambiguous else pairs
+
+    if grid is None:
+        grid = SpatialGrid(positions, threshold if threshold > 0 else 1.0)
+    threshold_sq = threshold * threshold
+
+    mirrored = mirror(positions, axis)
+    mirrored_cells = quantize(mirrored, grid.inv_cell)
+    neighbour_count = len(NEIGHBOUR_OFFSETS)
+    chunk_size = grid.chunk_size(neighbour_count)
+
+    def match_chunk(start):
+        stop = min(start + chunk_size, n)
+        keys = grid.neighbour_keys(mirrored_cells[start:stop])
+        rows, others = grid.lookup(keys)
+        indices = start + rows // neighbour_count
+
+        delta = mirrored[indices] - positions[others]
+        distance_sq = (
+            delta[:, 0] * delta[:, 0]
+            + delta[:, 1] * delta[:, 1]
+            + delta[:, 2] * delta[:, 2]
+        )
+        close = distance_sq < threshold_sq
+        indices = indices[close]
+        others = others[close]
+        ambiguous[start:stop] = np.bincount(indices - start, minlength=stop - start) > 1
+
+        if positive:
+            swap = positions[indices, axis] < positions[others, axis]
+        else:
+            swap = positions[indices, axis] > positions[others, axis]
+        targets = np.where(swap, others, indices)
+        sources = np.where(swap, indices, others)
+
+        # Keep the last assignment of each target, like successive dict writes.
+        targets, last = np.unique(targets[::-1], return_index=True)
+        return targets, sources[::-1][last]
+
+    # Chunks are merged in order so that later ones take precedence.
+    source_of = np.full(n, -1, dtype=np.int64)
+    chunk_progress = None
+    if progress is not None:
+
+        def chunk_progress(done, count):
+            progress(min(done * chunk_size, n), n)
+
+    for targets, sources in map_chunks(
+        match_chunk, range(0, n, chunk_size), workers, chunk_progress
+    ):
+        source_of[targets] = sources
+
+    targets = np.flatnonzero(source_of >= 0)
+    sources = source_of[targets]
+    log.debug("Matched %d targets out of %d points.", len(targets), n)
+    if return_ambiguous:
+        return targets, sources, ambiguous
+    return targets, sources
+
+
+MirrorCandidates = collections.namedtuple(
+    "MirrorCandidates", ["nearest", "distance", "second_distance"]
+)
+MirrorCandidates.__doc__ = """Nearest vertex to the mirror position of every vertex.
+
+``nearest`` holds the index of the closest vertex (-1 when there is none within
+the search radius), ``distance`` its distance to the mirror position and
+``second_distance`` the distance of the second closest vertex (``inf`` when
+there is none within the search radius).
+"""
+
+
+def shell_offsets(shell):
+    """Get the offsets of the cells at a given Chebyshev distance of a cell.
+
+    :param shell: Chebyshev distance, in cells, of the offsets to get.
+    :type shell: int
+
+    :return: integer cell offsets, one row per cell.
+    :rtype: numpy.ndarray
+    """
+    steps = np.arange(-shell, shell + 1, dtype=np.int64)
+    offsets = np.stack(np.meshgrid(steps, steps, steps, indexing="ij"), axis=-1)
+    offsets = offsets.reshape(-1, 3)
+    return offsets[np.abs(offsets).max(axis=1) == shell]
+
+
+def density_grid(positions, radius):
+    """Build a grid whose cell size is adapted to the vertex density of a mesh.
+
+    The cell size starts from the mesh average vertex spacing, estimated from
+    the surface of its bounding box, and is refined until occupied cells hold
+    about :data:`TARGET_OCCUPANCY` vertices. It never exceeds the radius, so
+    that sparse meshes with a small threshold only ever inspect a handful of
+    cells per vertex.
+
+    :param positions: positions of all the mesh vertices.
+    :type positions: numpy.ndarray
+
+    :param radius: maximum search radius.
+    :type radius: float
+
+    :return: grid of the positions.
+    :rtype: SpatialGrid
+    """
+    cell_size = radius if radius > 0 else 1.0
+    if len(positions):
+        extents = positions.max(axis=0) - positions.min(axis=0)
+        area = 2.0 * (
+            extents[0] * extents[1] + extents[1] * extents[2] + extents[0] * extents[2]
+        )
+        if area > 0:
+            cell_size = min(cell_size, math.sqrt(area / len(positions)))
+
+    grid = SpatialGrid(positions, cell_size)
+    for _ in range(4):
+        occupancy = len(positions) / float(max(len(grid.keys), 1))
+        if occupancy <= 2 * TARGET_OCCUPANCY:
+            break
+        grid = SpatialGrid(
+            positions, grid.cell_size / math.sqrt(occupancy / TARGET_OCCUPANCY)
+        )
+    return grid
+
+
+def find_nearest_mirrors(positions, axis, radius, grid=None, workers=1, progress=None):
+    """Find the nearest and second nearest vertex to every mirror position.
+
+    The grid is searched shell by shell around each mirror position: after
+    scanning all the cells up to a Chebyshev distance ``r``, every vertex left
+    is at least ``r * cell_size`` away, so a query is complete as soon as its
+    second nearest candidate is closer than that, or when that bound exceeds
+    the search radius. Since the cell size follows the vertex density instead
+    of the radius, the work per vertex stays bounded when the radius is large
+    compared with the vertex spacing, and the whole search is dominated by the
+    ``O(n log n)`` sort of the grid keys.
+
+    Candidates at the same distance, as returned in ``distance``, are resolved
+    in favour of the lowest vertex index.
+
+    :param positions: positions of all mesh vertices.
+    :type positions: numpy.ndarray
+
+    :param axis: index of the symmetry axis (0 = X, 1 = Y, 2 = Z).
+    :type axis: int
+
+    :param radius: maximum distance between a mirrored vertex and its match.
+    :type radius: float
+
+    :param grid: optional grid built from ``positions``, to share it between
+    several searches.
+    :type grid: SpatialGrid
+
+    :param workers: number of threads searching chunks of vertices in
+    parallel, the result does not depend on it.
+    :type workers: int
+
+    :param progress: optional function called with the number of vertices
+    whose candidates are final and the number of vertices after each chunk,
+    see :func:`map_chunks`.
+    :type progress: callable
+
+    :return: nearest candidates of every vertex.
+    :rtype: MirrorCandidates
+    """
+    n = len(positions)
+    nearest = np.full(n, -1, dtype=np.int64)
+    distance = np.full(n, np.inf)
+    second_distance = np.full(n, np.inf)
+    if n == 0 or radius <= 0:
+        return MirrorCandidates(nearest, distance, second_distance)
+
+    if grid is None:
+        grid = density_grid(positions, radius)
+    radius_sq = radius * radius
+
+    mirrored = mirror(positions, axis)
+    mirrored_cells = quantize(mirrored, grid.inv_cell)
+
+    def search_chunk(queries):
+        keys = grid.neighbour_keys(mirrored_cells[queries], offsets)
+        rows, others = grid.lookup(keys)
+        indices = queries[rows // len(offsets)]
+
+        delta = mirrored[indices] - positions[others]
+        candidate_sq = (
+            delta[:, 0] * delta[:, 0]
+            + delta[:, 1] * delta[:, 1]
+            + delta[:, 2] * delta[:, 2]
+        )
+        close = candidate_sq < radius_sq
+        if close.any():
+            # Ties are broken on the distances that are returned, two squared
+            # distances a rounding apart can have the same square root.
+            # Chunks hold distinct queries, so they update distinct entries.
+            _merge_candidates(
+                indices[close],
+                others[close],
+                np.sqrt(candidate_sq[close]),
+                nearest,
+                distance,
+                second_distance,
+            )
+
+    active = np.arange(n)
+    chunk_progress = None
+    if progress is not None:
+
+        def chunk_progress(done, count):
+            progress(n - len(active), n)
+
+    shell = 0
+    while len(active):
+        offsets = shell_offsets(shell)
+        chunk_size = grid.chunk_size(len(offsets))
+        chunks = [
+            active[start : start + chunk_size]
+            for start in range(0, len(active), chunk_size)
+        ]
+        for _ in map_chunks(search_chunk, chunks, workers, chunk_progress):
+            pass
+
+        # Every vertex outside of the scanned shells is at least this far away.
+        covered = shell * grid.cell_size
+        if covered >= radius:
+            break
+        # Keep a tiny margin for the rounding of the quantization when
+        # comparing against the actual candidates.
+        covered -= 1e-6 * grid.cell_size
+        if covered > 0:
+            active = active[second_distance[active] >= covered]
+        shell += 1
+
+    return MirrorCandidates(nearest, distance, second_distance)
+
+
+def _merge_candidates(
+    indices, others, candidate_distance, nearest, distance, second_distance
+):
+    """Merge new candidates into the nearest and second nearest arrays, in place.
+
+    :param indices: index of the queried vertex of each candidate, candidates
+    must be grouped by query, in ascending query order.
+    :type indices: numpy.ndarray
+
+    :param others: index of each candidate vertex.
+    :type others: numpy.ndarray
+
+    :param candidate_distance: distance of each candidate to its query.
+    :type candidate_distance: numpy.ndarray
+
+    :param nearest: index of the nearest candidate of every vertex.
+    :type nearest: numpy.ndarray
+
+    :param distance: distance of the nearest candidate of every vertex.
+    :type distance: numpy.ndarray
+
+    :param second_distance: distance of the second nearest candidate of every
+    vertex.
+    :type second_distance: numpy.ndarray
+    """
+    starts = np.flatnonzero(np.r_[True, indices[1:] != indices[:-1]])
+    queries = indices[starts]
+    group = np.cumsum(np.r_[False, indices[1:] != indices[:-1]])
+
+    # Nearest and second nearest of the new candidates, ties being resolved in
+    # favour of the lowest vertex index.
+    best_distance = np.minimum.reduceat(candidate_distance, starts)
+    tied = candidate_distance == best_distance[group]
+    best = np.minimum.reduceat(np.where(tied, others, len(nearest)), starts)
+    chosen = tied & (others == best[group])
+    best_second = np.minimum.reduceat(
+        np.where(chosen, np.inf, candidate_distance), starts
+    )
+
+    # Merge them with the candidates found in the previous shells, with the
+    # same tie break.
+    previous = nearest[queries]
+    previous_distance = distance[queries]
+    new_wins = (best_distance < previous_distance) | (
+        (best_distance == previous_distance) & ((previous < 0) | (best < previous))
+    )
+    loser_distance = np.where(new_wins, previous_distance, best_distance)
+    nearest[queries] = np.where(new_wins, best, previous)
+    distance[queries] = np.where(new_wins, best_distance, previous_distance)
+    second_distance[queries] = np.minimum(
+        np.minimum(second_distance[queries], best_second), loser_distance
+    )
+
+
+def match_nearest(positions, axis, threshold, positive, candidates=None, workers=1):
+    """Match every vertex with the vertex closest to its mirror position.
+
+    Each vertex is paired with its nearest mirror candidate, then the pair is
+    oriented according to the direction like in the spatial hash engine.
+    When several vertices claim the same target, the closest one wins.
+
+    A vertex is ambiguous when a second candidate lies within the threshold of
+    its mirror position, or when it is a target claimed by several sources, in
+    which case the sources that lost the target are ambiguous as well.
+
+    :param positions: positions of all mesh vertices.
+    :type positions: numpy.ndarray
+
+    :param axis: index of the symmetry axis (0 = X, 1 = Y, 2 = Z).
+    :type axis: int
+
+    :param threshold: maximum distance between a mirrored vertex and its match.
+    :type threshold: float
+
+    :param positive: True if the sources are on the negative side of the axis.
+    :type positive: bool
+
+    :param candidates: optional precomputed nearest candidates, searched within
+    a radius at least equal to the threshold.
+    :type candidates: MirrorCandidates
+
+    :param workers: number of threads searching the candidates in parallel.
+    :type workers: int
+
+    :return: target indices, their matching source indices and a mask of the
+    ambiguous vertices.
+    :rtype: numpy.ndarray, numpy.ndarray, numpy.ndarray
+    """
+    if candidates is None:
+        candidates = find_nearest_mirrors(positions, axis, threshold, workers=workers)
+
+    indices = np.flatnonzero(candidates.distance < threshold)
+    others = candidates.nearest[indices]
+    distances = candidates.distance[indices]
+
+    if positive:
+        swap = positions[indices, axis] < positions[others, axis]
+    else:
+        swap = positions[indices, axis] > positions[others, axis]
+    targets = np.where(swap, others, indices)
+    sources = np.where(swap, indices, others)
+
+    order = np.lexsort((sources, distances, targets))
+    targets = targets[order]
+    sources = sources[order]
+    firsts = np.ones(len(targets), dtype=bool)
+    firsts[1:] = targets[1:] != targets[:-1]
+
+    ambiguous = candidates.second_distance < threshold
+    claimed = np.zeros(len(positions), dtype=bool)
+    repeated = ~firsts & (sources != np.roll(sources, 1))
+    claimed[targets[repeated]] = True
+    claimed[sources[repeated]] = True
+    ambiguous |= claimed
+
+    return targets[firsts], sources[firsts], ambiguous
+
+
+def mirror_arrays(targets, sources, count):
+    """Convert matched pairs to a mirror index and a role per vertex.
+
+    ``mirror_index[i]`` is the index of the vertex mirrored by vertex ``i``, or
+    -1 if it has no mirror. A target is mapped to its source and a source to its
+    target. When a vertex is both a source and a target, which only happens
+    around the symmetry plane, its target role takes precedence so that the
+    ``{target: source}`` map can always be rebuilt, see :func:`mirror_pairs`.
+
+    :param targets: target indices.
+    :type targets: numpy.ndarray
+
+    :param sources: source index of each target.
+    :type sources: numpy.ndarray
+
+    :param count: number of vertices of the mesh.
+    :type count: int
+
+    :return: int32 mirror index and int8 role (see ``ROLE_*``) of each vertex.
+    :rtype: numpy.ndarray, numpy.ndarray
+    """
+    targets = np.asarray(targets, dtype=np.int64)
+    sources = np.asarray(sources, dtype=np.int64)
+    mirror_index = np.full(count, -1, dtype=np.int32)
+    roles = np.full(count, ROLE_UNMATCHED, dtype=np.int8)
+
+    mirror_index[sources] = targets
+    roles[sources] = ROLE_SOURCE
+    mirror_index[targets] = sources
+    roles[targets] = np.where(targets == sources, ROLE_CENTER, ROLE_TARGET)
+    return mirror_index, roles
+
+
+def flip_roles(roles):
+    """Swap the source and target roles of an array-backed symmetry table.
+
+    When every vertex has at most one candidate within the threshold, the pairs
+    do not depend on the direction and this gives the roles of the opposite
+    direction, the mirror index being unchanged.
+
+    :param roles: role of each vertex, see :func:`mirror_arrays`.
+    :type roles: numpy.ndarray
+
+    :return: roles with the sources and targets swapped.
+    :rtype: numpy.ndarray
+    """
+    flipped = roles.copy()
+    flipped[roles == ROLE_SOURCE] = ROLE_TARGET
+    flipped[roles == ROLE_TARGET] = ROLE_SOURCE
+    return flipped
+
+
+def mirror_errors(positions, axis, mirror_index, unmatched=None):
+    """Compute the distance between the mirror position of every vertex and
+    the vertex it is mirrored with.
+
+    :param positions: positions of all mesh vertices.
+    :type positions: numpy.ndarray
+
+    :param axis: index of the symmetry axis (0 = X, 1 = Y, 2 = Z).
+    :type axis: int
+
+    :param mirror_index: mirror index of each vertex, see :func:`mirror_arrays`.
+    :type mirror_index: numpy.ndarray
+
+    :param unmatched: optional error of every vertex, used for the vertices
+    without a mirror, like the distance to their nearest mirror candidate.
+    Their error is infinite otherwise.
+    :type unmatched: numpy.ndarray
+
+    :return: float64 mirror error of each vertex.
+    :rtype: numpy.ndarray
+    """
+    errors = np.full(len(positions), np.inf)
+    matched = np.flatnonzero(mirror_index >= 0)
+    mirrors = mirror_index[matched]
+    offsets = positions[mirrors] - positions[matched]
+    offsets[:, axis] = positions[mirrors, axis] + positions[matched, axis]
+    errors[matched] = np.sqrt(np.einsum("ij,ij->i", offsets, offsets))
+    if unmatched is not None:
+        missing = mirror_index < 0
+        errors[missing] = unmatched[missing]
+    return errors
+
+
+def mirror_pairs(mirror_index, roles):
+    """Get the matched pairs of an array-backed symmetry table.
+
+    :param mirror_index: mirror index of each vertex, see :func:`mirror_arrays`.
+    :type mirror_index: numpy.ndarray
+
+    :param roles: role of each vertex, see :func:`mirror_arrays`.
+    :type roles: numpy.ndarray
+
+    :return: ascending target indices (centers included) and their source indices.
+    :rtype: numpy.ndarray, numpy.ndarray
+    """
+    targets = np.flatnonzero(roles >= ROLE_TARGET)
+    return targets, mirror_index[targets].astype(np.int64)
@@ -0,0 +1,317 @@
+import collections
+import logging
+import os
+
+from sym_mesh.domain import backend
+from sym_mesh.domain import dag_path
+from sym_mesh.domain import table
+from sym_mesh.domain import table_cache
+
+log = logging.getLogger(__name__)
+
+
+def topology_fingerprint(path):
+    """Compute the fingerprint of the topology of a mesh, see
+    :func:`domain.table_cache.topology_fingerprint`.
+
+    :param path: path of the mesh.
+
+    :rtype: str
+    """
+    mesh_backend = backend.get_backend()
+    return table_cache.topology_fingerprint(
+        mesh_backend.get_topology(path)[0], *mesh_backend.get_face_vertices(path)
+    )
+
+
+def default_max_size():
+    """Get the memory budget of the registry in bytes, from the
+    ``SYM_MESH_REGISTRY_MAX_SIZE`` environment variable (in MB) if it is set,
+    1024 MB otherwise.
+
+    :rtype: int
+    """
+    return int(float(os.environ.get("SYM_MESH_REGISTRY_MAX_SIZE", 1024)) * 1024**2)
+
+
+class _Entry(object):
+    def __init__(self, geometry_table, path):
+        """Geometry table held by a :class:`TableRegistry`.
+
+        :param geometry_table: geometry table of the mesh.
+        :type geometry_table: domain.table.GeometryTable
+
+        :param path: path of the mesh.
+        """
+        self.table = geometry_table
+        self.path = path
+        self.callback_id = None
+        self.stale = False
+        self._topology = None
+
+    @property
+    def topology(self):
+        """Return the fingerprint of the topology of the mesh, computed the
+        first time it is requested.
+
+        :rtype: str
+        """
+        if self._topology is None:
+            self._topology = topology_fingerprint(self.path)
+        return self._topology
+
+    def mark_stale(self):
+        self.stale = True
+
+
+class TableRegistry(object):
+    def __init__(self, max_size=None, share_topology=True):
+        """In-memory registry of the geometry tables of the meshes of the scene.
+
+        A table is built the first time it is requested for a mesh, then the
+        same table, with its point positions and symmetry tables, is returned
+        until the points or the topology of the mesh change. The backend
+        notifies these changes, see
+        :meth:`domain.backend.MeshBackend.add_change_callback`, so checking a
+        table costs nothing.
+
+        The least recently used tables are dropped once the arrays of all the
+        tables exceed the memory budget.
+
+        :param max_size: memory budget of the registry in bytes, see
+        :func:`default_max_size` when not specified.
+        :type max_size: int
+
+        :param share_topology: if True, the lazy table of a new mesh shares the
+        symmetry tables of a registered mesh with the same topology, built with
+        the same threshold and space, instead of matching its own vertices.
+        Only the positions of the new mesh are read, which suits blendshape
+        targets sculpted from the same base. Tables built on initialization
+        always match their own vertices, a mesh with the same topology may not
+        be symmetrical the same way.
+        :type share_topology: bool
+        """
+        self.max_size = default_max_size() if max_size is None else max_size
+        self.share_topology = share_topology
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        """Return the memory held by the arrays of all the tables, the arrays
+        shared by several tables being counted once.
+
+        :rtype: int
+        """
+        arrays = {
+            id(array): array
+            for entry in self._entries.values()
+            for array in entry.table.get_arrays()
+        }
+        return sum(array.nbytes for array in arrays.values())
+
+    def get(self, mesh, axis="x", direction="positive", threshold=0.001, **kwargs):
+        """Get the geometry table of a mesh, from the registry when the mesh did
+        not change since the table was built.
+
+        The axis, direction and threshold of a registered table are updated
+        through its setters, which reuse its symmetry tables when possible.
+
+        :param mesh: name of the mesh.
+        :type mesh: str
+
+        :param axis: axis of the table.
+        :type axis: str
+
+        :param direction: direction of the table.
+        :type direction: str
+
+        :param threshold: threshold of the table.
+        :type threshold: float
+
+        :param kwargs: other hashable arguments of the table, see
+        :class:`domain.table.GeometryTable`. Tables built with other arguments
+        are registered separately.
+
+        :return: geometry table of the mesh.
+        :rtype: domain.table.GeometryTable
+        """
+        geometry_table = self.lookup(
+            mesh, axis=axis, direction=direction, threshold=threshold, **kwargs
+        )
+        if geometry_table is None:
+            mirror_table = None
+            if self.share_topology and kwargs.get("lazy"):
+                mirror_table = self.find_mirror_table(
+                    mesh, threshold, kwargs.get("space", backend.OBJECT_SPACE)
+                )
+            geometry_table = table.GeometryTable(
+                mesh,
+                axis=axis,
+                direction=direction,
+                threshold=threshold,
+                mirror_table=mirror_table,
+                **kwargs
+            )
+            self.add(geometry_table, **kwargs)
+        return geometry_table
+
+    def lookup(self, mesh, axis="x", direction="positive", threshold=0.001, **kwargs):
+        """Get the registered geometry table of a mesh, if the mesh did not
+        change since the table was built and its symmetry tables can be
+        filtered for the threshold, see :meth:`get` and
+        :meth:`domain.table.GeometryTable.can_filter`.
+
+        :return: geometry table of the mesh, None if it must be built.
+        :rtype: domain.table.GeometryTable
+        """
+        key = self._get_key(dag_path.create_MDagPath(mesh), kwargs)
+        entry = self._entries.get(key)
+        if entry is not None and entry.stale:
+            log.debug("Mesh '%s' changed, dropping its geometry table.", mesh)
+            self._remove(key)
+            entry = None
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry.table.threshold != threshold and not entry.table.can_filter(threshold):
+            log.debug(
+                "The table of mesh '%s' must be rebuilt for threshold %s.",
+                mesh,
+                threshold,
+            )
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        if entry.table.threshold != threshold:
+            entry.table.threshold = threshold
+        if entry.table.direction != direction:
+            entry.table.direction = direction
+        if entry.table.axis != table.GeometryTable.AXES.index(axis):
+            entry.table.axis = axis
+        self._evict()
+        return entry.table
+
+    def add(self, geometry_table, **kwargs):
+        """Register the geometry table of a mesh, built from its current points.
+
+        :param geometry_table: geometry table of the mesh.
+        :type geometry_table: domain.table.GeometryTable
+
+        :param kwargs: other hashable arguments the table was built with, see
+        :meth:`get`.
+        """
+        key = self._get_key(geometry_table.dag_path, kwargs)
+        if key in self._entries:
+            self._remove(key)
+        entry = _Entry(geometry_table, geometry_table.dag_path)
+        entry.callback_id = backend.get_backend().add_change_callback(
+            entry.path, entry.mark_stale
+        )
+        self._entries[key] = entry
+        self._evict()
+
+    @staticmethod
+    def _get_key(path, kwargs):
+        """Get the key of the table of a mesh built with some arguments. Tables
+        are registered by mesh node, see
+        :meth:`domain.backend.MeshBackend.get_node_id`, so that the table of a
+        renamed mesh is still found and never given to another mesh created
+        with the same name.
+
+        :param path: path of the mesh.
+
+        :rtype: tuple
+        """
+        node_id = backend.get_backend().get_node_id(path)
+        return node_id, tuple(sorted(kwargs.items()))
+
+    def find_mirror_table(self, mesh, threshold, space=backend.OBJECT_SPACE):
+        """Find the most recently used table with built symmetry tables whose
+        mesh has the same topology as a mesh.
+
+        The topology of the meshes is only compared when their vertex counts
+        match, reading the connectivity of a large mesh is not free.
+
+        :param mesh: name of the mesh.
+        :type mesh: str
+
+        :param threshold: threshold the table must be built with.
+        :type threshold: float
+
+        :param space: space the table must be built in.
+        :type space: int
+
+        :return: table to share the symmetry tables of, if any.
+        :rtype: domain.table.GeometryTable
+        """
+        path = dag_path.create_MDagPath(mesh)
+        vertex_count = backend.get_backend().get_topology(path)[0]
+        candidates = [
+            entry
+            for entry in reversed(self._entries.values())
+            if not entry.stale
+            and entry.table.is_built
+            and len(entry.table.point_array) == vertex_count
+            and entry.table.threshold == threshold
+            and entry.table.space == space
+        ]
+        if not candidates:
+            return None
+        topology = topology_fingerprint(path)
+        for entry in candidates:
+            if entry.topology == topology:
+                return entry.table
+        return None
+
+    def invalidate(self, mesh=None):
+        """Drop the tables of a mesh, or of every mesh.
+
+        :param mesh: name of the mesh, every table is dropped when not specified.
+        :type mesh: str
+        """
+        if mesh is None:
+            keys = list(self._entries)
+        else:
+            node_id = backend.get_backend().get_node_id(dag_path.create_MDagPath(mesh))
+            keys = [key for key in self._entries if key[0] == node_id]
+        for key in keys:
+            self._remove(key)
+
+    def clear(self):
+        """Drop every table and remove the callbacks tracking the changes of
+        their meshes. This must be called before the registry is discarded, the
+        callbacks would otherwise outlive it."""
+        self.invalidate()
+
+    def _remove(self, key):
+        """Drop a table and stop tracking the changes of its mesh."""
+        entry = self._entries.pop(key)
+        try:
+            backend.get_backend().remove_change_callback(entry.callback_id)
+        except Exception as error:  # pragma: no cover
+            log.debug(
+                "Unable to remove the change callback of '%s' : %s",
+                entry.table,
+                error,
+            )
+
+    def _evict(self):
+        """Drop the least recently used tables until the registry fits in its
+        memory budget, always keeping the most recently used one."""
+        size = self.nbytes
+        while size > self.max_size and len(self._entries) > 1:
+            key, entry = next(iter(self._entries.items()))
+            size -= entry.table.nbytes
+            log.debug(
+                "Dropping geometry table of mesh '%s' from the registry.", entry.table
+            )
+            self._remove(key)
@@ -0,0 +1,135 @@
+import numpy as np
+
+from sym_mesh.domain import matching
+
+# Number of bins of the mirror error histogram.
+HISTOGRAM_BINS = 20
+
+# Number of vertices listed as the worst offenders.
+WORST_COUNT = 20
+
+
+class SymmetryReport(object):
+    def __init__(
+        self,
+        errors,
+        roles,
+        threshold,
+        several=None,
+        bins=HISTOGRAM_BINS,
+        worst_count=WORST_COUNT,
+    ):
+        """Quality report of the symmetry table of one axis and direction.
+
+        The report is created from arrays computed while building the table,
+        every statistic is a single pass over them.
+
+        :param errors: distance between the mirror position of every vertex and
+        the vertex it is mirrored with, see :func:`domain.matching.mirror_errors`.
+        :type errors: numpy.ndarray
+
+        :param roles: role of each vertex, see :func:`domain.matching.mirror_arrays`.
+        :type roles: numpy.ndarray
+
+        :param threshold: threshold used to build the table.
+        :type threshold: float
+
+        :param several: indices of the vertices that had several candidates
+        within the threshold, None if the engine does not report them.
+        :type several: numpy.ndarray
+
+        :param bins: number of bins of the mirror error histogram.
+        :type bins: int
+
+        :param worst_count: number of vertices listed as the worst offenders.
+        :type worst_count: int
+        """
+        self.errors = errors
+        self.threshold = threshold
+        self.several = None if several is None else np.asarray(several)
+
+        counts = np.bincount(roles, minlength=matching.ROLE_CENTER + 1)
+        self.vertex_count = len(roles)
+        self.unmatched_count = int(counts[matching.ROLE_UNMATCHED])
+        self.source_count = int(counts[matching.ROLE_SOURCE])
+        self.target_count = int(counts[matching.ROLE_TARGET])
+        self.center_count = int(counts[matching.ROLE_CENTER])
+
+        matched = errors[roles != matching.ROLE_UNMATCHED]
+        self.max_error = float(matched.max()) if len(matched) else 0.0
+        self.mean_error = float(matched.mean()) if len(matched) else 0.0
+
+        finite = errors[np.isfinite(errors)]
+        upper = max(finite.max() if len(finite) else 0.0, threshold)
+        self.histogram = np.histogram(finite, bins=bins, range=(0.0, upper or 1.0))
+
+        count = min(worst_count, len(errors))
+        worst = (
+            np.argpartition(-errors, count - 1)[:count]
+            if count
+            else np.zeros(0, dtype=np.int64)
+        )
+        self.worst_offenders = worst[np.lexsort((worst, -errors[worst]))]
+
+    def __str__(self):
+        return (
+            "Symmetry report : {} vertices, {} sources, {} targets, {} centers, "
+            "{} non-mirrored, {} with several candidates, max error {}".format(
+                self.vertex_count,
+                self.source_count,
+                self.target_count,
+                self.center_count,
+                self.unmatched_count,
+                "unknown" if self.several is None else len(self.several),
+                self.max_error,
+            )
+        )
+
+    @property
+    def is_symmetrical(self):
+        """Return whether every vertex of the mesh has a mirror.
+
+        :rtype: bool
+        """
+        return self.unmatched_count == 0
+
+    def flipped(self, roles):
+        """Get the report of the table of the opposite direction, when it only
+        swaps the sources and the targets of this table.
+
+        :param roles: roles of the table of the opposite direction.
+        :type roles: numpy.ndarray
+
+        :rtype: SymmetryReport
+        """
+        return SymmetryReport(
+            self.errors,
+            roles,
+            self.threshold,
+            self.several,
+            bins=len(self.histogram[0]),
+            worst_count=len(self.worst_offenders),
+        )
+
+    def as_dict(self):
+        """Get the report as a dict of python values, to export it as json.
+
+        :rtype: dict
+        """
+        counts, edges = self.histogram
+        return {
+            "vertices": self.vertex_count,
+            "sources": self.source_count,
+            "targets": self.target_count,
+            "centers": self.center_count,
+            "non_mirrored": self.unmatched_count,
+            "several_candidates": None if self.several is None else len(self.several),
+            "threshold": self.threshold,
+            "max_error": self.max_error,
+            "mean_error": self.mean_error,
+            "histogram": {"counts": counts.tolist(), "edges": edges.tolist()},
+            "worst_offenders": [
+                [int(index), float(self.errors[index])]
+                for index in self.worst_offenders
+            ],
+        }
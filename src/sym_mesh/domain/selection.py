@@ -1,38 +1,159 @@
 import logging
 
-from maya.api import OpenMaya as om2
+import numpy as np
+
+from sym_mesh.domain import backend
 
 log = logging.getLogger(__name__)
 
 
-def get_points_positions(obj_dag_path=None, space=None):
+# Data types in which the point positions can be read.
+POINT_DTYPES = (np.float32, np.float64)
+
+# Counter of the point copies, kept here for the callers of this module.
+copy_stats = backend.copy_stats
+
+
+def get_points_positions(obj_dag_path=None, space=None, dtype=np.float64):
     """
     Get the position of every point of the selected mesh.
 
+    The positions are read from the mesh backend, in place when it exposes them,
+    then copied once in the requested data type.
+
     :param obj_dag_path: dag path object of the geometry for which we want the points position
     :type obj_dag_path: maya.api.OpenMaya.MDagPath
 
     :param space: space in which the point position should be queried.
     :type space: int
 
-    :return: position of the points
-    :rtype: maya.api.OpenMaya.MPointArray
+    :param dtype: data type of the positions, float32 or float64.
+    :type dtype: type
+
+    :return: ``(n, 3)`` contiguous array of the point positions.
+    :rtype: numpy.ndarray
     """
-    mfn_object = om2.MFnMesh(obj_dag_path)
+    if dtype not in POINT_DTYPES:
+        raise ValueError("Unsupported point data type {}.".format(dtype))
 
-    points = mfn_object.getPoints(space=space)
+    points = backend.get_backend().get_points(obj_dag_path, space)
+    positions = np.array(points, dtype=dtype)
+    copy_stats.record(positions)
+    return positions
 
-    return points
+
+def set_points_positions(obj_dag_path, positions, space=None):
+    """
+    Set the position of every point of the selected mesh.
+
+    :param obj_dag_path: dag path object of the geometry for which we want to set the points position
+    :type obj_dag_path: maya.api.OpenMaya.MDagPath
+
+    :param positions: ``(n, 3)`` array of the point positions.
+    :type positions: numpy.ndarray
+
+    :param space: space in which the point position should be set.
+    :type space: int
+    """
+    backend.get_backend().set_points(obj_dag_path, positions, space)
+
+
+def as_positions(points, dtype=np.float64):
+    """
+    Get the positions of points as an ``(n, 3)`` contiguous array. Arrays that
+    already have this layout are returned as is, anything else is copied.
+
+    :param points: positions of the points.
+    :type points: numpy.ndarray or maya.api.OpenMaya.MPointArray
+
+    :param dtype: data type of the positions, float32 or float64.
+    :type dtype: type
+
+    :return: ``(n, 3)`` array of the point positions.
+    :rtype: numpy.ndarray
+    """
+    if (
+        isinstance(points, np.ndarray)
+        and points.dtype == dtype
+        and points.ndim == 2
+        and points.shape[1] == 3
+        and points.flags.c_contiguous
+    ):
+        return points
+
+    if isinstance(points, np.ndarray):
+        positions = np.ascontiguousarray(points[:, :3], dtype=dtype)
+    else:
+        # Point arrays hold homogeneous (x, y, z, w) points.
+        positions = np.array(points, dtype=dtype).reshape(-1, 4)[:, :3].copy()
+    copy_stats.record(positions)
+    return positions
+
+
+def get_topology(obj_dag_path=None):
+    """
+    Get the numbers describing the topology of the selected mesh.
+
+    :param obj_dag_path: dag path object of the geometry for which we want the topology
+    :type obj_dag_path: maya.api.OpenMaya.MDagPath
+
+    :return: number of vertices, edges, polygons and face vertices of the mesh
+    :rtype: tuple[int, int, int, int]
+    """
+    return backend.get_backend().get_topology(obj_dag_path)
+
+
+def _pack_mask(mask):
+    """Pack a boolean mask in 64 bits words, the bits past its end being 0.
+
+    :param mask: boolean mask.
+    :type mask: numpy.ndarray
+
+    :return: uint64 words, bit ``i % 64`` of word ``i // 64`` being mask ``i``.
+    :rtype: numpy.ndarray
+    """
+    packed = np.packbits(mask, bitorder="little")
+    words = np.zeros(-(-len(mask) // 64) * 8, dtype=np.uint8)
+    words[: len(packed)] = packed
+    return words.view(np.uint64)
+
+
+def _unpack_indices(words, vertex_count):
+    """Get the indices of the bits set in words packed with :func:`_pack_mask`.
+
+    :param words: uint64 words.
+    :type words: numpy.ndarray
+
+    :param vertex_count: number of bits to read.
+    :type vertex_count: int
+
+    :return: ascending int32 indices.
+    :rtype: numpy.ndarray
+    """
+    mask = np.unpackbits(words.view(np.uint8), count=vertex_count, bitorder="little")
+    return np.flatnonzero(mask).astype(np.int32)
 
 
 class VertexSelection(object):
-    def __init__(self, from_list=None):
-        """
+    def __init__(self, from_list=None, vertex_count=None):
+        """Selection of vertices of a mesh.
+
+        The indices are held as an ascending int32 array without duplicates,
+        the boolean mask and the bitset of the selection are built the first
+        time they are needed. Set operations between selections are done on
+        the bitsets, one 64 bits word for 64 vertices.
+
+        :param from_list: optional ``(dag_path, indices)`` of the selection, the
+        vertices selected in the scene are used when not specified.
+        :type from_list: tuple
 
-        :param from_list:
+        :param vertex_count: optional number of vertices of the mesh, needed to
+        invert the selection.
+        :type vertex_count: int
         """
-        self.dag_path = om2.MDagPath()
-        self.indices = om2.MIntArray()
+        self.dag_path = None
+        self.vertex_count = vertex_count
+        self.indices = np.zeros(0, dtype=np.int32)
 
         if from_list is not None:
             self.get_selection_from_list(from_list)
@@ -44,50 +165,199 @@ class VertexSelection(object):
             self.dag_path, self.indices
         )
 
+    def __len__(self):
+        return len(self._indices)
+
+    def __contains__(self, index):
+        position = np.searchsorted(self._indices, index)
+        return bool(position < len(self._indices) and self._indices[position] == index)
+
+    def __or__(self, other):
+        return self.union(other)
+
+    def __and__(self, other):
+        return self.intersection(other)
+
+    def __sub__(self, other):
+        return self.difference(other)
+
+    def __invert__(self):
+        return self.invert()
+
+    @property
+    def indices(self):
+        """Return the indices of the selected vertices.
+
+        :return: ascending int32 indices.
+        :rtype: numpy.ndarray
+        """
+        return self._indices
+
+    @indices.setter
+    def indices(self, value):
+        indices = np.unique(np.asarray(value, dtype=np.int32))
+        indices.flags.writeable = False
+        self._indices = indices
+        self._mask = None
+        self._words = None
+
     def get_live_selection(self):
         """
         Get the indices of the selected vertices.
 
         :return: DagPath of the current mesh, indices of the selected vertices
-        :rtype: maya.api.OpenMaya.MDagPathArray, maya.api.OpenMaya.MIntArray
+        :rtype: maya.api.OpenMaya.MDagPath, numpy.ndarray
         """
-        # Get current selection
-        selection_list = om2.MGlobal.getActiveSelectionList()
-        log.info("Selection list is : %s" % selection_list)
-
-        # Get the dag dir_path and components of the first item in the list
-        if selection_list.length() > 0:
-            obj_dag_path, components = selection_list.getComponent(0)
-        else:
-            log.warning("No selection found.")
-            self.dag_path = om2.MDagPath()
-            self.indices = om2.MIntArray()
-            return
-
-        # If no vertices selected
-        if components.isNull():
-            # Empty list of vertices
-            self.dag_path = om2.MDagPath()
-            self.indices = om2.MIntArray()
-            return
-        # If vertices are selected
-        else:
-            path = selection_list.getDagPath(0)
-            # Query vertex indices
-            fn_components = om2.MFnSingleIndexedComponent(components)
-            # Create an MIntArray with the vertex indices
-            selected_vertices_indices = fn_components.getElements()
-
-        self.dag_path = path
-        self.indices = selected_vertices_indices
+        self.dag_path, self.indices = backend.get_backend().get_selected_vertices()
 
     def get_selection_from_list(self, from_list=()):
         if not from_list:
-            self.dag_path = om2.MDagPath()
-            self.indices = om2.MIntArray()
+            self.dag_path = None
+            self.indices = np.zeros(0, dtype=np.int32)
         else:
             self.dag_path = from_list[0]
-            self.indices = om2.MIntArray(from_list[1])
+            self.indices = from_list[1]
+
+    def get_mask(self, vertex_count):
+        """
+        Get a boolean mask of the selected vertices, built once per vertex
+        count. The mask is read-only.
+
+        :param vertex_count: number of vertices of the mesh.
+        :type vertex_count: int
+
+        :return: mask that is True for the selected vertices.
+        :rtype: numpy.ndarray
+        """
+        if self._mask is None or len(self._mask) != vertex_count:
+            mask = np.zeros(vertex_count, dtype=bool)
+            indices = self._indices
+            mask[indices[(indices >= 0) & (indices < vertex_count)]] = True
+            mask.flags.writeable = False
+            self._mask = mask
+        return self._mask
+
+    def _get_size(self, other=None):
+        """Get the number of vertices covered by the bitsets of an operation.
+
+        :param other: optional other selection of the operation.
+        :type other: VertexSelection
+
+        :rtype: int
+        """
+        sizes = [self.vertex_count or 0, int(self._indices[-1]) + 1 if len(self) else 0]
+        if other is not None:
+            sizes += [
+                other.vertex_count or 0,
+                int(other.indices[-1]) + 1 if len(other) else 0,
+            ]
+        return max(sizes)
+
+    def _get_words(self, size):
+        """Get the bitset of the selection, built once per size.
+
+        :param size: number of vertices covered by the bitset.
+        :type size: int
+
+        :rtype: numpy.ndarray
+        """
+        if self._words is None or self._words[0] != size:
+            self._words = (size, _pack_mask(self.get_mask(size)))
+        return self._words[1]
+
+    def _combine(self, other, operation):
+        """Combine the bitsets of two selections of the same mesh.
+
+        :param other: other selection.
+        :type other: VertexSelection
+
+        :param operation: numpy function combining the words.
+        :type operation: callable
+
+        :rtype: VertexSelection
+        """
+        path = self.dag_path if self.dag_path is not None else other.dag_path
+        if (
+            self.dag_path is not None
+            and other.dag_path is not None
+            and len(self)
+            and len(other)
+            and backend.get_backend().get_name(self.dag_path)
+            != backend.get_backend().get_name(other.dag_path)
+        ):
+            raise ValueError(
+                "Cannot combine the vertex selections of different meshes."
+            )
+        size = self._get_size(other)
+        words = operation(self._get_words(size), other._get_words(size))
+        return VertexSelection(
+            (path, _unpack_indices(words, size)),
+            vertex_count=self.vertex_count or other.vertex_count,
+        )
+
+    def union(self, other):
+        """Get the vertices selected in this selection or in another one.
+
+        :type other: VertexSelection
+
+        :rtype: VertexSelection
+        """
+        return self._combine(other, np.bitwise_or)
+
+    def intersection(self, other):
+        """Get the vertices selected in both this selection and another one.
+
+        :type other: VertexSelection
+
+        :rtype: VertexSelection
+        """
+        return self._combine(other, np.bitwise_and)
+
+    def difference(self, other):
+        """Get the vertices selected in this selection but not in another one.
+
+        :type other: VertexSelection
+
+        :rtype: VertexSelection
+        """
+        return self._combine(other, lambda words, others: words & ~others)
+
+    def invert(self, vertex_count=None):
+        """Get the vertices of the mesh that are not selected.
+
+        :param vertex_count: number of vertices of the mesh, the vertex count
+        of the selection when not specified.
+        :type vertex_count: int
+
+        :rtype: VertexSelection
+        """
+        vertex_count = vertex_count or self.vertex_count
+        if vertex_count is None:
+            raise ValueError(
+                "The number of vertices of the mesh is needed to invert a selection."
+            )
+        words = ~self._get_words(vertex_count)
+        return VertexSelection(
+            (self.dag_path, _unpack_indices(words, vertex_count)),
+            vertex_count=vertex_count,
+        )
+
+    def mirrored(self, geometry_table):
+        """Get the mirror vertices of the selected vertices, through the
+        symmetry table of a geometry table. Centers are their own mirror and the
+        non-mirrored vertices are left out.
+
+        :param geometry_table: geometry table of the mesh.
+        :type geometry_table: domain.table.GeometryTable
+
+        :rtype: VertexSelection
+        """
+        mirror_index = geometry_table.mirror_index
+        indices = self._indices[self._indices < len(mirror_index)]
+        mirrors = mirror_index[indices]
+        return VertexSelection(
+            (self.dag_path, mirrors[mirrors >= 0]), vertex_count=len(mirror_index)
+        )
 
     def select(self, msg=None):
         if len(self.indices) == 0:
@@ -96,10 +366,4 @@ class VertexSelection(object):
             else:
                 log.warning("No vertex selection stored")
         else:
-            vtcs_to_select = om2.MSelectionList()
-            MItVtx = om2.MItMeshVertex(self.dag_path)
-            while not MItVtx.isDone():
-                if MItVtx.index() in self.indices:
-                    vtcs_to_select.add((self.dag_path, MItVtx.currentItem()))
-                MItVtx.next()
-            om2.MGlobal.setActiveSelectionList(vtcs_to_select)
+            backend.get_backend().select_vertices(self.dag_path, self.indices)
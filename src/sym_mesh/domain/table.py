@@ -1,22 +1,74 @@
+import collections
+import functools
 import logging
 import math
-from maya.api import OpenMaya as om2
 
+import numpy as np
+
+from sym_mesh.domain import backend
 from sym_mesh.domain import dag_path
+from sym_mesh.domain import matching
+from sym_mesh.domain import report
 from sym_mesh.domain import selection
+from sym_mesh.domain import table_cache
 
 log = logging.getLogger(__name__)
 log.setLevel(logging.DEBUG)
 
 
+AxisTable = collections.namedtuple(
+    "AxisTable",
+    ["mirror_index", "roles", "non_mirrored", "ambiguous", "swappable", "report"],
+)
+AxisTable.__doc__ = """Symmetry table of one axis and direction.
+
+``swappable`` is True when every vertex had at most one candidate within the
+threshold, the table of the opposite direction then only swaps the sources and
+the targets. ``report`` is the :class:`domain.report.SymmetryReport` of the table.
+"""
+
+
+def _report_axis_progress(progress, index, count, done, total):
+    """Report the progress of the build of one axis out of several, as the
+    fraction of the whole build done.
+
+    :param progress: function receiving the fraction of the build done.
+    :type progress: callable
+
+    :param index: index of the axis being built.
+    :type index: int
+
+    :param count: number of axes built.
+    :type count: int
+
+    :param done: number of vertices processed for this axis.
+    :type done: int
+
+    :param total: number of vertices of the mesh.
+    :type total: int
+    """
+    progress((index + float(done) / max(total, 1)) / count)
+
+
 class GeometryTable:
+    ENGINES = ("vectorized", "nearest", "spatial_hash")
+    AXES = ("x", "y", "z")
+    DIRECTIONS = ("positive", "negative")
+
     def __init__(
         self,
         mesh_dag_path,
         axis="x",
         threshold=0.001,
         direction="positive",
-        space=om2.MSpace.kObject,
+        space=backend.OBJECT_SPACE,
+        engine="vectorized",
+        cache=None,
+        lazy=False,
+        axes=None,
+        max_radius=None,
+        workers=1,
+        mirror_table=None,
     ):
         """Initialize the symmetry table using the specified mesh.
 
@@ -36,32 +88,208 @@ class GeometryTable:
         :param space: space in which the point position should be queried.
         :type space: int
 
+        :param engine: engine to use to match the symmetrical vertices. Accepted
+        engines are "vectorized", "nearest" and "spatial_hash". "vectorized" and
+        "spatial_hash" produce the same table, the latter being the pure python
+        reference implementation. "nearest" always pairs a vertex with the
+        closest candidate and reports the ambiguous matches.
+        :type engine: str
+
+        :param cache: optional cache from which the symmetry table is loaded if
+        it was already built for the same mesh and settings, and in which it is
+        saved otherwise.
+        :type cache: domain.table_cache.TableCache
+
+        :param lazy: if True, only the point positions are queried on
+        initialization and the symmetry table is built the first time it is
+        needed. Use this for tables of which only the point array is read.
+        :type lazy: bool
+
+        :param axes: names of the axes for which the symmetry table is built,
+        the axis of the table is always included. The tables of all these axes
+        are built together, from the same grid, and switching the axis of the
+        table between them does not rebuild anything.
+        :type axes: tuple[str]
+
+        :param max_radius: radius within which the "nearest" engine searches the
+        mirror candidates, the threshold when it is larger. The candidates are
+        kept so that setting any threshold up to this radius only filters them
+        instead of rebuilding the table.
+        :type max_radius: float
+
+        :param workers: number of threads matching the vertices of the
+        "vectorized" and "nearest" engines in parallel, see
+        :func:`domain.matching.default_workers`. The table does not depend on it.
+        :type workers: int
+
+        :param mirror_table: optional geometry table of a mesh with the same
+        topology, built with the same threshold and space. Its symmetry tables
+        are shared instead of being built from the positions of this mesh, only
+        the axes it lacks are built.
+        :type mirror_table: domain.table.GeometryTable
+
         """
-        self._axis = axis
+        if engine not in self.ENGINES:
+            raise ValueError(
+                "Unknown symmetry engine '{}', accepted engines are {}.".format(
+                    engine, ", ".join(self.ENGINES)
+                )
+            )
+        self._engine = engine
         self._axis_idcs = {"x": 0, "y": 1, "z": 2}
+        self._check_axis(axis)
+        for name in axes or ():
+            self._check_axis(name)
+        self._axis = axis
+        self._axes = tuple(axes or ())
+        if axis not in self._axes:
+            self._axes = (axis,) + self._axes
+        self._check_direction(direction)
         self._direction = direction
-        self.threshold = threshold
+        self._threshold = threshold
+        self._max_radius = max_radius
+        self._workers = workers
         self._space = space
+        self._cache = cache
+        self._lazy = lazy
 
         self._dag_path = mesh_dag_path
-        self._points_table = selection.get_points_positions(self.dag_path, space=space)
-
+        self._path = dag_path.create_MDagPath(mesh_dag_path)
+        self._points_table = selection.get_points_positions(self._path, space=space)
+        self._mesh_fingerprint = None
+
+        self._axis_tables = {}
+        self._grid = None
+        self._progress = None
+        self._candidates = {}
+        self._candidate_points = None
+        self._search_radius = 0.0
+        self._mirror_index = None
+        self._roles = None
         self._symmetry_table = None
         self._non_mirrored_vertices = selection.VertexSelection(from_list=())
+        self._ambiguous_vertices = selection.VertexSelection(from_list=())
+        self._report = None
 
-        self.build_symmetry_table()
+        if mirror_table is not None:
+            self._share_axis_tables(mirror_table)
+        if not lazy:
+            self.build()
 
     def __str__(self):
         return self._dag_path
 
+    @property
+    def engine(self):
+        return self._engine
+
     @property
     def space(self):
         return self._space
 
+    @property
+    def threshold(self):
+        return self._threshold
+
+    @threshold.setter
+    def threshold(self, value):
+        """Set the threshold used to identify symmetrical vertices.
+
+        With the "nearest" engine, a threshold within the search radius only
+        filters the mirror candidates found when the table was built, which is
+        linear in the number of vertices, see :meth:`can_filter`. Otherwise the
+        table is rebuilt, on first use for lazy tables.
+
+        :param value: new threshold.
+        :type value: float
+        """
+        self._threshold = value
+        if not self._axis_tables or self._filter_candidates():
+            return
+        self._axis_tables = {}
+        self._candidates = {}
+        self._activate_axis()
+        if not self._lazy:
+            self.build_symmetry_table()
+
+    def can_filter(self, threshold):
+        """Return whether setting a threshold only filters the stored mirror
+        candidates, see :attr:`threshold`, rather than rebuilding the symmetry
+        tables. A table without symmetry tables yet has nothing to rebuild.
+
+        :param threshold: new threshold.
+        :type threshold: float
+
+        :rtype: bool
+        """
+        if not self._axis_tables:
+            return True
+        if threshold > self._search_radius:
+            return False
+        return all(
+            self._axis_idcs[axis] in self._candidates
+            for axis, direction in self._axis_tables
+            if direction == self._direction
+        )
+
+    @property
+    def is_built(self):
+        """Return whether the symmetry table has been built already.
+
+        :rtype: bool
+        """
+        return self._mirror_index is not None
+
     @property
     def symmetry_table(self):
+        """Return the symmetry table as a dict ``{target_index: source_index}``.
+
+        The dict is created from :attr:`mirror_index` the first time it is
+        requested, prefer the arrays for anything that scales with the mesh.
+
+        :return: symmetry table.
+        :rtype: dict[int, int]
+        """
+        if self._symmetry_table is None:
+            targets, sources = self.symmetry_pairs
+            self._symmetry_table = dict(zip(targets.tolist(), sources.tolist()))
         return self._symmetry_table
 
+    @property
+    def mirror_index(self):
+        """Return the index of the mirrored vertex of each vertex, or -1 for the
+        vertices without a mirror. Targets are mapped to their source, sources
+        to their target and centers to themselves.
+
+        :return: int32 mirror index of each vertex.
+        :rtype: numpy.ndarray
+        """
+        self._ensure_built()
+        return self._mirror_index
+
+    @property
+    def roles(self):
+        """Return the role of each vertex in the symmetry table, one of
+        ``matching.ROLE_UNMATCHED``, ``ROLE_SOURCE``, ``ROLE_TARGET`` and
+        ``ROLE_CENTER``.
+
+        :return: int8 role of each vertex.
+        :rtype: numpy.ndarray
+        """
+        self._ensure_built()
+        return self._roles
+
+    @property
+    def symmetry_pairs(self):
+        """Return the target vertices, centers included, and their source
+        vertices as index arrays, ready to be used as fancy indices.
+
+        :return: ascending target indices and their source indices.
+        :rtype: numpy.ndarray, numpy.ndarray
+        """
+        self._ensure_built()
+        return matching.mirror_pairs(self._mirror_index, self._roles)
+
     @property
     def non_mirrored_vertices(self):
         """Return a vertex selection object containing all the non-mirrored vertices.
@@ -69,8 +297,34 @@ class GeometryTable:
         :return: Vertex selection object containing all the non-mirrored vertices.
         :rtype: domain.selection.VertexSelection
         """
+        self._ensure_built()
         return self._non_mirrored_vertices
 
+    @property
+    def ambiguous_vertices(self):
+        """Return a vertex selection object containing all the vertices that had
+        several candidates within the threshold of their mirror position.
+
+        Only the "nearest" engine detects ambiguous matches, this selection is
+        always empty with the other engines.
+
+        :return: Vertex selection object containing all the ambiguous vertices.
+        :rtype: domain.selection.VertexSelection
+        """
+        self._ensure_built()
+        return self._ambiguous_vertices
+
+    @property
+    def report(self):
+        """Return the quality report of the symmetry table: mirror error of
+        every vertex, its histogram, the worst offenders and the number of
+        sources, targets, centers and non-mirrored vertices.
+
+        :rtype: domain.report.SymmetryReport
+        """
+        self._ensure_built()
+        return self._report
+
     @property
     def axis(self):
         """Return the symmetrization axis as an int.
@@ -84,34 +338,265 @@ class GeometryTable:
         """
         return self._axis_idcs[self._axis]
 
+    @axis.setter
+    def axis(self, value):
+        """Set the symmetrization axis.
+
+        Switching to an axis whose table was built already, see the ``axes``
+        parameter, only swaps the active mirror arrays. Otherwise the table of
+        the new axis is built, on first use for lazy tables.
+
+        :param value: name of the axis, "x", "y" or "z".
+        :type value: str
+        """
+        self._check_axis(value)
+        self._axis = value
+        if value not in self._axes:
+            self._axes += (value,)
+        self._activate_axis()
+        if not self._lazy and not self.is_built:
+            self.build_symmetry_table(axes=(value,))
+
+    @property
+    def direction(self):
+        return self._direction
+
+    @direction.setter
+    def direction(self, value):
+        """Set the direction of the symmetry table.
+
+        Both directions share the same pairs when no vertex had several
+        candidates within the threshold, the table of the new direction is then
+        derived by swapping the sources and the targets. Otherwise the pairs are
+        matched again, from the stored candidates with the "nearest" engine.
+        The tables of both directions are kept, so toggling back is free.
+
+        :param value: new direction, "positive" or "negative".
+        :type value: str
+        """
+        self._check_direction(value)
+        if value == self._direction:
+            return
+        previous = self._direction
+        self._direction = value
+
+        missing = []
+        for axis, direction in list(self._axis_tables):
+            if direction != previous or (axis, value) in self._axis_tables:
+                continue
+            axis_table = self._flip_axis_table(axis, self._axis_tables[axis, previous])
+            if axis_table is None:
+                missing.append(axis)
+            else:
+                self._axis_tables[axis, value] = axis_table
+        self._activate_axis()
+        if missing and not self._lazy:
+            self.build_symmetry_table(axes=tuple(missing))
+
+    @property
+    def axes(self):
+        """Return the names of the axes for which the symmetry table is built.
+
+        :rtype: tuple[str]
+        """
+        return self._axes
+
     @property
     def dag_path(self):
-        return dag_path.create_MDagPath(self._dag_path)
+        return self._path
 
     @property
     def point_array(self):
+        """Return the positions of all the mesh vertices.
+
+        :return: ``(n, 3)`` float64 array of the vertex positions.
+        :rtype: numpy.ndarray
+        """
         return self._points_table
 
+    @property
+    def nbytes(self):
+        """Return the memory held by the arrays of the table, see :meth:`get_arrays`.
+
+        :rtype: int
+        """
+        return sum(array.nbytes for array in self.get_arrays())
+
+    def get_arrays(self):
+        """Get the arrays held by the table: the point positions, the symmetry
+        tables of every axis and direction and the mirror candidates. Arrays
+        shared by several of them, or with another table, are only listed once.
+
+        :rtype: list[numpy.ndarray]
+        """
+        arrays = [self._points_table]
+        for axis_table in self._axis_tables.values():
+            arrays += [
+                axis_table.mirror_index,
+                axis_table.roles,
+                axis_table.non_mirrored.indices,
+                axis_table.ambiguous.indices,
+                axis_table.report.errors,
+            ]
+        for candidates in self._candidates.values():
+            arrays += candidates
+        return list({id(array): array for array in arrays}.values())
+
     @property
     def positive(self):
         if self._direction == "positive":
             return True
         return False
 
-    def build_symmetry_table(self, base_mesh=""):
+    def _check_axis(self, axis):
+        if axis not in self._axis_idcs:
+            raise ValueError(
+                "Unknown axis '{}', accepted axes are {}.".format(
+                    axis, ", ".join(self._axis_idcs)
+                )
+            )
+
+    def _check_direction(self, direction):
+        if direction not in self.DIRECTIONS:
+            raise ValueError(
+                "Unknown direction '{}', accepted directions are {}.".format(
+                    direction, ", ".join(self.DIRECTIONS)
+                )
+            )
+
+    def _share_axis_tables(self, mirror_table):
+        """Share the symmetry tables and mirror candidates of the table of
+        another mesh with the same topology.
+
+        :param mirror_table: geometry table to share the symmetry tables of.
+        :type mirror_table: domain.table.GeometryTable
+        """
+        if len(mirror_table.point_array) != len(self._points_table):
+            raise ValueError(
+                "Mesh '{}' has {} vertices, mesh '{}' has {}.".format(
+                    self._dag_path,
+                    len(self._points_table),
+                    mirror_table,
+                    len(mirror_table.point_array),
+                )
+            )
+        if (mirror_table.threshold, mirror_table.space) != (self.threshold, self.space):
+            raise ValueError(
+                "The symmetry table of mesh '{}' was built with another "
+                "threshold or space.".format(mirror_table)
+            )
+        log.info(
+            "Sharing the symmetry table of mesh '%s' with mesh '%s'.",
+            mirror_table,
+            self._dag_path,
+        )
+        # Only the vertex selections refer to the mesh.
+        for key, axis_table in mirror_table._axis_tables.items():
+            self._axis_tables[key] = axis_table._replace(
+                non_mirrored=selection.VertexSelection(
+                    (self.dag_path, axis_table.non_mirrored.indices),
+                    vertex_count=len(self._points_table),
+                ),
+                ambiguous=selection.VertexSelection(
+                    (self.dag_path, axis_table.ambiguous.indices),
+                    vertex_count=len(self._points_table),
+                ),
+            )
+        self._axes = tuple(dict.fromkeys(self._axes + mirror_table.axes))
+        self._candidates = dict(mirror_table._candidates)
+        self._candidate_points = mirror_table._candidate_points
+        self._search_radius = mirror_table._search_radius
+        self._activate_axis()
+
+    def prefetch(self):
+        """Read from the mesh everything the build of the symmetry table needs
+        besides the point positions, read on initialization. :meth:`build` then
+        does not access the mesh and can run in a worker thread, while this
+        table is not used by any other thread."""
+        if self._cache is not None:
+            self._get_mesh_fingerprint()
+
+    def build(self, progress=None):
+        """Build the symmetry tables of the axes of the table that are not built
+        yet, see :meth:`build_symmetry_table`. A lazy table is not lazy anymore
+        once built, the tables of the axes and directions set afterwards are
+        built right away.
+
+        :param progress: optional function called with the fraction of the
+        build done, between 0 and 1, after each chunk of vertices. An exception
+        raised by it stops the build, the table must then be discarded.
+        :type progress: callable
+        """
+        missing = tuple(
+            name
+            for name in self._axes
+            if (name, self._direction) not in self._axis_tables
+        )
+        if missing:
+            self.build_symmetry_table(axes=missing, progress=progress)
+        self._lazy = False
+
+    def _get_mesh_fingerprint(self):
+        """Get the fingerprint of the mesh of the table, computed the first time
+        it is requested, see :func:`domain.table_cache.fingerprint`.
+
+        :rtype: str
+        """
+        if self._mesh_fingerprint is None:
+            self._mesh_fingerprint = table_cache.fingerprint(
+                self._points_table, selection.get_topology(self._path)
+            )
+        return self._mesh_fingerprint
+
+    def _ensure_built(self):
+        """Build the symmetry table of a lazy table the first time it is needed."""
+        if self._mirror_index is None:
+            self.build_symmetry_table(axes=(self._axis,) if self._axis_tables else None)
+
+    def _activate_axis(self):
+        """Make the table of the current axis the active symmetry table."""
+        axis_table = self._axis_tables.get((self._axis, self._direction))
+        if axis_table is None:
+            self._mirror_index = None
+            self._roles = None
+            self._non_mirrored_vertices = selection.VertexSelection(from_list=())
+            self._ambiguous_vertices = selection.VertexSelection(from_list=())
+            self._report = None
+        else:
+            self._mirror_index = axis_table.mirror_index
+            self._roles = axis_table.roles
+            self._non_mirrored_vertices = axis_table.non_mirrored
+            self._ambiguous_vertices = axis_table.ambiguous
+            self._report = axis_table.report
+        self._symmetry_table = None
+
+    def build_symmetry_table(self, base_mesh="", axes=None, progress=None):
         """Create symmetry table base on symmetry self._axis and self._threshold
 
+        The positions are quantized in a single grid shared by the tables of
+        all the axes, only the mirror lookups are done once per axis.
+
         :param base_mesh: optional. Name of the mesh to use to build the symmetry table.
         :type base_mesh: str
 
-        :return: symmetry table
-        :rtype: dict
+        :param axes: optional. Names of the axes to build, the tables of the
+        other axes are kept. All the axes of the table are rebuilt when not
+        specified.
+        :type axes: tuple[str]
+
+        :param progress: optional function called with the fraction of the
+        build done, between 0 and 1, see :meth:`build`.
+        :type progress: callable
 
         """
+        if axes is None:
+            axes = self._axes
+            self._axis_tables = {}
+            self._candidates = {}
         log.info(
-            "Building symmetry table for mesh '%s' (axis=%s, direction=%s, threshold=%s).",
+            "Building symmetry table for mesh '%s' (axes=%s, direction=%s, threshold=%s).",
             base_mesh or self._dag_path,
-            self._axis,
+            ", ".join(axes),
             self._direction,
             self.threshold,
         )
@@ -124,11 +609,168 @@ class GeometryTable:
             else self._points_table
         )
 
-        symmetry_map = self._build_symmetry_map(points_table)
-        non_mirrored_table = self._get_non_mirrored_vertices(points_table, symmetry_map)
-
         path = base_mesh if base_mesh else self.dag_path
-        if non_mirrored_table:
+        mesh_fingerprint = None
+        if self._cache is not None:
+            mesh_fingerprint = (
+                table_cache.fingerprint(
+                    points_table,
+                    selection.get_topology(dag_path.create_MDagPath(path)),
+                )
+                if base_mesh
+                else self._get_mesh_fingerprint()
+            )
+
+        try:
+            for index, axis in enumerate(axes):
+                if progress is not None:
+                    self._progress = functools.partial(
+                        _report_axis_progress, progress, index, len(axes)
+                    )
+                self._axis_tables[axis, self._direction] = self._build_axis_table(
+                    points_table, axis, path, mesh_fingerprint
+                )
+                if progress is not None:
+                    progress(float(index + 1) / len(axes))
+        finally:
+            self._grid = None
+            self._progress = None
+        self._activate_axis()
+
+    def _build_axis_table(self, points_table, axis, path, mesh_fingerprint=None):
+        """Build the symmetry table of one axis, or load it from the cache.
+
+        :param points_table: ``(n, 3)`` positions of all mesh vertices.
+        :type points_table: numpy.ndarray
+
+        :param axis: name of the axis.
+        :type axis: str
+
+        :param path: path of the mesh, used in the messages.
+        :type path: str
+
+        :param mesh_fingerprint: fingerprint of the mesh, only needed to use the cache.
+        :type mesh_fingerprint: str
+
+        :return: symmetry table of the axis.
+        :rtype: AxisTable
+        """
+        axis_index = self._axis_idcs[axis]
+        radius = self._get_search_radius() if self._engine == "nearest" else 0.0
+        cache_key = None
+        cached = None
+        if mesh_fingerprint is not None:
+            cache_key = self._cache.key(
+                mesh_fingerprint,
+                axis,
+                self._direction,
+                self.threshold,
+                self.space,
+                self._engine,
+                radius,
+            )
+            cached = self._cache.load(cache_key)
+
+        if cached is not None:
+            log.info(
+                "Loaded %s symmetry table for mesh '%s' from the cache.", axis, path
+            )
+            targets, sources, ambiguous = (
+                cached.targets,
+                cached.sources,
+                cached.ambiguous,
+            )
+            several = cached.several
+            if cached.candidates is not None:
+                nearest, distance, second_distance = cached.candidates
+                self._set_candidates(
+                    axis_index,
+                    matching.MirrorCandidates(
+                        nearest.astype(np.int64), distance, second_distance
+                    ),
+                    points_table,
+                    radius,
+                )
+        else:
+            targets, sources, ambiguous, several = self._build_symmetry_pairs(
+                points_table, axis_index
+            )
+
+        axis_table = self._create_axis_table(
+            points_table, axis, targets, sources, ambiguous, path, several
+        )
+        if cache_key is not None and cached is None:
+            self._cache.save(
+                cache_key,
+                targets,
+                sources,
+                axis_table.non_mirrored.indices,
+                ambiguous,
+                several,
+                self._candidates.get(axis_index),
+            )
+        return axis_table
+
+    def _create_axis_table(
+        self, points_table, axis, targets, sources, ambiguous, path, several=None
+    ):
+        """Create the symmetry table of one axis from its matched pairs, and
+        its quality report.
+
+        :param points_table: ``(n, 3)`` positions of all mesh vertices.
+        :type points_table: numpy.ndarray
+
+        :param axis: name of the axis.
+        :type axis: str
+
+        :param targets: target indices.
+        :type targets: numpy.ndarray
+
+        :param sources: source index of each target.
+        :type sources: numpy.ndarray
+
+        :param ambiguous: indices of the ambiguous vertices.
+        :type ambiguous: numpy.ndarray
+
+        :param path: path of the mesh, used in the messages.
+        :type path: str
+
+        :param several: indices of the vertices that had several candidates
+        within the threshold, None if the engine does not report them.
+        :type several: numpy.ndarray
+
+        :return: symmetry table of the axis.
+        :rtype: AxisTable
+        """
+        axis_index = self._axis_idcs[axis]
+        mirror_index, roles = matching.mirror_arrays(
+            targets, sources, len(points_table)
+        )
+        non_mirrored = np.flatnonzero(roles == matching.ROLE_UNMATCHED)
+
+        # The nearest engine knows how far the non-mirrored vertices are from
+        # their closest candidate.
+        candidates = self._candidates.get(axis_index)
+        errors = matching.mirror_errors(
+            points_table,
+            axis_index,
+            mirror_index,
+            (
+                candidates.distance
+                if candidates is not None and points_table is self._candidate_points
+                else None
+            ),
+        )
+
+        # Only the active axis is expected to be symmetrical.
+        if axis != self._axis:
+            log.debug(
+                "Model %s has %d non-mirrored vertices on %s.",
+                path,
+                len(non_mirrored),
+                axis,
+            )
+        elif len(non_mirrored):
             log.warning(
                 "Model %s is NOT symmetrical, mirroring might not work as expected.",
                 path,
@@ -136,12 +778,255 @@ class GeometryTable:
         else:
             log.info("Model %s is symmetrical.", path)
 
-        self._symmetry_table = symmetry_map
-        self._non_mirrored_vertices = selection.VertexSelection(
-            (self.dag_path, non_mirrored_table)
+        return AxisTable(
+            mirror_index,
+            roles,
+            selection.VertexSelection(
+                (self.dag_path, non_mirrored), vertex_count=len(points_table)
+            ),
+            selection.VertexSelection(
+                (self.dag_path, ambiguous), vertex_count=len(points_table)
+            ),
+            several is not None and not len(several),
+            report.SymmetryReport(errors, roles, self.threshold, several),
         )
 
-    def _build_symmetry_map(self, points_table):
+    def _flip_axis_table(self, axis, axis_table):
+        """Get the symmetry table of an axis for the current direction from its
+        table for the opposite direction, without searching the candidates.
+
+        :param axis: name of the axis.
+        :type axis: str
+
+        :param axis_table: symmetry table of the axis for the opposite direction.
+        :type axis_table: AxisTable
+
+        :return: symmetry table of the axis, or None if it must be built.
+        :rtype: AxisTable
+        """
+        if axis_table.swappable:
+            roles = matching.flip_roles(axis_table.roles)
+            return axis_table._replace(
+                roles=roles, report=axis_table.report.flipped(roles)
+            )
+
+        axis_index = self._axis_idcs[axis]
+        if axis_index not in self._candidates:
+            return None
+        targets, sources, ambiguous = self._match_candidates(axis_index)
+        return self._create_axis_table(
+            self._candidate_points,
+            axis,
+            targets,
+            sources,
+            ambiguous,
+            self._dag_path,
+            ambiguous,
+        )
+
+    def _build_symmetry_pairs(self, points_table, axis):
+        """Match the symmetrical vertices using the engine of this table.
+
+        :param points_table: ``(n, 3)`` positions of all mesh vertices.
+        :type points_table: numpy.ndarray
+
+        :param axis: index of the symmetry axis (0 = X, 1 = Y, 2 = Z).
+        :type axis: int
+
+        :return: target indices, their matching source indices, the indices of
+        the ambiguous vertices and the indices of the vertices that had several
+        candidates within the threshold, None if the engine does not report them.
+        :rtype: numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.ndarray
+        """
+        try:
+            if self._engine == "vectorized":
+                targets, sources, several = self._build_vectorized_pairs(
+                    points_table, axis
+                )
+                return (
+                    targets,
+                    sources,
+                    np.empty(0, dtype=np.int64),
+                    np.flatnonzero(several),
+                )
+            if self._engine == "nearest":
+                targets, sources, ambiguous = self._build_nearest_pairs(
+                    points_table, axis
+                )
+                return targets, sources, ambiguous, ambiguous
+        except OverflowError as error:
+            log.warning("%s Falling back to the spatial hash engine.", error)
+        symmetry_map = self._build_spatial_hash_map(points_table, axis)
+        return (
+            np.fromiter(symmetry_map.keys(), dtype=np.int64, count=len(symmetry_map)),
+            np.fromiter(symmetry_map.values(), dtype=np.int64, count=len(symmetry_map)),
+            np.empty(0, dtype=np.int64),
+            None,
+        )
+
+    def _build_vectorized_pairs(self, points_table, axis):
+        """Match the symmetrical vertices with
+        :func:`domain.matching.match_spatial_hash`.
+
+        This produces exactly the same pairs as :meth:`_build_spatial_hash_map`,
+        but quantizes, groups and matches all the positions with array
+        operations instead of visiting every vertex in python. The grid is
+        shared by all the axes built together.
+
+        :param points_table: ``(n, 3)`` positions of all mesh vertices.
+        :type points_table: numpy.ndarray
+
+        :param axis: index of the symmetry axis (0 = X, 1 = Y, 2 = Z).
+        :type axis: int
+
+        :return: target indices, their matching source indices and a mask of
+        the vertices that had several candidates within the threshold.
+        :rtype: numpy.ndarray, numpy.ndarray, numpy.ndarray
+        """
+        log.debug("Building vectorized symmetry map for %d points.", len(points_table))
+        if self._grid is None:
+            self._grid = matching.SpatialGrid(
+                points_table, self.threshold if self.threshold > 0 else 1.0
+            )
+        return matching.match_spatial_hash(
+            points_table,
+            axis,
+            self.threshold,
+            self.positive,
+            grid=self._grid,
+            return_ambiguous=True,
+            workers=self._workers,
+            progress=self._progress,
+        )
+
+    def _build_nearest_pairs(self, points_table, axis):
+        """Match the symmetrical vertices with :func:`domain.matching.match_nearest`.
+
+        Every vertex is paired with the vertex closest to its mirror position,
+        instead of the last one visited within the threshold. Vertices that had
+        several candidates within the threshold are returned as ambiguous.
+
+        :param points_table: ``(n, 3)`` positions of all mesh vertices.
+        :type points_table: numpy.ndarray
+
+        :param axis: index of the symmetry axis (0 = X, 1 = Y, 2 = Z).
+        :type axis: int
+
+        :return: target indices, their matching source indices and the indices
+        of the ambiguous vertices.
+        :rtype: numpy.ndarray, numpy.ndarray, numpy.ndarray
+        """
+        log.debug("Building nearest symmetry map for %d points.", len(points_table))
+        radius = self._get_search_radius()
+        if self._grid is None:
+            self._grid = matching.density_grid(points_table, radius)
+        candidates = matching.find_nearest_mirrors(
+            points_table,
+            axis,
+            radius,
+            grid=self._grid,
+            workers=self._workers,
+            progress=self._progress,
+        )
+        self._set_candidates(axis, candidates, points_table, radius)
+        return self._match_candidates(axis)
+
+    def _get_search_radius(self):
+        """Get the radius within which the "nearest" engine searches the mirror
+        candidates.
+
+        :rtype: float
+        """
+        return max(self.threshold, self._max_radius or 0.0)
+
+    def _set_candidates(self, axis, candidates, points_table, radius):
+        """Store the mirror candidates of an axis, searched or loaded from the
+        cache, so that the threshold and direction can be changed by matching
+        them again, see :meth:`can_filter`.
+
+        :param axis: index of the symmetry axis (0 = X, 1 = Y, 2 = Z).
+        :type axis: int
+
+        :param candidates: mirror candidates of the vertices.
+        :type candidates: domain.matching.MirrorCandidates
+
+        :param points_table: ``(n, 3)`` positions the candidates were found from.
+        :type points_table: numpy.ndarray
+
+        :param radius: radius within which the candidates were searched.
+        :type radius: float
+        """
+        # The candidates of every axis must cover the threshold.
+        if self._candidates and self._candidate_points is points_table:
+            radius = min(radius, self._search_radius)
+        self._candidates[axis] = candidates
+        self._candidate_points = points_table
+        self._search_radius = radius
+
+    def _match_candidates(self, axis):
+        """Match the symmetrical vertices from the stored mirror candidates of
+        an axis, using the current threshold.
+
+        :param axis: index of the symmetry axis (0 = X, 1 = Y, 2 = Z).
+        :type axis: int
+
+        :return: target indices, their matching source indices and the indices
+        of the ambiguous vertices.
+        :rtype: numpy.ndarray, numpy.ndarray, numpy.ndarray
+        """
+        targets, sources, ambiguous = matching.match_nearest(
+            self._candidate_points,
+            axis,
+            self.threshold,
+            self.positive,
+            candidates=self._candidates[axis],
+        )
+        ambiguous_indices = np.flatnonzero(ambiguous)
+        if len(ambiguous_indices):
+            log.warning(
+                "%d vertices have several symmetry candidates within the threshold.",
+                len(ambiguous_indices),
+            )
+        return targets, sources, ambiguous_indices
+
+    def _filter_candidates(self):
+        """Rebuild the symmetry tables of the built axes from their stored
+        mirror candidates, without searching the candidates again.
+
+        :return: True if the tables were filtered, False if the candidates of
+        an axis are missing or were not searched far enough for the threshold.
+        :rtype: bool
+        """
+        if not self.can_filter(self.threshold):
+            return False
+        axes = [
+            axis
+            for axis, direction in self._axis_tables
+            if direction == self._direction
+        ]
+
+        log.info(
+            "Filtering symmetry table for mesh '%s' with threshold %s.",
+            self._dag_path,
+            self.threshold,
+        )
+        # The tables of the other direction are derived again when needed.
+        self._axis_tables = {}
+        for axis in axes:
+            targets, sources, ambiguous = self._match_candidates(self._axis_idcs[axis])
+            self._axis_tables[axis, self._direction] = self._create_axis_table(
+                self._candidate_points,
+                axis,
+                targets,
+                sources,
+                ambiguous,
+                self._dag_path,
+                ambiguous,
+            )
+        self._activate_axis()
+        return True
+
+    def _build_spatial_hash_map(self, points_table, axis=None):
         """Build the symmetry map as a dict ``{target_index: source_index}``.
 
         For each vertex, this method computes its mirror reflection across the
@@ -189,8 +1074,12 @@ class GeometryTable:
             Collision Detection of Deformable Objects.* Proceedings of VMV.
             https://matthias-research.github.io/pages/publications/tetraederCollision.pdf
 
-        :param points_table: positions of all mesh vertices.
-        :type points_table: maya.api.OpenMaya.MPointArray
+        :param points_table: ``(n, 3)`` positions of all mesh vertices.
+        :type points_table: numpy.ndarray
+
+        :param axis: index of the symmetry axis, the axis of the table when
+        not specified.
+        :type axis: int
 
         :return: symmetry map ``{target_index: source_index}``.
         :rtype: dict[int, int]
@@ -199,14 +1088,15 @@ class GeometryTable:
         log.debug("Building symmetry map for %d points.", n)
 
         threshold = self.threshold
-        axis = self.axis
+        if axis is None:
+            axis = self.axis
         is_positive = self.positive
         threshold_sq = threshold * threshold
 
         cell_size = threshold if threshold > 0 else 1.0
         inv_cell = 1.0 / cell_size
 
-        positions = [(pt[0], pt[1], pt[2]) for pt in points_table]
+        positions = [tuple(pt) for pt in points_table.tolist()]
         grid = self._build_spatial_hash(positions, inv_cell)
 
         symmetry_map = {}
@@ -310,26 +1200,6 @@ class GeometryTable:
             not self.positive and (position[self.axis] > position_to_check[self.axis])
         )
 
-    @staticmethod
-    def _get_non_mirrored_vertices(points_table, symmetry_map):
-        """Get the list of the vertex indices that do not have a mirrored counterpart.
-
-        :param points_table:
-        :type points_table: maya.api.OpenMaya.MPointArray
-
-        :param symmetry_map: map of the symmetry as a dict {target: source}.
-        :type symmetry_map: dict[int: int]
-
-        :return: list of the vertex indices that do not have a mirrored counterpart.
-        :rtype: list[int]
-        """
-        mapped_indices = set(symmetry_map.keys()) | set(symmetry_map.values())
-        non_mirrored_table = [
-            idx for idx in range(len(points_table)) if idx not in mapped_indices
-        ]
-
-        return non_mirrored_table
-
     @staticmethod
     def _distance(point_a, point_b):
         """Calculate the distance between 2 points.
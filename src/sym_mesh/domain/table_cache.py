@@ -0,0 +1,335 @@
+import collections
+import hashlib
+import logging
+import os
+import tempfile
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+# Bump this whenever the content of the cached files changes.
+FORMAT_VERSION = 2
+
+EXTENSION = ".npz"
+
+EVICTION_POLICIES = ("lru", "fifo")
+
+CachedTable = collections.namedtuple(
+    "CachedTable",
+    ["targets", "sources", "non_mirrored", "ambiguous", "several", "candidates"],
+)
+CachedTable.__doc__ = """Symmetry table loaded from a :class:`TableCache`.
+
+``targets``, ``sources``, ``non_mirrored`` and ``ambiguous`` hold int32 vertex
+indices. ``several`` holds the indices of the vertices that had several mirror
+candidates, None if the engine does not report them. ``candidates`` holds the
+``nearest``, ``distance`` and ``second_distance`` arrays of the mirror
+candidates, see :class:`domain.matching.MirrorCandidates`, None if the engine
+does not search them.
+"""
+
+
+def default_directory():
+    """Get the cache directory, from the ``SYM_MESH_CACHE_DIR`` environment
+    variable if it is set, in the user's home directory otherwise.
+
+    :rtype: str
+    """
+    directory = os.environ.get("SYM_MESH_CACHE_DIR")
+    if directory:
+        return directory
+    return os.path.join(os.path.expanduser("~"), ".sym_mesh", "cache")
+
+
+def default_max_size():
+    """Get the cache size limit in bytes, from the ``SYM_MESH_CACHE_MAX_SIZE``
+    environment variable (in MB) if it is set, 512 MB otherwise.
+
+    :rtype: int
+    """
+    return int(float(os.environ.get("SYM_MESH_CACHE_MAX_SIZE", 512)) * 1024**2)
+
+
+def fingerprint(positions, topology=()):
+    """Compute a fingerprint of the topology and vertex positions of a mesh.
+
+    :param positions: positions of all the mesh vertices.
+    :type positions: numpy.ndarray
+
+    :param topology: integers describing the mesh topology, like its number of
+    vertices, edges, faces and face vertices.
+    :type topology: tuple[int]
+
+    :return: hexadecimal fingerprint of the mesh.
+    :rtype: str
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.asarray(topology, dtype=np.int64).tobytes())
+    digest.update(np.ascontiguousarray(positions, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def topology_fingerprint(vertex_count, face_counts, face_vertices):
+    """Compute a fingerprint of the connectivity of a mesh, meshes with the
+    same fingerprint share the same vertex order whatever their shape.
+
+    :param vertex_count: number of vertices of the mesh.
+    :type vertex_count: int
+
+    :param face_counts: number of vertices of each polygon.
+    :type face_counts: numpy.ndarray
+
+    :param face_vertices: indices of the vertices of all the polygons.
+    :type face_vertices: numpy.ndarray
+
+    :return: hexadecimal fingerprint of the mesh topology.
+    :rtype: str
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.array([vertex_count, len(face_counts)], dtype=np.int64).tobytes())
+    digest.update(np.ascontiguousarray(face_counts, dtype=np.int32).tobytes())
+    digest.update(np.ascontiguousarray(face_vertices, dtype=np.int32).tobytes())
+    return digest.hexdigest()
+
+
+class TableCache(object):
+    def __init__(self, directory=None, max_size=None, eviction="lru"):
+        """Persistent cache of symmetry tables, stored as compact binary files.
+
+        Each entry is an uncompressed numpy archive holding the int32 target,
+        source, non-mirrored and ambiguous vertex indices of one table, and
+        what a freshly built table keeps besides them: the vertices that had
+        several candidates and the mirror candidates of the "nearest" engine.
+        Entries are keyed by the mesh fingerprint and the settings used to
+        build the table, so a modified mesh or new settings simply miss the
+        cache.
+
+        :param directory: directory in which the tables are stored, see
+        :func:`default_directory` when not specified.
+        :type directory: str
+
+        :param max_size: maximum size of the cache in bytes, see
+        :func:`default_max_size` when not specified.
+        :type max_size: int
+
+        :param eviction: policy used to pick the tables to delete when the cache
+        exceeds its size. "lru" deletes the least recently used tables, "fifo"
+        the oldest ones.
+        :type eviction: str
+        """
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(
+                "Unknown eviction policy '{}', accepted policies are {}.".format(
+                    eviction, ", ".join(EVICTION_POLICIES)
+                )
+            )
+        self.directory = directory or default_directory()
+        self.max_size = default_max_size() if max_size is None else max_size
+        self.eviction = eviction
+
+    @staticmethod
+    def key(mesh_fingerprint, axis, direction, threshold, space, engine, radius=0.0):
+        """Get the cache key of a symmetry table.
+
+        :param mesh_fingerprint: fingerprint of the mesh, see :func:`fingerprint`.
+        :type mesh_fingerprint: str
+
+        :param axis: axis used to build the symmetry table.
+        :type axis: str
+
+        :param direction: direction used to build the symmetry table.
+        :type direction: str
+
+        :param threshold: threshold used to build the symmetry table.
+        :type threshold: float
+
+        :param space: space in which the point positions were queried.
+        :type space: int
+
+        :param engine: engine used to build the symmetry table.
+        :type engine: str
+
+        :param radius: radius within which the mirror candidates were searched,
+        0 for the engines that do not search them.
+        :type radius: float
+
+        :return: hexadecimal cache key.
+        :rtype: str
+        """
+        settings = "{}|{}|{}|{!r}|{}|{}|{}|{!r}".format(
+            FORMAT_VERSION,
+            mesh_fingerprint,
+            axis,
+            float(threshold),
+            direction,
+            space,
+            engine,
+            float(radius),
+        )
+        return hashlib.blake2b(settings.encode("utf-8"), digest_size=16).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key + EXTENSION)
+
+    def load(self, key):
+        """Load a symmetry table from the cache.
+
+        :param key: cache key of the table, see :meth:`key`.
+        :type key: str
+
+        :return: the table, or None if it is not cached.
+        :rtype: CachedTable or None
+        """
+        path = self.path(key)
+        try:
+            with np.load(path) as archive:
+                several = archive["several"] if "several" in archive.files else None
+                candidates = None
+                if "nearest" in archive.files:
+                    candidates = (
+                        archive["nearest"],
+                        archive["distance"],
+                        archive["second_distance"],
+                    )
+                cached_table = CachedTable(
+                    archive["targets"],
+                    archive["sources"],
+                    archive["non_mirrored"],
+                    archive["ambiguous"],
+                    several,
+                    candidates,
+                )
+        except (IOError, OSError, KeyError, ValueError):
+            return None
+
+        if self.eviction == "lru":
+            try:
+                os.utime(path, None)
+            except OSError:  # pragma: no cover
+                pass
+        log.debug("Loaded symmetry table %s from the cache.", key)
+        return cached_table
+
+    def save(
+        self,
+        key,
+        targets,
+        sources,
+        non_mirrored,
+        ambiguous=(),
+        several=None,
+        candidates=None,
+    ):
+        """Save a symmetry table in the cache, then evict old tables if needed.
+
+        :param key: cache key of the table, see :meth:`key`.
+        :type key: str
+
+        :param targets: indices of the target vertices.
+        :type targets: numpy.ndarray
+
+        :param sources: indices of the source vertex of each target.
+        :type sources: numpy.ndarray
+
+        :param non_mirrored: indices of the vertices without a mirror.
+        :type non_mirrored: numpy.ndarray
+
+        :param ambiguous: indices of the ambiguous vertices.
+        :type ambiguous: numpy.ndarray
+
+        :param several: optional indices of the vertices that had several mirror
+        candidates within the threshold.
+        :type several: numpy.ndarray
+
+        :param candidates: optional mirror candidates of the vertices.
+        :type candidates: domain.matching.MirrorCandidates
+        """
+        arrays = dict(
+            targets=np.asarray(targets, dtype=np.int32),
+            sources=np.asarray(sources, dtype=np.int32),
+            non_mirrored=np.asarray(non_mirrored, dtype=np.int32),
+            ambiguous=np.asarray(ambiguous, dtype=np.int32),
+        )
+        if several is not None:
+            arrays["several"] = np.asarray(several, dtype=np.int32)
+        if candidates is not None:
+            nearest, distance, second_distance = candidates
+            arrays["nearest"] = np.asarray(nearest, dtype=np.int32)
+            arrays["distance"] = np.asarray(distance, dtype=np.float64)
+            arrays["second_distance"] = np.asarray(second_distance, dtype=np.float64)
+
+        temp_path = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write to a temporary file first so that a concurrent session never
+            # reads a partially written table.
+            handle, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+            with os.fdopen(handle, "wb") as stream:
+                np.savez(stream, **arrays)
+            os.replace(temp_path, self.path(key))
+        except (IOError, OSError) as error:
+            # The temporary files are not counted in the size of the cache, so
+            # a failed write must not leave one behind.
+            if temp_path is not None and os.path.exists(temp_path):
+                try:
+                    os.remove(temp_path)
+                except OSError:  # pragma: no cover
+                    pass
+            log.warning("Unable to save symmetry table in the cache : %s", error)
+            return
+        log.debug("Saved symmetry table %s in the cache.", key)
+        self.evict()
+
+    def entries(self):
+        """Get the files of the cache, from the first to the last one to evict.
+
+        :return: path, size and modification time of each cached table.
+        :rtype: list[tuple[str, int, float]]
+        """
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for name in os.listdir(self.directory):
+            if not name.endswith(EXTENSION):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:  # pragma: no cover
+                continue
+            # Loading a table refreshes its modification time with the lru
+            # policy only, so sorting on it covers both policies.
+            entries.append((path, stat.st_size, stat.st_mtime))
+        entries.sort(key=lambda entry: entry[2])
+        return entries
+
+    def size(self):
+        """Get the total size of the cache in bytes.
+
+        :rtype: int
+        """
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """Delete tables, following the eviction policy, until the cache fits
+        within its maximum size."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:  # pragma: no cover
+                continue
+            total -= size
+            log.debug("Evicted %s from the symmetry table cache.", path)
+
+    def clear(self):
+        """Delete every table from the cache."""
+        for path, _, _ in self.entries():
+            try:
+                os.remove(path)
+            except OSError:  # pragma: no cover
+                pass
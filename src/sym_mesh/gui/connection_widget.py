@@ -1,7 +1,11 @@
 from functools import partial
 from qtpy import QtWidgets, QtCore
 
-from sym_mesh.gui import controller, layout
+from sym_mesh.gui import controller, layout, scheduler
+
+# Interval in milliseconds at which the progress of the base table build is
+# checked.
+BUILD_POLL_INTERVAL = 50
 
 
 class ConnectionWidget(QtWidgets.QGroupBox):
@@ -17,11 +21,36 @@ class ConnectionWidget(QtWidgets.QGroupBox):
         self.ctrl = controller.Controller()
         self.gui = layout.Layout(self)
 
-        self.gui.threshold_sb.valueChanged.connect(self.set_threshold)
+        # Sliders are computed at most once per frame and settings once they
+        # stopped changing, buttons apply the pending updates before running.
+        self.scheduler = scheduler.UpdateScheduler(self)
+        for button in (
+            self.gui.get_base_pb,
+            self.gui.get_target_pb,
+            self.gui.select_non_symmetrical_vertices_pb,
+            self.gui.revert_to_base_pb,
+            self.gui.symmetry_pb,
+            self.gui.flip_pb,
+            self.gui.extract_axes_pb,
+            self.gui.bake_deltas_pb,
+            self.gui.undo_push_button,
+            self.gui.redo_push_button,
+        ):
+            button.clicked.connect(self.scheduler.flush)
+
+        set_threshold = self.scheduler.debounce(self.set_threshold)
+        self.gui.threshold_sb.valueChanged.connect(set_threshold)
+        self.gui.threshold_sb.editingFinished.connect(set_threshold.flush)
         self.gui.direction_rb_group.buttonReleased.connect(self.set_direction)
         self.gui.axis_rb_group.buttonReleased.connect(self.set_axis)
 
         self.gui.get_base_pb.clicked.connect(self.ctrl.get_base)
+        self.gui.cancel_build_pb.clicked.connect(self.ctrl.cancel_build)
+        self.build_timer = QtCore.QTimer(self)
+        self.build_timer.setInterval(BUILD_POLL_INTERVAL)
+        self.build_timer.timeout.connect(self.ctrl.poll_build)
+        self.ctrl.build_progress.connect(self.show_build_progress)
+        self.ctrl.build_finished.connect(self.hide_build_progress)
         self.gui.get_target_pb.clicked.connect(self.ctrl.get_target)
         self.gui.select_non_symmetrical_vertices_pb.clicked.connect(
             self.ctrl.select_non_mirrored_vertices
@@ -36,21 +65,20 @@ class ConnectionWidget(QtWidgets.QGroupBox):
         )
 
         self.gui.revert_to_base_pb.clicked.connect(self.ctrl.revert_to_base)
-        self.gui.revert_to_base_slider.valueChanged.connect(
-            self.ctrl.revert_to_base_live
+        self.connect_slider(
+            self.gui.revert_to_base_slider, self.ctrl.revert_to_base_live
         )
-        self.gui.revert_to_base_slider.sliderReleased.connect(self.ctrl.stash_command)
 
         self.gui.symmetry_pb.clicked.connect(self.ctrl.symmetrize)
-        self.gui.symmetry_slider.valueChanged.connect(self.ctrl.symmetrize_live)
-        self.gui.symmetry_slider.sliderReleased.connect(self.ctrl.stash_command)
+        self.connect_slider(self.gui.symmetry_slider, self.ctrl.symmetrize_live)
 
         self.gui.flip_pb.clicked.connect(self.ctrl.flip)
-        self.gui.flip_slider.valueChanged.connect(self.ctrl.flip_live)
-        self.gui.flip_slider.sliderReleased.connect(self.ctrl.stash_command)
+        self.connect_slider(self.gui.flip_slider, self.ctrl.flip_live)
 
         self.gui.extract_axes_pb.clicked.connect(self.ctrl.extract_axes)
-        self.gui.extract_sb.valueChanged.connect(self.set_extract_translate)
+        set_extract_translate = self.scheduler.debounce(self.set_extract_translate)
+        self.gui.extract_sb.valueChanged.connect(set_extract_translate)
+        self.gui.extract_sb.editingFinished.connect(set_extract_translate.flush)
 
         self.gui.bake_deltas_pb.clicked.connect(self.ctrl.bake_deltas)
 
@@ -75,6 +103,7 @@ class ConnectionWidget(QtWidgets.QGroupBox):
 
         """
         if event.key() == QtCore.Qt.Key_Z:
+            self.scheduler.flush()
             if event.modifiers() == QtCore.Qt.ShiftModifier | QtCore.Qt.ControlModifier:
                 self.ctrl.redo()
                 return event.accept()
@@ -94,6 +123,41 @@ class ConnectionWidget(QtWidgets.QGroupBox):
         super(ConnectionWidget, self).mousePressEvent(event)  # pragma: no cover
         self.setFocus()  # pragma: no cover
 
+    def connect_slider(self, slider, function):
+        """Connect a slider to the live version of a command. The command is
+        computed at most once per frame while the slider is dragged, and with
+        the final value of the slider before it is stashed on release.
+
+        :param slider: slider of the command.
+        :type slider: QtWidgets.QSlider
+
+        :param function: live command, called with the value of the slider.
+        :type function: callable
+        """
+        update = self.scheduler.throttle(function)
+        slider.valueChanged.connect(update)
+        slider.sliderReleased.connect(partial(self.release_slider, update))
+
+    def release_slider(self, update):
+        update.flush()
+        self.ctrl.stash_command()
+
+    def show_build_progress(self, value):
+        self.gui.show_build_progress(value)
+        if not self.build_timer.isActive():
+            self.build_timer.start()
+
+    def hide_build_progress(self, mesh):
+        self.build_timer.stop()
+        self.gui.show_build_progress(None)
+
+    def teardown(self):
+        """Stop the build timer and release the controller, see
+        :meth:`gui.controller.Controller.close`. This is called when the dialog
+        holding the widget is closed."""
+        self.build_timer.stop()
+        self.ctrl.close()
+
     def set_threshold(self, value):
         self.ctrl.threshold = value
 
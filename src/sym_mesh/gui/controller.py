@@ -1,8 +1,13 @@
 from maya import cmds as mc
 import logging
 
+from sym_mesh.domain import backend
+from sym_mesh.domain import builder
 from sym_mesh.domain import executor
+from sym_mesh.domain import matching
+from sym_mesh.domain import registry
 from sym_mesh.domain import table
+from sym_mesh.domain import table_cache
 from sym_mesh.domain.commands.deformation_commands import (
     BakeDifferenceCommand,
     FlipCommand,
@@ -16,6 +21,10 @@ from sym_mesh.gui import signal
 log = logging.getLogger(__name__)
 log.setLevel(logging.INFO)
 
+# Radius within which the mirror candidates of the base mesh are searched, any
+# threshold up to this value is applied without rebuilding the base table.
+THRESHOLD_SEARCH_RADIUS = 0.1
+
 
 class Controller(object):
     def __init__(self):
@@ -26,6 +35,8 @@ class Controller(object):
         self.vertex_selection = VertexSelection(from_list=())
 
         self.executor = executor.Executor()
+        self.table_cache = table_cache.TableCache()
+        self.table_registry = registry.TableRegistry()
 
         self.vertices_are_stored = False
         self._threshold = 0.001
@@ -35,10 +46,13 @@ class Controller(object):
         self.translate_value = 20
         self.base_table: sym_mesh.domain.table.GeometryTable = None
         self.target_table: sym_mesh.domain.table.GeometryTable = None
+        self._build = None
 
         # Signals
         self.set_base = signal.Signal()
         self.set_target = signal.Signal()
+        self.build_progress = signal.Signal()
+        self.build_finished = signal.Signal()
 
     @property
     def threshold(self):
@@ -46,11 +60,20 @@ class Controller(object):
 
     @threshold.setter
     def threshold(self, value):
-        """Set the threshold and regenerate the base geometry table."""
+        """Set the threshold of the base geometry table. Up to
+        THRESHOLD_SEARCH_RADIUS, this only filters the mirror candidates found
+        when the table was built. Otherwise, or if the table was loaded from
+        the cache without its candidates, the table is rebuilt in the
+        background, see :meth:`get_base`."""
         log.info("Setting threshold to : %s", value)
         self._threshold = value
 
-        self._regenerate_base()
+        # A table being built gets the settings once it is built.
+        if self.base_table and not self.is_building:
+            if self.base_table.can_filter(value):
+                self.base_table.threshold = value
+            else:
+                self._regenerate_base()
 
     @property
     def axis(self):
@@ -58,11 +81,14 @@ class Controller(object):
 
     @axis.setter
     def axis(self, value):
-        """Set the axis and regenerate the base geometry table."""
+        """Set the axis of the base geometry table. Its symmetry table is built
+        for every axis, so this does not rebuild anything."""
         log.info("Setting axis to : %s", value)
         self._axis = value
 
-        self._regenerate_base()
+        # A table being built gets the settings once it is built.
+        if self.base_table and not self.is_building:
+            self.base_table.axis = value
 
     @property
     def direction(self):
@@ -70,52 +96,212 @@ class Controller(object):
 
     @direction.setter
     def direction(self, value):
-        """Set the direction and regenerate the base geometry table."""
+        """Set the direction of the base geometry table, which derives the
+        table of the new direction from the current one instead of rebuilding it."""
         log.info("Setting direction to : %s", value)
         self._direction = value
 
-        self._regenerate_base()
+        # A table being built gets the settings once it is built.
+        if self.base_table and not self.is_building:
+            self.base_table.direction = value
+
+    @property
+    def is_building(self):
+        """Return whether a base table is being built in the background.
+
+        :rtype: bool
+        """
+        return self._build is not None
+
+    def _get_base_table_settings(self):
+        """Get the arguments of the base geometry table besides its axis,
+        direction and threshold.
+
+        :rtype: dict
+        """
+        return {
+            "cache": self.table_cache,
+            "axes": table.GeometryTable.AXES,
+            "engine": "nearest",
+            "max_radius": THRESHOLD_SEARCH_RADIUS,
+            "workers": matching.default_workers(),
+        }
 
     def _regenerate_base(self):
         """Regenerate the geometry table for the base mesh. This is a convenience
         method used exclusively to regenerate the existing base geometry table
-        when setting the properties to change the threshold, axis, or direction
-        to use for the geometry tables."""
+        when its threshold cannot be changed by filtering its mirror
+        candidates. The table is built in the background, see
+        :meth:`get_base`."""
         if self.base_table:
-            mesh = str(self.base_table)
+            mesh = self._get_mesh_name(self.base_table)
             log.debug(
                 "Existing base table found, regenerating base table with "
                 'mesh "{}", axis "{}", direction "{}", threshold "{}"'.format(
                     mesh, self._axis, self._direction, self._threshold
                 )
             )
-            self.base_table = table.GeometryTable(
-                mesh,
-                axis=self._axis,
-                direction=self._direction,
-                threshold=self._threshold,
-            )
-            self.set_base.emit(mesh)
+            self._start_build(mesh)
 
     def get_base(self):
-        """
-        Get base data and set its name in the corresponding lineEdit.
-        :return:
+        """Get the base geometry table of the selected mesh and set its name in
+        the corresponding lineEdit.
+
+        A table registered for the mesh is used right away. Otherwise the point
+        positions are read here and the symmetry table is built in a worker
+        thread, the current base table being kept until the new one is built.
+        The GUI reports the progress of the build through :meth:`poll_build`,
+        and operations requested meanwhile wait for the end of the build.
         """
         mesh = mc.ls(sl=True)[0]
-        self.base_table = table.GeometryTable(
-            mesh, axis=self._axis, direction=self._direction, threshold=self._threshold
+        self.cancel_build()
+        base_table = self.table_registry.lookup(
+            mesh,
+            axis=self._axis,
+            direction=self._direction,
+            threshold=self._threshold,
+            **self._get_base_table_settings()
+        )
+        if base_table is None:
+            self._start_build(mesh)
+            return
+        self.base_table = base_table
+        self.set_base.emit(mesh)
+
+    def _start_build(self, mesh):
+        """Start the build of the base geometry table of a mesh in a worker
+        thread, cancelling the build in progress if any.
+
+        :param mesh: name of the base mesh.
+        :type mesh: str
+        """
+        self.cancel_build()
+        base_table = table.GeometryTable(
+            mesh,
+            axis=self._axis,
+            direction=self._direction,
+            threshold=self._threshold,
+            lazy=True,
+            **self._get_base_table_settings()
         )
+        log.info("Building the symmetry table of '%s' in the background.", mesh)
+        self._build = builder.BackgroundBuild(base_table)
         self.set_base.emit(mesh)
+        self.build_progress.emit(0)
+
+    def poll_build(self):
+        """Report the progress of the build of the base table, and use the new
+        table once it is built. This is called periodically by the GUI."""
+        if self._build is None:
+            return
+        if self._build.done:
+            self._finish_build()
+        else:
+            self.build_progress.emit(int(self._build.progress * 100))
+
+    def wait_for_build(self):
+        """Wait for the end of the build of the base table, if any, and use the
+        new table."""
+        # Finishing a build starts another one if the threshold changed during
+        # the build and cannot be applied to the new table.
+        while self._build is not None:
+            if not self._build.done:
+                log.info("Waiting for the symmetry table of '%s'.", self._build.table)
+                self._build.wait()
+            self._finish_build()
+
+    def cancel_build(self):
+        """Cancel the build of the base table, if any, and keep the previous
+        base table."""
+        if self._build is None:
+            return
+        self._build.cancel()
+        self._finish_build()
+
+    def _finish_build(self):
+        """Swap the base table for the table that was built, or keep the
+        previous base table if the build was cancelled or failed, then apply
+        the axis, direction and threshold set during the build. A threshold
+        that cannot be applied to the new table starts another build."""
+        build = self._build
+        self._build = None
+        base_table = build.result
+        if base_table is not None:
+            self.table_registry.add(base_table, **self._get_base_table_settings())
+            self.base_table = base_table
+            self.build_progress.emit(100)
+        else:
+            self.set_base.emit(str(self.base_table) if self.base_table else "")
+
+        rebuild = False
+        if self.base_table:
+            if self.base_table.threshold != self._threshold:
+                if self.base_table.can_filter(self._threshold):
+                    self.base_table.threshold = self._threshold
+                elif base_table is not None:
+                    rebuild = True
+                else:
+                    log.info(
+                        "Keeping threshold %s for '%s', its symmetry table was "
+                        "not rebuilt.",
+                        self.base_table.threshold,
+                        self.base_table,
+                    )
+            if self.base_table.direction != self._direction:
+                self.base_table.direction = self._direction
+            if self.base_table.axis != table.GeometryTable.AXES.index(self._axis):
+                self.base_table.axis = self._axis
+        self.build_finished.emit(None if base_table is None else str(base_table))
+        if rebuild:
+            self._regenerate_base()
+
+    def _get_base_table(self):
+        """Get the base geometry table, waiting for the end of its build if it
+        is being built.
+
+        :rtype: domain.table.GeometryTable
+        """
+        self.wait_for_build()
+        return self.base_table
 
     def get_target(self):
         """Get target data and set its name in the corresponding lineEdit."""
         mesh = mc.ls(sl=True)[0]
-        self.target_table = table.GeometryTable(
-            mesh, axis=self._axis, direction=self._direction, threshold=self._threshold
-        )
+        self.target_table = self._create_target_table(mesh)
         self.set_target.emit(mesh)
 
+    def _create_target_table(self, mesh):
+        """Get the geometry table of a target mesh. Operations only read the
+        point positions of their target, so its symmetry table is built lazily,
+        the first time it is requested. The table is reused from the registry
+        until the mesh changes.
+
+        :param mesh: name of the target mesh.
+        :type mesh: str
+
+        :return: geometry table of the target mesh.
+        :rtype: domain.table.GeometryTable
+        """
+        return self.table_registry.get(
+            mesh,
+            axis=self._axis,
+            direction=self._direction,
+            threshold=self._threshold,
+            lazy=True,
+        )
+
+    @staticmethod
+    def _get_mesh_name(geometry_table):
+        """Get the current name of the mesh of a geometry table, which follows
+        the renames of the mesh since the table was created.
+
+        :param geometry_table: geometry table of the mesh.
+        :type geometry_table: domain.table.GeometryTable
+
+        :rtype: str
+        """
+        return backend.get_backend().get_name(geometry_table.dag_path)
+
     def get_vertex_selection(self, reset=False):
         """Get the current selection of vertices and set it.
 
@@ -138,7 +324,7 @@ class Controller(object):
         self.vertex_selection.select()
 
     def select_non_mirrored_vertices(self):
-        self.base_table.non_mirrored_vertices.select(
+        self._get_base_table().non_mirrored_vertices.select(
             msg="No non-mirrored vertices found."
         )
 
@@ -151,16 +337,11 @@ class Controller(object):
             log.error("Unable to revert to base, no target selected.")
             return
         target = selection[0]
-        base_table = self.base_table
+        base_table = self._get_base_table()
         if not base_table:
             log.error("Unable to revert to base, no base defined.")
             return
-        target_table = table.GeometryTable(
-            target,
-            axis=self._axis,
-            direction=self._direction,
-            threshold=self._threshold,
-        )
+        target_table = self._create_target_table(target)
         vertex_selection = (
             self.vertex_selection if self.vertices_are_stored else VertexSelection()
         )
@@ -187,16 +368,11 @@ class Controller(object):
                 log.error("Unable to revert to base, no target selected.")
                 return
             target = selection[0]
-            base_table = self.base_table
+            base_table = self._get_base_table()
             if not base_table:
                 log.error("Unable to revert to base, no base defined.")
                 return
-            target_table = table.GeometryTable(
-                target,
-                axis=self._axis,
-                direction=self._direction,
-                threshold=self._threshold,
-            )
+            target_table = self._create_target_table(target)
             vertex_selection = (
                 self.vertex_selection if self.vertices_are_stored else VertexSelection()
             )
@@ -206,6 +382,7 @@ class Controller(object):
                 target_table=target_table,
                 vertex_selection=vertex_selection,
                 percentage=value,
+                live=True,
             )
         else:
             self.executor.command.percentage = value
@@ -223,19 +400,14 @@ class Controller(object):
             log.error("Unable to symmetrize, no target selected.")
             return
         target = selection[0]
-        base_table = self.base_table
+        base_table = self._get_base_table()
         if not base_table:
             log.error("Unable to symmetrize, no base defined.")
             return
         vertex_selection = (
             self.vertex_selection if self.vertices_are_stored else VertexSelection()
         )
-        target_table = table.GeometryTable(
-            target,
-            axis=self._axis,
-            direction=self._direction,
-            threshold=self._threshold,
-        )
+        target_table = self._create_target_table(target)
         self.executor.execute(
             SymmetrizeCommand,
             base_table=base_table,
@@ -259,25 +431,21 @@ class Controller(object):
                 log.error("Unable to symmetrize, no target selected.")
                 return
             target = selection[0]
-            base_table = self.base_table
+            base_table = self._get_base_table()
             if not base_table:
                 log.error("Unable to symmetrize, no base defined.")
                 return
             vertex_selection = (
                 self.vertex_selection if self.vertices_are_stored else VertexSelection()
             )
-            target_table = table.GeometryTable(
-                target,
-                axis=self._axis,
-                direction=self._direction,
-                threshold=self._threshold,
-            )
+            target_table = self._create_target_table(target)
             self.executor.execute(
                 SymmetrizeCommand,
                 base_table=base_table,
                 target_table=target_table,
                 vertex_selection=vertex_selection,
                 percentage=value,
+                live=True,
             )
         else:
             self.executor.command.percentage = value
@@ -288,19 +456,14 @@ class Controller(object):
             log.error("Unable to flip, no target selected.")
             return
         target = selection[0]
-        base_table = self.base_table
+        base_table = self._get_base_table()
         if not base_table:
             log.error("Unable to flip, no base defined.")
             return
         vertex_selection = (
             self.vertex_selection if self.vertices_are_stored else VertexSelection()
         )
-        target_table = table.GeometryTable(
-            target,
-            axis=self._axis,
-            direction=self._direction,
-            threshold=self._threshold,
-        )
+        target_table = self._create_target_table(target)
         self.executor.execute(
             FlipCommand,
             base_table=base_table,
@@ -324,25 +487,21 @@ class Controller(object):
                 log.error("Unable to flip, no target selected.")
                 return
             target = selection[0]
-            base_table = self.base_table
+            base_table = self._get_base_table()
             if not base_table:
                 log.error("Unable to flip, no base defined.")
                 return
             vertex_selection = (
                 self.vertex_selection if self.vertices_are_stored else VertexSelection()
             )
-            target_table = table.GeometryTable(
-                target,
-                axis=self._axis,
-                direction=self._direction,
-                threshold=self._threshold,
-            )
+            target_table = self._create_target_table(target)
             self.executor.execute(
                 FlipCommand,
                 base_table=base_table,
                 target_table=target_table,
                 vertex_selection=vertex_selection,
                 percentage=value,
+                live=True,
             )
         else:
             self.executor.command.percentage = value
@@ -353,16 +512,11 @@ class Controller(object):
             log.error("Unable to extract axes, no target selected.")
             return
         target = selection[0]
-        base_table = self.base_table
+        base_table = self._get_base_table()
         if not base_table:
             log.error("Unable to extract axes, no base defined.")
             return
-        target_table = table.GeometryTable(
-            target,
-            axis=self._axis,
-            direction=self._direction,
-            threshold=self._threshold,
-        )
+        target_table = self._create_target_table(target)
         self.executor.execute(
             ExtractAxesCommand,
             base_table=base_table,
@@ -382,11 +536,12 @@ class Controller(object):
         if not target_paths:
             log.error("Unable to bake deltas, no selected geometries to bake onto.")
             return
-        target_table = self.target_table
-        if not target_table:
+        if not self.target_table:
             log.error("Unable to bake deltas, no target position defined.")
             return
-        base_table = self.base_table
+        # Read the target positions again if the target changed since it was set.
+        target_table = self._create_target_table(self._get_mesh_name(self.target_table))
+        base_table = self._get_base_table()
         if not base_table:
             log.error("Unable to bake deltas, no base position defined.")
             return
@@ -401,6 +556,13 @@ class Controller(object):
             )
             self.executor.stash_command()
 
+    def close(self):
+        """Cancel the build of the base table and drop the geometry tables of
+        the registry, removing the callbacks tracking the changes of their
+        meshes. This is called when the UI is closed."""
+        self.cancel_build()
+        self.table_registry.clear()
+
     def undo(self):
         self.executor.undo()
 
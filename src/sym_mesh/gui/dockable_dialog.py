@@ -35,6 +35,15 @@ class DockableDialog(dockable, QtWidgets.QDialog):
         self.layout = QtWidgets.QVBoxLayout(self)  # pragma: no cover
         self.layout.addWidget(self.connector)  # pragma: no cover
 
+    def closeEvent(self, event):
+        """Release the controller when the floating dialog is closed."""
+        self.connector.teardown()  # pragma: no cover
+        super(DockableDialog, self).closeEvent(event)  # pragma: no cover
+
+    def dockCloseEventTriggered(self):
+        """Release the controller when the docked dialog is closed."""
+        self.connector.teardown()  # pragma: no cover
+
     @classmethod
     def instance(cls, connector, parent=None):
         if not cls._instance:  # pragma: no cover
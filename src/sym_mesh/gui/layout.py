@@ -98,6 +98,21 @@ class Layout(QtWidgets.QVBoxLayout):
         self.base_line_edit.setObjectName("base_line_edit")
         base_layout.addWidget(self.base_line_edit)
 
+        # Base build progress
+        build_layout = QtWidgets.QHBoxLayout()
+        setup_layout.addLayout(build_layout)
+
+        self.build_progress_bar = QtWidgets.QProgressBar()
+        self.build_progress_bar.setRange(0, 100)
+        self.build_progress_bar.setObjectName("build_progress_bar")
+        build_layout.addWidget(self.build_progress_bar)
+
+        self.cancel_build_pb = QtWidgets.QPushButton("Cancel")
+        self.cancel_build_pb.setObjectName("cancel_build_pB")
+        build_layout.addWidget(self.cancel_build_pb)
+
+        self.show_build_progress(None)
+
         # Get target
         target_layout = QtWidgets.QHBoxLayout()
         setup_layout.addLayout(target_layout)
@@ -242,6 +257,10 @@ class Layout(QtWidgets.QVBoxLayout):
             "Store the currently selected geometry as Base geometry.\n"
             "This mesh is used as symmetry table for all operations that require one."
         )
+        self.cancel_build_pb.setToolTip(
+            "Cancel the build of the symmetry table of the `Base` mesh.\n"
+            "The previous `Base` mesh is kept."
+        )
         self.get_target_pb.setToolTip(
             "Store the currently selected geometry as Target geometry.\n"
             "Currently only used when baking deltas."
@@ -295,6 +314,19 @@ class Layout(QtWidgets.QVBoxLayout):
     def set_line_edit(line_edit, arg):
         line_edit.setText(arg)
 
+    def show_build_progress(self, value):
+        """Show the progress of the build of the base symmetry table.
+
+        :param value: percentage of the build done, None to hide the progress
+        once the build is over.
+        :type value: int
+        """
+        building = value is not None
+        self.build_progress_bar.setVisible(building)
+        self.cancel_build_pb.setVisible(building)
+        if building:
+            self.build_progress_bar.setValue(value)
+
     def store_selection(self):
         self.vertices_are_stored = not self.vertices_are_stored
 
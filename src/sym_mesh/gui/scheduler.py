@@ -0,0 +1,148 @@
+from qtpy import QtCore, QtGui
+
+# Delay in milliseconds without edit after which a debounced setting is applied.
+DEBOUNCE_DELAY = 300
+
+# Refresh rate assumed when the refresh rate of the screen is unknown.
+DEFAULT_REFRESH_RATE = 60.0
+
+
+def frame_interval():
+    """Get the interval between two frames of the primary screen.
+
+    :return: interval in milliseconds.
+    :rtype: int
+    """
+    screen = QtGui.QGuiApplication.primaryScreen()
+    rate = screen.refreshRate() if screen is not None else 0.0
+    return max(1, int(1000.0 / (rate or DEFAULT_REFRESH_RATE)))
+
+
+class ScheduledCall(object):
+    def __init__(self, function, interval, parent=None):
+        """Call of a function with the latest value it was requested with,
+        deferred by a single shot timer.
+
+        :param function: function called with the value.
+        :type function: callable
+
+        :param interval: interval of the timer in milliseconds.
+        :type interval: int
+
+        :param parent: optional parent of the timer.
+        :type parent: QtCore.QObject
+        """
+        self._function = function
+        self._value = None
+        self.pending = False
+
+        self._timer = QtCore.QTimer(parent)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self._on_timeout)
+
+    def __call__(self, value):
+        raise NotImplementedError
+
+    def _on_timeout(self):
+        self.flush()
+
+    def flush(self):
+        """Call the function right away with the latest value, if a call is
+        pending."""
+        self._timer.stop()
+        if not self.pending:
+            return
+        self.pending = False
+        value = self._value
+        self._value = None
+        self._function(value)
+
+
+class Throttle(ScheduledCall):
+    """Call a function at most once per interval. The first value is applied
+    right away, the values received during the interval that follows are
+    coalesced and only the latest one is applied at its end."""
+
+    def __call__(self, value):
+        self._value = value
+        self.pending = True
+        if not self._timer.isActive():
+            self.flush()
+
+    def flush(self):
+        had_pending = self.pending
+        super(Throttle, self).flush()
+        if had_pending:
+            # Start the interval once the function returned, so that slow calls
+            # never run back to back.
+            self._timer.start()
+
+    def _on_timeout(self):
+        if self.pending:
+            self.flush()
+
+
+class Debounce(ScheduledCall):
+    """Call a function once its value stopped changing for the interval, with
+    the latest value."""
+
+    def __call__(self, value):
+        self._value = value
+        self.pending = True
+        self._timer.start()
+
+
+class UpdateScheduler(object):
+    def __init__(self, parent=None):
+        """Coalesce the updates requested by the widgets, so that only the
+        latest value of a widget is computed.
+
+        :param parent: optional parent of the timers.
+        :type parent: QtCore.QObject
+        """
+        self._parent = parent
+        self._calls = []
+
+    def throttle(self, function, interval=None):
+        """Get a function calling a function at most once per interval, see
+        :class:`Throttle`.
+
+        :param function: function called with the value.
+        :type function: callable
+
+        :param interval: interval in milliseconds, one frame of the screen when
+        not specified.
+        :type interval: int
+
+        :rtype: Throttle
+        """
+        call = Throttle(
+            function,
+            frame_interval() if interval is None else interval,
+            self._parent,
+        )
+        self._calls.append(call)
+        return call
+
+    def debounce(self, function, delay=DEBOUNCE_DELAY):
+        """Get a function calling a function once its value stopped changing
+        for a delay, see :class:`Debounce`.
+
+        :param function: function called with the value.
+        :type function: callable
+
+        :param delay: delay in milliseconds.
+        :type delay: int
+
+        :rtype: Debounce
+        """
+        call = Debounce(function, delay, self._parent)
+        self._calls.append(call)
+        return call
+
+    def flush(self, *args):
+        """Apply all the pending updates right away. This is connected to the
+        buttons, so that they always run with the latest values."""
+        for call in self._calls:
+            call.flush()
@@ -3,7 +3,6 @@ import os
 import shutil
 import sys
 import unittest
-from maya import cmds as mc
 
 
 class BaseTest(unittest.TestCase):
@@ -34,6 +33,8 @@ class BaseTest(unittest.TestCase):
         startup_maya_session()
 
     def setUp(self):
+        from maya import cmds as mc
+
         mc.file(newFile=True, force=True)
         self.sym_cube = mc.polyCube(name="sym_cube", constructionHistory=False)[0]
         self.other_cube = mc.polyCube(name="other_cube", constructionHistory=False)[0]
@@ -42,6 +43,8 @@ class BaseTest(unittest.TestCase):
         self.asym_threshold_cube = self.create_threshold_cube()
 
     def create_test_extract_cube(self):
+        from maya import cmds as mc
+
         test_extract_axes_cube = mc.polyCube(
             name="axes_cube", constructionHistory=False
         )[0]
@@ -52,6 +55,8 @@ class BaseTest(unittest.TestCase):
         return test_extract_axes_cube
 
     def create_asym_cube(self):
+        from maya import cmds as mc
+
         asym_cube = mc.polyCube(name="asym_cube", constructionHistory=False)[0]
         for vtx in [1, 3, 5, 7]:
             vtx_name = "{}.vtx[{}]".format(asym_cube, vtx)
@@ -59,6 +64,8 @@ class BaseTest(unittest.TestCase):
         return asym_cube
 
     def create_threshold_cube(self):
+        from maya import cmds as mc
+
         threshold_cube = mc.polyCube(
             name="asym_threshold_cube", constructionHistory=False
         )[0]
@@ -82,6 +89,8 @@ class BaseTest(unittest.TestCase):
         :return: vertices positions for the specified blendshape target.
         :rtype: list[tuple(int, int, int)]
         """
+        from maya import cmds as mc
+
         mc.setAttr("{}.{}_{}".format(blendshape, self.test_extract_axes_cube, axis), 1)
         result = [
             mc.pointPosition("{}.vtx[{}]".format(mesh, vtx), local=True)
@@ -0,0 +1,122 @@
+import unittest
+
+import numpy as np
+
+from sym_mesh.domain import backend, executor, selection, table
+from sym_mesh.domain.commands.deformation_commands import SymmetrizeCommand
+from sym_mesh.domain.commands.geometry_commands import ExtractAxesCommand
+
+CUBE = [
+    [-0.5, -0.5, 0.5],
+    [0.5, -0.5, 0.5],
+    [-0.5, 0.5, 0.5],
+    [0.5, 0.5, 0.5],
+    [-0.5, 0.5, -0.5],
+    [0.5, 0.5, -0.5],
+    [-0.5, -0.5, -0.5],
+    [0.5, -0.5, -0.5],
+]
+
+
+class TestMemoryBackend(unittest.TestCase):
+    def setUp(self):
+        self.backend = backend.MemoryBackend()
+        backend.set_backend(self.backend)
+        self.addCleanup(backend.set_backend, None)
+
+        self.sym_cube = self.backend.add_mesh("sym_cube", CUBE, (8, 12, 6, 24))
+        asym_positions = np.array(CUBE)
+        asym_positions[1] += [0.25, 0.1, 0.0]
+        self.asym_cube = self.backend.add_mesh(
+            "asym_cube", asym_positions, (8, 12, 6, 24), translation=(0.0, 1.0, 0.0)
+        )
+
+    def test_points_positions(self):
+        """Test that point positions are read and written in object and world space."""
+        positions = selection.get_points_positions(self.asym_cube, backend.WORLD_SPACE)
+        selection.set_points_positions(self.asym_cube, positions, backend.WORLD_SPACE)
+
+        np.testing.assert_allclose(positions[0], [-0.5, 0.5, 0.5])
+        np.testing.assert_allclose(
+            selection.get_points_positions(self.asym_cube)[0], [-0.5, -0.5, 0.5]
+        )
+
+    def test_symmetrize_undo_redo(self):
+        """Test that symmetrizing a mesh held in memory can be undone and redone."""
+        base_table = table.GeometryTable("sym_cube")
+        target_table = table.GeometryTable("asym_cube")
+        original = self.asym_cube.points.copy()
+        executor_ = executor.Executor()
+
+        executor_.execute(
+            SymmetrizeCommand, base_table=base_table, target_table=target_table
+        )
+        executor_.stash_command()
+        symmetrized = self.asym_cube.points.copy()
+        executor_.undo()
+        undone = self.asym_cube.points.copy()
+        executor_.redo()
+
+        self.assertTrue(base_table.non_mirrored_vertices.indices.size == 0)
+        np.testing.assert_allclose(symmetrized[1], [0.5, -0.5, 0.5])
+        np.testing.assert_allclose(undone, original)
+        np.testing.assert_allclose(self.asym_cube.points, symmetrized)
+
+    def test_stashed_command_is_released(self):
+        """Test that a stashed command only keeps the points it moved and
+        releases the geometry tables."""
+        base_table = table.GeometryTable("sym_cube")
+        target_table = table.GeometryTable("asym_cube")
+        original = self.asym_cube.points.copy()
+        executor_ = executor.Executor()
+
+        executor_.execute(
+            SymmetrizeCommand, base_table=base_table, target_table=target_table
+        )
+        executor_.stash_command()
+        command = executor_.undo_queue[-1]
+        executor_.undo()
+
+        self.assertIsNone(command.base_table)
+        self.assertIsNone(command.target_table)
+        self.assertIsNone(command.undo_action)
+        self.assertEqual(command.delta.indices.tolist(), [1])
+        np.testing.assert_array_equal(self.asym_cube.points, original)
+
+    def test_extract_axes(self):
+        """Test that extracting the axes of a mesh held in memory creates a
+        blendshape with one target per axis."""
+        base_table = table.GeometryTable("sym_cube")
+        target_table = table.GeometryTable("asym_cube")
+        executor_ = executor.Executor()
+
+        extracted_mesh, blendshape = executor_.execute(
+            ExtractAxesCommand, base_table=base_table, target_table=target_table
+        )
+
+        self.assertEqual(extracted_mesh, "asym_cube_extracted")
+        self.assertEqual(blendshape, "asym_cube_extracted_blendShape")
+        self.assertEqual(
+            sorted(self.backend.meshes),
+            ["asym_cube", "asym_cube_extracted", "sym_cube"],
+        )
+        targets = self.backend.blendshapes[blendshape]["targets"]
+        np.testing.assert_allclose(targets["asym_cube_x"][1], [0.75, -0.5, 0.5])
+        np.testing.assert_allclose(targets["asym_cube_y"][1], [0.5, -0.4, 0.5])
+        self.assertEqual(
+            self.backend.get_translation(self.backend.get_path(extracted_mesh)),
+            [0.0, 21.0, 0.0],
+        )
+
+        executor_.stash_command()
+        executor_.undo()
+        self.assertNotIn("asym_cube_extracted", self.backend.meshes)
+
+    def test_selection(self):
+        """Test that a vertex selection can be stored and selected again, its
+        indices being sorted."""
+        vertex_selection = selection.VertexSelection(from_list=(self.sym_cube, [3, 1]))
+
+        vertex_selection.select()
+
+        self.assertEqual(selection.VertexSelection().indices.tolist(), [1, 3])
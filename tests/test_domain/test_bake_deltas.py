@@ -1,8 +1,10 @@
 import logging
 
+import numpy as np
 from maya import cmds as mc
+from maya.api import OpenMaya as om2
 
-from sym_mesh.domain import executor, selection, table
+from sym_mesh.domain import dag_path, executor, selection, table
 from sym_mesh.domain.commands.deformation_commands import BakeDifferenceCommand
 from tests.fixtures import common
 
@@ -126,3 +128,53 @@ class TestBakeDeltas(common.BaseTest):
             for vtx in range(self.vtx_number)
         ]
         self.assertEqual(self.expected_asym_position, result)
+
+    def test_bake_delta_matches_point_arithmetic(self):
+        """Test that baking a percentage of the deltas on a vertex selection gives
+        the positions computed with the maya point arithmetic, up to the float32
+        precision of the mesh points."""
+        base = mc.polySphere(name="base_sphere", constructionHistory=False)[0]
+        target = mc.polySphere(name="target_sphere", constructionHistory=False)[0]
+        destination = mc.polySphere(name="dest_sphere", constructionHistory=False)[0]
+        vertex_count = mc.polyEvaluate(target, vertex=True)
+        for vtx in range(0, vertex_count, 3):
+            mc.xform(
+                "{}.vtx[{}]".format(target, vtx),
+                relative=True,
+                translation=[0.1 * (vtx % 7), 0.03, -0.01 * vtx],
+            )
+        selected = list(range(0, vertex_count, 2))
+        base_table = table.GeometryTable(base)
+        target_table = table.GeometryTable(target, lazy=True)
+        base_points, target_points, current_points = [
+            om2.MFnMesh(dag_path.create_MDagPath(mesh)).getPoints(om2.MSpace.kObject)
+            for mesh in (base, target, destination)
+        ]
+        expected = [
+            (
+                list(current_points[i] + (target_points[i] - base_points[i]) * 0.37)
+                if i in selected
+                else list(current_points[i])
+            )
+            for i in range(len(current_points))
+        ]
+
+        executor_ = executor.Executor()
+        executor_.execute(
+            BakeDifferenceCommand,
+            base_table=base_table,
+            target_table=target_table,
+            vertex_selection=selection.VertexSelection(
+                (dag_path.create_MDagPath(destination), selected)
+            ),
+            percentage=37,
+            target_dag_path=destination,
+        )
+
+        result = om2.MFnMesh(dag_path.create_MDagPath(destination)).getPoints(
+            om2.MSpace.kObject
+        )
+        # The mesh stores its points as float32, the expected points are doubles.
+        np.testing.assert_allclose(
+            [list(point) for point in result], expected, rtol=0.0, atol=1e-6
+        )
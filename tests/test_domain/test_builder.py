@@ -0,0 +1,51 @@
+import unittest
+
+import numpy as np
+
+from sym_mesh.domain import backend, builder, table
+
+
+class TestBackgroundBuild(unittest.TestCase):
+    def setUp(self):
+        self.backend = backend.MemoryBackend()
+        backend.set_backend(self.backend)
+        self.addCleanup(backend.set_backend, None)
+
+        positions = np.random.default_rng(0).normal(size=(5000, 3))
+        self.backend.add_mesh(
+            "base", np.concatenate((positions, positions * [-1.0, 1.0, 1.0]))
+        )
+
+    def test_background_build_matches_build(self):
+        """Test that a table built in a worker thread is the same as a table
+        built on initialization, and that the progress reaches the end."""
+        expected = table.GeometryTable("base", engine="nearest", axes=("x", "y"))
+
+        build = builder.BackgroundBuild(
+            table.GeometryTable("base", engine="nearest", axes=("x", "y"), lazy=True)
+        )
+        result = build.wait()
+
+        self.assertIs(result, build.table)
+        self.assertEqual(build.progress, 1.0)
+        np.testing.assert_array_equal(result.mirror_index, expected.mirror_index)
+        result.axis = "y"
+        expected.axis = "y"
+        np.testing.assert_array_equal(result.mirror_index, expected.mirror_index)
+
+    def test_cancelled_build(self):
+        """Test that a cancelled build has no result, and that a build stops
+        when its progress function raises."""
+        build = builder.BackgroundBuild(table.GeometryTable("base", lazy=True))
+        build.cancel()
+
+        self.assertIsNone(build.wait())
+        self.assertTrue(build.cancelled)
+
+        def cancel(fraction):
+            raise builder.BuildCancelled()
+
+        geo_table = table.GeometryTable("base", lazy=True)
+        with self.assertRaises(builder.BuildCancelled):
+            geo_table.build(progress=cancel)
+        self.assertFalse(geo_table.is_built)
@@ -71,6 +71,40 @@ class TestFlip(common.BaseTest):
 
         self.assertEqual(expected, result)
 
+    def test_flip_counterpart_of_selected_source(self):
+        """Test that flipping with a percentage and a selected source vertex also
+        flips its counterpart, and nothing else."""
+        geo_table = table.GeometryTable(self.asym_cube)
+        sym_table = table.GeometryTable(self.sym_cube)
+        mc.select("{}.vtx[0]".format(self.asym_cube))
+        vertex_selection = selection.VertexSelection()
+        executor_ = executor.Executor()
+        executor_.execute(
+            FlipCommand,
+            base_table=sym_table,
+            target_table=geo_table,
+            vertex_selection=vertex_selection,
+            percentage=50,
+        )
+
+        expected = [
+            [-0.5, 0.0, 0.5],
+            [0.5, 0.0, 0.5],
+            [-0.5, 0.5, 0.5],
+            [0.5, 1.5, 0.5],
+            [-0.5, 0.5, -0.5],
+            [0.5, 1.5, -0.5],
+            [-0.5, -0.5, -0.5],
+            [0.5, 0.5, -0.5],
+        ]
+
+        result = [
+            mc.pointPosition("{}.vtx[{}]".format(self.asym_cube, vtx), world=True)
+            for vtx in range(self.vtx_number)
+        ]
+
+        self.assertEqual(expected, result)
+
     def test_flip_y_positive_with_no_vertex_selection(self):
         """Test that flipping without a vertex selection works properly.
         Flipping on the Y axis positive direction for this test."""
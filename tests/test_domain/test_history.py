@@ -0,0 +1,153 @@
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from sym_mesh.domain import backend, executor, history, table
+from sym_mesh.domain.commands.deformation_commands import FlipCommand, SymmetrizeCommand
+
+
+class TestPointDelta(unittest.TestCase):
+    def setUp(self):
+        self.before = np.random.default_rng(0).normal(size=(100, 3))
+        self.after = self.before.copy()
+        self.after[[3, 50, 99]] += [0.1, 1e-12, -2.0]
+
+    def test_only_changed_rows_are_stored(self):
+        """Test that only the rows that changed are stored and restored exactly."""
+        delta = history.PointDelta.from_positions(self.before, self.after)
+
+        self.assertEqual(delta.indices.tolist(), [3, 50, 99])
+        np.testing.assert_array_equal(delta.undo(self.after.copy()), self.before)
+        np.testing.assert_array_equal(delta.redo(self.before.copy()), self.after)
+
+    def test_compressed_delta(self):
+        """Test that a compressed delta restores both states exactly."""
+        delta = history.PointDelta.from_positions(
+            self.before, self.after, compress=True
+        )
+        empty = history.PointDelta.from_positions(
+            self.before, self.before, compress=True
+        )
+
+        np.testing.assert_array_equal(delta.undo(self.after.copy()), self.before)
+        np.testing.assert_array_equal(delta.redo(self.before.copy()), self.after)
+        np.testing.assert_array_equal(empty.undo(self.after.copy()), self.after)
+        self.assertLess(empty.nbytes, 100)
+
+    def test_merged_delta(self):
+        """Test that a merged delta undoes and redoes both changes at once."""
+        later = self.after.copy()
+        later[[3, 10]] = self.before[[3, 10]] + [0.0, 0.0, 1.0]
+        delta = history.PointDelta.from_positions(self.before, self.after).merge(
+            history.PointDelta.from_positions(self.after, later)
+        )
+
+        self.assertEqual(delta.indices.tolist(), [3, 10, 50, 99])
+        np.testing.assert_array_equal(delta.undo(later.copy()), self.before)
+        np.testing.assert_array_equal(delta.redo(self.before.copy()), later)
+
+
+class TestHistoryBudget(unittest.TestCase):
+    def setUp(self):
+        self.backend = backend.MemoryBackend()
+        backend.set_backend(self.backend)
+        self.addCleanup(backend.set_backend, None)
+
+        positions = np.random.default_rng(0).normal(size=(500, 3))
+        positions = np.concatenate((positions, positions * [-1.0, 1.0, 1.0]))
+        self.backend.add_mesh("base", positions)
+        self.target = self.backend.add_mesh("target", positions + 0.01)
+        self.base_table = table.GeometryTable("base")
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, True)
+
+    def run_commands(self, executor_, count):
+        states = [self.target.points.copy()]
+        for index in range(count):
+            executor_.execute(
+                (SymmetrizeCommand, FlipCommand)[index % 2],
+                base_table=self.base_table,
+                target_table=table.GeometryTable("target", lazy=True),
+            )
+            executor_.stash_command()
+            states.append(self.target.points.copy())
+        return states
+
+    def test_oldest_entries_are_spilled(self):
+        """Test that the oldest entries are moved to disk once the history
+        exceeds its memory budget, and are still undone exactly."""
+        executor_ = executor.Executor(max_size=0, directory=self.directory)
+        states = self.run_commands(executor_, 3)
+
+        stats = executor_.get_history_stats()
+        for state in reversed(states[:-1]):
+            executor_.undo()
+            np.testing.assert_array_equal(self.target.points, state)
+
+        self.assertEqual(stats["memory"], 0)
+        self.assertGreater(stats["disk"], 0)
+        self.assertEqual(len(stats["entries"]), 3)
+
+    def test_oldest_entries_are_dropped(self):
+        """Test that the oldest entries are dropped once the history exceeds its
+        hard limit."""
+        executor_ = executor.Executor(hard_limit=0, directory=self.directory)
+        states = self.run_commands(executor_, 3)
+
+        executor_.undo()
+
+        self.assertEqual(len(executor_.undo_queue), 0)
+        np.testing.assert_array_equal(self.target.points, states[-2])
+
+    def test_consecutive_commands_are_coalesced(self):
+        """Test that consecutive live commands of the same type on the same
+        target are undone as a single entry, and are not merged across an
+        undo."""
+        executor_ = executor.Executor(directory=self.directory)
+        original = self.target.points.copy()
+        for percentage in (20, 50, 80):
+            executor_.execute(
+                SymmetrizeCommand,
+                base_table=self.base_table,
+                target_table=table.GeometryTable("target", lazy=True),
+                percentage=percentage,
+                live=True,
+            )
+            executor_.stash_command()
+        symmetrized = self.target.points.copy()
+
+        self.assertEqual(len(executor_.undo_queue), 1)
+        executor_.undo()
+        np.testing.assert_array_equal(self.target.points, original)
+        executor_.redo()
+        np.testing.assert_array_equal(self.target.points, symmetrized)
+
+        executor_.execute(
+            SymmetrizeCommand,
+            base_table=self.base_table,
+            target_table=table.GeometryTable("target", lazy=True),
+            live=True,
+        )
+        executor_.stash_command()
+        self.assertEqual(len(executor_.undo_queue), 2)
+
+    def test_button_commands_are_not_coalesced(self):
+        """Test that consecutive commands run with a fixed percentage, like the
+        buttons, stay separate entries of the undo history."""
+        executor_ = executor.Executor(directory=self.directory)
+        states = [self.target.points.copy()]
+        for _ in range(3):
+            executor_.execute(
+                FlipCommand,
+                base_table=self.base_table,
+                target_table=table.GeometryTable("target", lazy=True),
+            )
+            executor_.stash_command()
+            states.append(self.target.points.copy())
+
+        self.assertEqual(len(executor_.undo_queue), 3)
+        for state in reversed(states[:-1]):
+            executor_.undo()
+            np.testing.assert_array_equal(self.target.points, state)
@@ -0,0 +1,194 @@
+import unittest
+
+import numpy as np
+
+from sym_mesh.domain import matching
+
+
+class TestSpatialHashMatching(unittest.TestCase):
+    def test_match_symmetrical_points(self):
+        """Test that symmetrical points are matched from the negative to the positive side."""
+        positions = np.array(
+            [[-1.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [-2.0, 1.0, 0.0]]
+        )
+
+        targets, sources = matching.match_spatial_hash(positions, 0, 0.001, True)
+
+        self.assertEqual(targets.tolist(), [1, 2])
+        self.assertEqual(sources.tolist(), [0, 2])
+
+    def test_last_candidate_wins(self):
+        """Test that when several candidates are within the threshold, the last visited wins."""
+        positions = np.array([[-1.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.05, 0.0, 0.0]])
+
+        targets, sources = matching.match_spatial_hash(positions, 0, 0.1, False)
+
+        self.assertEqual(dict(zip(targets.tolist(), sources.tolist())), {0: 2})
+
+    def test_several_candidates_are_reported(self):
+        """Test that the vertices with several candidates within the threshold are
+        reported when requested."""
+        positions = np.array([[-1.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.05, 0.0, 0.0]])
+
+        _, _, ambiguous = matching.match_spatial_hash(
+            positions, 0, 0.1, False, return_ambiguous=True
+        )
+
+        self.assertEqual(ambiguous.tolist(), [True, False, False])
+
+    def test_parallel_match_is_identical(self):
+        """Test that matching chunks of vertices in parallel gives the serial result."""
+        positions = np.random.default_rng(0).uniform(-1.0, 1.0, (2000, 3))
+        grid = matching.SpatialGrid(positions, 0.1)
+        grid.chunk_size = lambda cell_count: 100
+
+        serial = matching.match_spatial_hash(positions, 0, 0.1, True, grid=grid)
+        parallel = matching.match_spatial_hash(
+            positions, 0, 0.1, True, grid=grid, workers=4
+        )
+
+        self.assertEqual(serial[0].tolist(), parallel[0].tolist())
+        self.assertEqual(serial[1].tolist(), parallel[1].tolist())
+
+
+class TestNearestMatching(unittest.TestCase):
+    def test_nearest_candidate_wins(self):
+        """Test that the closest candidate is matched, whatever the visiting order."""
+        positions = np.array([[-1.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.05, 0.0, 0.0]])
+
+        targets, sources, ambiguous = matching.match_nearest(positions, 0, 0.1, False)
+
+        self.assertEqual(dict(zip(targets.tolist(), sources.tolist())), {0: 1})
+        self.assertEqual(ambiguous.tolist(), [True, False, True])
+
+    def test_unambiguous_symmetrical_points(self):
+        """Test that perfectly symmetrical points are not flagged as ambiguous."""
+        positions = np.array([[-1.0, 0.5, 0.0], [1.0, 0.5, 0.0], [0.0, 1.0, 0.0]])
+
+        targets, sources, ambiguous = matching.match_nearest(positions, 0, 0.001, True)
+
+        self.assertEqual(targets.tolist(), [1, 2])
+        self.assertEqual(sources.tolist(), [0, 2])
+        self.assertFalse(ambiguous.any())
+
+    def test_nearest_mirrors_match_brute_force(self):
+        """Test that the shell search finds the same nearest candidates as a brute
+        force search, with a radius both smaller and larger than the vertex spacing."""
+        rng = np.random.default_rng(0)
+        half = rng.uniform(-1.0, 1.0, size=(300, 3))
+        positions = np.concatenate(
+            [half, half * [-1.0, 1.0, 1.0] + rng.normal(scale=0.01, size=half.shape)]
+        )
+        mirrored = matching.mirror(positions, 0)
+        distances = np.linalg.norm(mirrored[:, None] - positions[None], axis=-1)
+        expected = np.sort(distances, axis=1)
+
+        for radius in (0.02, 0.5):
+            candidates = matching.find_nearest_mirrors(positions, 0, radius)
+
+            found = expected[:, 0] < radius
+            self.assertEqual((candidates.nearest >= 0).tolist(), found.tolist())
+            np.testing.assert_allclose(candidates.distance[found], expected[found, 0])
+            np.testing.assert_array_equal(
+                candidates.nearest[found], distances[found].argmin(axis=1)
+            )
+            second = expected[:, 1] < radius
+            np.testing.assert_allclose(
+                candidates.second_distance[second], expected[second, 1]
+            )
+            self.assertTrue(np.isinf(candidates.second_distance[~second]).all())
+
+    def test_nearest_mirrors_ties(self):
+        """Test that the candidates at the same distance of a mirror position are
+        resolved in favour of the lowest vertex index, even when their squared
+        distances differ by a rounding error."""
+        rng = np.random.default_rng(0)
+        positions = rng.integers(-10, 11, size=(500, 3)) / 3.0 + 1.0 / 7.0
+        mirrored = matching.mirror(positions, 0)
+        delta = mirrored[:, None] - positions[None]
+        distances = np.sqrt(
+            delta[..., 0] * delta[..., 0]
+            + delta[..., 1] * delta[..., 1]
+            + delta[..., 2] * delta[..., 2]
+        )
+        distances[distances >= 1.5] = np.inf
+
+        candidates = matching.find_nearest_mirrors(positions, 0, 1.5)
+
+        found = np.isfinite(distances.min(axis=1))
+        expected = np.where(found, distances.argmin(axis=1), -1)
+        np.testing.assert_array_equal(candidates.nearest, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+class TestMirrorArrays(unittest.TestCase):
+    def test_mirror_arrays(self):
+        """Test that pairs are converted to a mirror index and roles, the target
+        role taking precedence for a vertex that is also a source."""
+        targets = np.array([1, 2, 3])
+        sources = np.array([0, 2, 2])
+
+        mirror_index, roles = matching.mirror_arrays(targets, sources, 5)
+
+        self.assertEqual(mirror_index.tolist(), [1, 0, 2, 2, -1])
+        self.assertEqual(
+            roles.tolist(),
+            [
+                matching.ROLE_SOURCE,
+                matching.ROLE_TARGET,
+                matching.ROLE_CENTER,
+                matching.ROLE_TARGET,
+                matching.ROLE_UNMATCHED,
+            ],
+        )
+        self.assertEqual(mirror_index.dtype, np.int32)
+
+    def test_mirror_pairs(self):
+        """Test that the pairs are rebuilt from the mirror index and roles."""
+        mirror_index, roles = matching.mirror_arrays([3, 1, 2], [2, 0, 2], 5)
+
+        targets, sources = matching.mirror_pairs(mirror_index, roles)
+
+        self.assertEqual(targets.tolist(), [1, 2, 3])
+        self.assertEqual(sources.tolist(), [0, 2, 2])
+
+    def test_flip_roles(self):
+        """Test that flipping the roles swaps the sources and targets only."""
+        roles = np.array(
+            [
+                matching.ROLE_SOURCE,
+                matching.ROLE_TARGET,
+                matching.ROLE_CENTER,
+                matching.ROLE_UNMATCHED,
+            ],
+            dtype=np.int8,
+        )
+
+        flipped = matching.flip_roles(roles)
+
+        self.assertEqual(
+            flipped.tolist(),
+            [
+                matching.ROLE_TARGET,
+                matching.ROLE_SOURCE,
+                matching.ROLE_CENTER,
+                matching.ROLE_UNMATCHED,
+            ],
+        )
+
+    def test_mirror_errors(self):
+        """Test that the mirror error is the distance between the mirror position
+        of a vertex and its mirror, or the fallback error without a mirror."""
+        positions = np.array([[-1.0, 0.0, 0.0], [1.5, 0.0, 0.0], [2.0, 1.0, 0.0]])
+        mirror_index = np.array([1, 0, -1], dtype=np.int32)
+
+        errors = matching.mirror_errors(positions, 0, mirror_index)
+        fallback = matching.mirror_errors(
+            positions, 0, mirror_index, np.array([0.0, 0.0, 3.0])
+        )
+
+        self.assertEqual(errors.tolist(), [0.5, 0.5, np.inf])
+        self.assertEqual(fallback.tolist(), [0.5, 0.5, 3.0])
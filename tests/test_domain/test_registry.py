@@ -0,0 +1,139 @@
+import unittest
+
+import numpy as np
+
+from sym_mesh.domain import backend, registry, selection, table
+
+CUBE = [
+    [-0.5, -0.5, 0.5],
+    [0.5, -0.5, 0.5],
+    [-0.5, 0.5, 0.5],
+    [0.5, 0.5, 0.5],
+    [-0.5, 0.5, -0.5],
+    [0.5, 0.5, -0.5],
+    [-0.5, -0.5, -0.5],
+    [0.5, -0.5, -0.5],
+]
+
+
+class TestTableRegistry(unittest.TestCase):
+    def setUp(self):
+        self.backend = backend.MemoryBackend()
+        backend.set_backend(self.backend)
+        self.addCleanup(backend.set_backend, None)
+
+        self.sym_cube = self.backend.add_mesh("sym_cube", CUBE)
+        self.other_cube = self.backend.add_mesh("other_cube", CUBE)
+        self.registry = registry.TableRegistry()
+
+    def test_table_is_reused(self):
+        """Test that the table of an unchanged mesh is reused with new settings."""
+        geo_table = self.registry.get("sym_cube")
+
+        reused_table = self.registry.get("sym_cube", direction="negative")
+
+        self.assertIs(reused_table, geo_table)
+        self.assertEqual(reused_table.direction, "negative")
+        self.assertEqual((self.registry.hits, self.registry.misses), (1, 1))
+
+    def test_changed_mesh_is_read_again(self):
+        """Test that a new table is built once the points of the mesh changed."""
+        geo_table = self.registry.get("sym_cube", lazy=True)
+        positions = np.array(CUBE)
+        positions[1] += [0.25, 0.1, 0.0]
+
+        selection.set_points_positions(self.sym_cube, positions)
+        new_table = self.registry.get("sym_cube", lazy=True)
+
+        self.assertIsNot(new_table, geo_table)
+        np.testing.assert_allclose(new_table.point_array, positions)
+        self.assertEqual(len(self.registry), 1)
+
+    def test_table_is_rebuilt_beyond_search_radius(self):
+        """Test that a table is only reused with a new threshold when its mirror
+        candidates can be filtered for it."""
+        geo_table = self.registry.get("sym_cube", engine="nearest", max_radius=0.1)
+
+        filtered_table = self.registry.lookup(
+            "sym_cube", threshold=0.05, engine="nearest", max_radius=0.1
+        )
+        rebuilt_table = self.registry.lookup(
+            "sym_cube", threshold=0.5, engine="nearest", max_radius=0.1
+        )
+
+        self.assertIs(filtered_table, geo_table)
+        self.assertEqual(filtered_table.threshold, 0.05)
+        self.assertIsNone(rebuilt_table)
+        self.assertEqual((self.registry.hits, self.registry.misses), (1, 2))
+
+    def test_table_follows_renamed_mesh(self):
+        """Test that tables are registered by mesh node: the table of a renamed
+        mesh is found under its new name, and a new mesh created with the old
+        name gets its own table."""
+        geo_table = self.registry.get("sym_cube", lazy=True)
+
+        self.backend.rename(self.sym_cube, "renamed_cube")
+        new_cube = self.backend.add_mesh("sym_cube", np.array(CUBE) * 2.0)
+
+        self.assertIs(self.registry.get("renamed_cube", lazy=True), geo_table)
+        new_table = self.registry.get("sym_cube", lazy=True)
+        self.assertIsNot(new_table, geo_table)
+        self.assertIs(new_table.dag_path, new_cube)
+        self.assertEqual(len(self.registry), 2)
+
+    def test_clear_removes_callbacks(self):
+        """Test that clearing the registry drops its tables and removes the
+        change callbacks of their meshes."""
+        self.registry.get("sym_cube")
+        self.registry.get("other_cube", lazy=True)
+
+        self.registry.clear()
+
+        self.assertEqual(len(self.registry), 0)
+        self.assertEqual(self.sym_cube.callbacks, {})
+        self.assertEqual(self.other_cube.callbacks, {})
+
+    def test_least_recently_used_table_is_dropped(self):
+        """Test that the least recently used table is dropped once the registry
+        exceeds its memory budget."""
+        geo_table = self.registry.get("sym_cube")
+        self.registry.max_size = geo_table.nbytes
+
+        self.registry.get("other_cube")
+        new_table = self.registry.get("sym_cube")
+
+        self.assertIsNot(new_table, geo_table)
+        self.assertEqual(len(self.registry), 1)
+        self.assertEqual(len(self.sym_cube.callbacks), 1)
+        self.assertEqual(self.other_cube.callbacks, {})
+
+    def test_same_topology_shares_mirror_map(self):
+        """Test that the table of a mesh with the same topology as a registered
+        mesh shares its symmetry table instead of building its own."""
+        positions = np.array(CUBE)
+        positions[1] += [0.25, 0.1, 0.0]
+        selection.set_points_positions(self.other_cube, positions)
+        base_table = self.registry.get("sym_cube")
+
+        target_table = self.registry.get("other_cube", lazy=True)
+
+        self.assertIs(target_table.mirror_index, base_table.mirror_index)
+        self.assertEqual(target_table.symmetry_table, {1: 0, 3: 2, 5: 4, 7: 6})
+        self.assertIs(target_table.non_mirrored_vertices.dag_path, self.other_cube)
+
+    def test_same_topology_base_is_built(self):
+        """Test that a table built on initialization matches its own vertices
+        rather than sharing the symmetry table of an asymmetrical mesh with the
+        same topology."""
+        positions = np.array(CUBE)
+        positions[1] += [0.25, 0.1, 0.0]
+        selection.set_points_positions(self.other_cube, positions)
+        asym_table = self.registry.get("other_cube", engine="nearest")
+        self.assertEqual(list(asym_table.non_mirrored_vertices.indices), [0, 1])
+
+        sym_table = self.registry.get("sym_cube", engine="nearest")
+
+        expected = table.GeometryTable("sym_cube", engine="nearest")
+        self.assertIsNot(sym_table.mirror_index, asym_table.mirror_index)
+        self.assertEqual(list(sym_table.non_mirrored_vertices.indices), [])
+        np.testing.assert_array_equal(sym_table.mirror_index, expected.mirror_index)
@@ -0,0 +1,51 @@
+import unittest
+
+import numpy as np
+
+from sym_mesh.domain import matching
+from sym_mesh.domain import report
+
+
+class TestSymmetryReport(unittest.TestCase):
+    def setUp(self):
+        self.errors = np.array([0.0, 0.0, 0.002, 0.001, 0.0, np.inf, 0.3])
+        self.roles = np.array(
+            [
+                matching.ROLE_SOURCE,
+                matching.ROLE_TARGET,
+                matching.ROLE_SOURCE,
+                matching.ROLE_TARGET,
+                matching.ROLE_CENTER,
+                matching.ROLE_UNMATCHED,
+                matching.ROLE_UNMATCHED,
+            ],
+            dtype=np.int8,
+        )
+
+    def test_report(self):
+        """Test that the report counts the roles and lists the worst offenders."""
+        symmetry_report = report.SymmetryReport(
+            self.errors, self.roles, 0.01, several=[2], bins=4, worst_count=3
+        )
+
+        self.assertEqual(symmetry_report.vertex_count, 7)
+        self.assertEqual(symmetry_report.source_count, 2)
+        self.assertEqual(symmetry_report.target_count, 2)
+        self.assertEqual(symmetry_report.center_count, 1)
+        self.assertEqual(symmetry_report.unmatched_count, 2)
+        self.assertFalse(symmetry_report.is_symmetrical)
+        self.assertEqual(symmetry_report.max_error, 0.002)
+        self.assertEqual(symmetry_report.worst_offenders.tolist(), [5, 6, 2])
+        self.assertEqual(symmetry_report.histogram[0].tolist(), [5, 0, 0, 1])
+        self.assertEqual(symmetry_report.as_dict()["several_candidates"], 1)
+
+    def test_flipped_report(self):
+        """Test that the report of the flipped table swaps the sources and targets."""
+        symmetry_report = report.SymmetryReport(self.errors, self.roles, 0.01)
+        self.roles[0] = matching.ROLE_TARGET
+
+        flipped = symmetry_report.flipped(self.roles)
+
+        self.assertEqual(flipped.source_count, 1)
+        self.assertEqual(flipped.target_count, 3)
+        self.assertIs(flipped.errors, symmetry_report.errors)
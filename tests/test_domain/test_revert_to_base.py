@@ -122,3 +122,35 @@ class TestRevertToBase(common.BaseTest):
         ]
 
         self.assertEqual(self.expected_sym_position, result)
+
+    def test_revert_to_base_percentage_changes(self):
+        """Test that changing the percentage of an active command, like when
+        dragging the slider, updates the mesh from the same starting positions."""
+        geo_table = table.GeometryTable(self.asym_cube)
+        sym_table = table.GeometryTable(self.sym_cube)
+        executor_ = executor.Executor()
+        executor_.execute(
+            RevertToBaseCommand,
+            base_table=sym_table,
+            target_table=geo_table,
+            percentage=0,
+        )
+
+        for percentage in (100, 20, 50):
+            executor_.command.percentage = percentage
+
+        expected = [
+            [-0.5, -0.5, 0.5],
+            [0.5, 0.0, 0.5],
+            [-0.5, 0.5, 0.5],
+            [0.5, 1.0, 0.5],
+            [-0.5, 0.5, -0.5],
+            [0.5, 1.0, -0.5],
+            [-0.5, -0.5, -0.5],
+            [0.5, 0.0, -0.5],
+        ]
+        result = [
+            mc.pointPosition("{}.vtx[{}]".format(self.asym_cube, vtx), world=True)
+            for vtx in range(self.vtx_number)
+        ]
+        self.assertEqual(expected, result)
@@ -1,7 +1,9 @@
 import logging
 from maya import cmds as mc
+from maya.api import OpenMaya as om2
+import numpy as np
 
-from sym_mesh.domain import selection
+from sym_mesh.domain import dag_path, selection
 from tests.fixtures import common
 
 log = logging.getLogger(__name__)
@@ -54,3 +56,51 @@ class TestVertexSelection(common.BaseTest):
         expected = to_select
 
         self.assertEqual(expected, result)
+
+
+class TestPointsPositions(common.BaseTest):
+    def test_get_points_positions(self):
+        """Test that the points positions are read as an array matching the point
+        array of the mesh, in object and world space."""
+        mc.xform(self.asym_cube, translation=(1, 2, 3))
+        mesh_dag_path = dag_path.create_MDagPath(self.asym_cube)
+
+        for space in (om2.MSpace.kObject, om2.MSpace.kWorld):
+            positions = selection.get_points_positions(mesh_dag_path, space)
+
+            point_array = om2.MFnMesh(mesh_dag_path).getPoints(space)
+            expected = [list(point)[:3] for point in point_array]
+            self.assertEqual(positions.shape, (self.vtx_number, 3))
+            self.assertEqual(positions.dtype, np.float64)
+            self.assertEqual(positions.tolist(), expected)
+
+    def test_get_points_positions_as_float32(self):
+        """Test that the points positions can be read as float32."""
+        mesh_dag_path = dag_path.create_MDagPath(self.asym_cube)
+
+        positions = selection.get_points_positions(
+            mesh_dag_path, om2.MSpace.kObject, dtype=np.float32
+        )
+
+        self.assertEqual(positions.dtype, np.float32)
+        self.assertEqual(
+            positions.tolist(),
+            [position[:3] for position in self.expected_asym_position],
+        )
+
+    def test_set_points_positions(self):
+        """Test that the points positions written from an array are applied to the
+        mesh and that the conversion copies are recorded."""
+        mesh_dag_path = dag_path.create_MDagPath(self.sym_cube)
+        positions = np.array(self.expected_asym_position)
+        selection.copy_stats.reset()
+
+        selection.set_points_positions(mesh_dag_path, positions, om2.MSpace.kObject)
+
+        result = [
+            mc.pointPosition("{}.vtx[{}]".format(self.sym_cube, vtx), world=True)
+            for vtx in range(self.vtx_number)
+        ]
+        self.assertEqual(self.expected_asym_position, result)
+        self.assertEqual(selection.copy_stats.count, 1)
+        self.assertEqual(selection.copy_stats.nbytes, positions.nbytes)
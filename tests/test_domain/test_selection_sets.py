@@ -0,0 +1,50 @@
+import unittest
+
+import numpy as np
+
+from sym_mesh.domain import backend, selection, table
+
+
+class TestVertexSelectionSets(unittest.TestCase):
+    def setUp(self):
+        self.backend = backend.MemoryBackend()
+        backend.set_backend(self.backend)
+        self.addCleanup(backend.set_backend, None)
+
+        self.mesh = self.backend.add_mesh(
+            "mesh",
+            [[-1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [1.0, 0.0, 0.0], [2.0, 0.0, 0.0]],
+        )
+        self.first = selection.VertexSelection((self.mesh, [2, 0, 2]), vertex_count=70)
+        self.second = selection.VertexSelection((self.mesh, [2, 65]))
+
+    def test_indices_are_sorted_and_unique(self):
+        """Test that the indices of a selection are sorted without duplicates."""
+        self.assertEqual(self.first.indices.tolist(), [0, 2])
+        self.assertEqual(self.first.indices.dtype, np.int32)
+        self.assertIn(2, self.first)
+        self.assertNotIn(1, self.first)
+
+    def test_set_operations(self):
+        """Test the union, intersection, difference and inversion of selections."""
+        self.assertEqual((self.first | self.second).indices.tolist(), [0, 2, 65])
+        self.assertEqual((self.first & self.second).indices.tolist(), [2])
+        self.assertEqual((self.first - self.second).indices.tolist(), [0])
+        inverted = ~self.first
+        self.assertEqual(len(inverted), 68)
+        self.assertNotIn(0, inverted)
+        self.assertIn(69, inverted)
+        self.assertEqual(len(~inverted), 2)
+        with self.assertRaises(ValueError):
+            ~self.second
+
+    def test_mirrored_selection(self):
+        """Test that a selection is mapped through the symmetry table, without
+        the non-mirrored vertices."""
+        geo_table = table.GeometryTable("mesh")
+        vertex_selection = selection.VertexSelection((self.mesh, [0, 1, 3]))
+
+        mirrored = vertex_selection.mirrored(geo_table)
+
+        self.assertEqual(mirrored.indices.tolist(), [1, 2])
+        self.assertIs(mirrored.dag_path, self.mesh)
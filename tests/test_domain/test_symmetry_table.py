@@ -1,8 +1,14 @@
 import logging
+import shutil
+import tempfile
+
+from maya import cmds as mc
 
 from tests.fixtures import common
 
+from sym_mesh.domain import matching
 from sym_mesh.domain import table
+from sym_mesh.domain import table_cache
 
 log = logging.getLogger(__name__)
 
@@ -112,6 +118,238 @@ class TestGeometryTable(common.BaseTest):
             expected_non_mirrored_vertices_indices,
         )
 
+    def test_geometry_table_threshold_filtered(self):
+        """Test that changing the threshold within the search radius of the nearest
+        engine filters the stored candidates into the same table as a rebuild."""
+        geo_table = table.GeometryTable(
+            self.asym_threshold_cube, engine="nearest", max_radius=0.5
+        )
+        self.assertEqual(geo_table.symmetry_table, {})
+        mirror_index = geo_table.mirror_index
+        self.assertTrue(geo_table.can_filter(0.2))
+        self.assertFalse(geo_table.can_filter(0.6))
+
+        geo_table.threshold = 0.2
+
+        self.assertEqual(geo_table.symmetry_table, {1: 0, 3: 2, 5: 4, 7: 6})
+        self.assertEqual(list(geo_table.non_mirrored_vertices.indices), [])
+        self.assertIsNot(geo_table.mirror_index, mirror_index)
+
+    def test_geometry_table_report(self):
+        """Test that the symmetry report lists the non-mirrored vertices as the
+        worst offenders."""
+        geo_table = table.GeometryTable(self.asym_cube)
+
+        symmetry_report = geo_table.report
+
+        self.assertEqual(symmetry_report.source_count, 2)
+        self.assertEqual(symmetry_report.target_count, 2)
+        self.assertEqual(symmetry_report.unmatched_count, 4)
+        self.assertEqual(sorted(symmetry_report.worst_offenders[:4]), [0, 3, 5, 6])
+
+    def test_geometry_table_spatial_hash_engine(self):
+        """Test that the reference spatial hash engine produces the right symmetry table."""
+        geo_table = table.GeometryTable(self.asym_cube, engine="spatial_hash")
+
+        expected_sym_table = {1: 2, 7: 4}
+        expected_non_mirrored_vertices_indices = [0, 3, 5, 6]
+        self.assertEqual(geo_table.engine, "spatial_hash")
+        self.assertEqual(geo_table.symmetry_table, expected_sym_table)
+        self.assertEqual(
+            list(geo_table.non_mirrored_vertices.indices),
+            expected_non_mirrored_vertices_indices,
+        )
+
+    def test_geometry_table_engines_match(self):
+        """Test that the vectorized engine produces exactly the same symmetry table as
+        the spatial hash engine, including on vertices with several candidates."""
+        sphere = mc.polySphere(
+            subdivisionsAxis=40, subdivisionsHeight=30, constructionHistory=False
+        )[0]
+        for vtx in range(0, 1100, 7):
+            vtx_name = "{}.vtx[{}]".format(sphere, vtx)
+            mc.xform(vtx_name, relative=True, translation=[0.004, -0.003, 0.002])
+
+        for axis in ("x", "y", "z"):
+            for direction in ("positive", "negative"):
+                for threshold in (0.001, 0.01, 0.1):
+                    reference = table.GeometryTable(
+                        sphere,
+                        axis=axis,
+                        direction=direction,
+                        threshold=threshold,
+                        engine="spatial_hash",
+                    )
+                    vectorized = table.GeometryTable(
+                        sphere,
+                        axis=axis,
+                        direction=direction,
+                        threshold=threshold,
+                        engine="vectorized",
+                    )
+                    self.assertEqual(
+                        reference.symmetry_table, vectorized.symmetry_table
+                    )
+                    self.assertEqual(
+                        list(reference.non_mirrored_vertices.indices),
+                        list(vectorized.non_mirrored_vertices.indices),
+                    )
+
+    def test_geometry_table_nearest_engine(self):
+        """Test that the nearest engine produces the right symmetry table and reports
+        no ambiguous vertices on a mesh with unique mirror candidates."""
+        geo_table = table.GeometryTable(self.asym_cube, engine="nearest")
+
+        expected_sym_table = {1: 2, 7: 4}
+        expected_non_mirrored_vertices_indices = [0, 3, 5, 6]
+        self.assertEqual(geo_table.symmetry_table, expected_sym_table)
+        self.assertEqual(
+            list(geo_table.non_mirrored_vertices.indices),
+            expected_non_mirrored_vertices_indices,
+        )
+        self.assertEqual(list(geo_table.ambiguous_vertices.indices), [])
+
+    def test_geometry_table_nearest_engine_ambiguous_vertices(self):
+        """Test that the nearest engine flags vertices with several candidates
+        within the threshold."""
+        geo_table = table.GeometryTable(
+            self.sym_cube, axis="x", threshold=1.5, engine="nearest"
+        )
+
+        expected_sym_table = {1: 0, 3: 2, 5: 4, 7: 6}
+        self.assertEqual(geo_table.symmetry_table, expected_sym_table)
+        self.assertEqual(
+            list(geo_table.ambiguous_vertices.indices), list(range(self.vtx_number))
+        )
+
+    def test_geometry_table_unknown_engine(self):
+        """Test that requesting an unknown engine raises an error."""
+        with self.assertRaises(ValueError):
+            table.GeometryTable(self.sym_cube, engine="unknown")
+
+    def test_geometry_table_mirror_index(self):
+        """Test that the array-backed symmetry table matches the symmetry table dict."""
+        geo_table = table.GeometryTable(self.asym_cube)
+
+        expected_mirror_index = [-1, 2, 1, -1, 7, -1, -1, 4]
+        unmatched, source, target = (
+            matching.ROLE_UNMATCHED,
+            matching.ROLE_SOURCE,
+            matching.ROLE_TARGET,
+        )
+        expected_roles = [
+            unmatched,
+            target,
+            source,
+            unmatched,
+            source,
+            unmatched,
+            unmatched,
+            target,
+        ]
+        self.assertEqual(geo_table.mirror_index.tolist(), expected_mirror_index)
+        self.assertEqual(geo_table.roles.tolist(), expected_roles)
+        targets, sources = geo_table.symmetry_pairs
+        self.assertEqual(
+            dict(zip(targets.tolist(), sources.tolist())), geo_table.symmetry_table
+        )
+
+    def test_lazy_geometry_table(self):
+        """Test that a lazy geometry table only builds its symmetry table the first
+        time it is requested."""
+        geo_table = table.GeometryTable(self.asym_cube, lazy=True)
+
+        self.assertFalse(geo_table.is_built)
+        self.assertEqual(len(geo_table.point_array), self.vtx_number)
+
+        expected_non_mirrored_vertices_indices = [0, 3, 5, 6]
+        self.assertEqual(
+            list(geo_table.non_mirrored_vertices.indices),
+            expected_non_mirrored_vertices_indices,
+        )
+        self.assertTrue(geo_table.is_built)
+        self.assertEqual(geo_table.symmetry_table, {1: 2, 7: 4})
+
+    def test_multi_axis_geometry_table(self):
+        """Test that a table built for several axes matches the single axis tables
+        and switches axis without rebuilding anything."""
+        geo_table = table.GeometryTable(self.sym_cube, axis="x", axes=("x", "y", "z"))
+        mirror_arrays = {
+            axis: table.GeometryTable(self.sym_cube, axis=axis).mirror_index
+            for axis in ("x", "y", "z")
+        }
+        x_mirror_index = geo_table.mirror_index
+
+        for axis in ("y", "z", "x"):
+            geo_table.axis = axis
+            self.assertEqual(
+                geo_table.mirror_index.tolist(), mirror_arrays[axis].tolist()
+            )
+        self.assertEqual(geo_table.axis, 0)
+        self.assertIs(geo_table.mirror_index, x_mirror_index)
+
+    def test_geometry_table_unknown_axis(self):
+        """Test that requesting an unknown axis raises an error."""
+        geo_table = table.GeometryTable(self.sym_cube)
+
+        with self.assertRaises(ValueError):
+            geo_table.axis = "w"
+
+    def test_geometry_table_direction_flip(self):
+        """Test that flipping the direction swaps the sources and targets without
+        rebuilding the table, and that flipping it back restores the table."""
+        geo_table = table.GeometryTable(self.sym_cube, axis="x")
+        mirror_index = geo_table.mirror_index
+
+        geo_table.direction = "negative"
+
+        self.assertEqual(geo_table.symmetry_table, {0: 1, 2: 3, 4: 5, 6: 7})
+        self.assertIs(geo_table.mirror_index, mirror_index)
+
+        geo_table.direction = "positive"
+
+        self.assertEqual(geo_table.symmetry_table, {1: 0, 3: 2, 5: 4, 7: 6})
+
+    def test_geometry_table_unknown_direction(self):
+        """Test that requesting an unknown direction raises an error."""
+        with self.assertRaises(ValueError):
+            table.GeometryTable(self.sym_cube, direction="up")
+
+    def test_geometry_table_loaded_from_cache(self):
+        """Test that a symmetry table saved in the cache is loaded for the same mesh
+        and settings instead of being rebuilt."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        cache = table_cache.TableCache(directory)
+        built = table.GeometryTable(self.asym_cube, cache=cache)
+
+        with self.assertLogs(table.log, logging.INFO) as captured:
+            cached = table.GeometryTable(self.asym_cube, cache=cache)
+
+        self.assertEqual(len(cache.entries()), 1)
+        self.assertIn("from the cache", captured.output[1])
+        self.assertEqual(cached.symmetry_table, built.symmetry_table)
+        self.assertEqual(
+            list(cached.non_mirrored_vertices.indices),
+            list(built.non_mirrored_vertices.indices),
+        )
+
+    def test_geometry_table_cache_missed_on_modified_mesh(self):
+        """Test that a modified mesh does not load the symmetry table of its
+        previous shape from the cache."""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        cache = table_cache.TableCache(directory)
+        table.GeometryTable(self.sym_cube, cache=cache)
+        mc.xform(
+            "{}.vtx[0]".format(self.sym_cube), translation=(0, 0, 1), relative=True
+        )
+
+        geo_table = table.GeometryTable(self.sym_cube, cache=cache)
+
+        self.assertEqual(len(cache.entries()), 2)
+        self.assertEqual(list(geo_table.non_mirrored_vertices.indices), [0, 1])
+
     # def test_timing_symmetry_table(self):
     #     import time
     #     from maya import cmds as mc
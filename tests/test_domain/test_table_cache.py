@@ -0,0 +1,229 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from sym_mesh.domain import backend, matching, table, table_cache
+
+
+class TestTableCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.positions = np.array([[-1.0, 0.0, 0.0], [1.0, 0.0, 0.0]])
+        self.fingerprint = table_cache.fingerprint(self.positions, (2, 0, 0, 0))
+
+    def get_key(self, **settings):
+        parameters = dict(
+            axis="x", direction="positive", threshold=0.001, space=4, engine="nearest"
+        )
+        parameters.update(settings)
+        return table_cache.TableCache.key(self.fingerprint, **parameters)
+
+    def set_age(self, cache, key, age):
+        os.utime(cache.path(key), (age, age))
+
+    def test_save_and_load(self):
+        """Test that a saved symmetry table is loaded back unchanged."""
+        cache = table_cache.TableCache(self.directory)
+        key = self.get_key()
+
+        cache.save(key, [1, 3], [0, 2], [4], [5, 6])
+        cached = cache.load(key)
+
+        self.assertEqual(cached.targets.tolist(), [1, 3])
+        self.assertEqual(cached.sources.tolist(), [0, 2])
+        self.assertEqual(cached.non_mirrored.tolist(), [4])
+        self.assertEqual(cached.ambiguous.tolist(), [5, 6])
+        self.assertEqual(cached.targets.dtype, np.int32)
+        self.assertIsNone(cached.several)
+        self.assertIsNone(cached.candidates)
+
+    def test_save_and_load_candidates(self):
+        """Test that the vertices with several candidates and the mirror
+        candidates of a table are loaded back unchanged."""
+        cache = table_cache.TableCache(self.directory)
+        key = self.get_key()
+        candidates = matching.MirrorCandidates(
+            np.array([1, -1]), np.array([0.5, np.inf]), np.array([0.75, np.inf])
+        )
+
+        cache.save(key, [1], [0], [], [], several=[0], candidates=candidates)
+        cached = cache.load(key)
+
+        self.assertEqual(cached.several.tolist(), [0])
+        for loaded, saved in zip(cached.candidates, candidates):
+            np.testing.assert_array_equal(loaded, saved)
+
+    def test_failed_save_leaves_no_file(self):
+        """Test that a table that cannot be written leaves no temporary file in
+        the cache directory."""
+        cache = table_cache.TableCache(self.directory)
+        key = self.get_key()
+        # A directory in place of the table makes the final rename fail.
+        os.makedirs(os.path.join(cache.path(key), "blocker"))
+
+        cache.save(key, [1, 3], [0, 2], [4])
+
+        self.assertEqual(
+            os.listdir(self.directory), [os.path.basename(cache.path(key))]
+        )
+
+    def test_load_missing_table(self):
+        """Test that loading a table that was never saved returns None."""
+        cache = table_cache.TableCache(self.directory)
+
+        self.assertIsNone(cache.load(self.get_key()))
+
+    def test_key_depends_on_mesh_and_settings(self):
+        """Test that modifying the mesh or any setting produces a different key."""
+        key = self.get_key()
+        moved = self.positions + [0.0, 1e-9, 0.0]
+
+        self.assertEqual(key, self.get_key())
+        self.assertNotEqual(
+            table_cache.fingerprint(self.positions, (2, 0, 0, 0)),
+            table_cache.fingerprint(moved, (2, 0, 0, 0)),
+        )
+        self.assertNotEqual(
+            table_cache.fingerprint(self.positions, (2, 0, 0, 0)),
+            table_cache.fingerprint(self.positions, (2, 1, 0, 0)),
+        )
+        for setting, value in (
+            ("axis", "y"),
+            ("direction", "negative"),
+            ("threshold", 0.01),
+            ("space", 2),
+            ("engine", "vectorized"),
+            ("radius", 0.1),
+        ):
+            self.assertNotEqual(key, self.get_key(**{setting: value}))
+
+    def test_topology_fingerprint(self):
+        """Test that the topology fingerprint only depends on the connectivity."""
+        fingerprint = table_cache.topology_fingerprint(4, [3, 3], [0, 1, 2, 2, 1, 3])
+
+        self.assertEqual(
+            fingerprint, table_cache.topology_fingerprint(4, [3, 3], [0, 1, 2, 2, 1, 3])
+        )
+        self.assertNotEqual(
+            fingerprint, table_cache.topology_fingerprint(4, [3, 3], [0, 1, 2, 1, 2, 3])
+        )
+        self.assertNotEqual(
+            fingerprint, table_cache.topology_fingerprint(4, [4, 2], [0, 1, 2, 2, 1, 3])
+        )
+
+    def test_lru_eviction(self):
+        """Test that the least recently used table is evicted when the cache is full."""
+        cache = table_cache.TableCache(self.directory)
+        first, second, third = [self.get_key(threshold=value) for value in (1, 2, 3)]
+        cache.save(first, [1], [0], [])
+        self.set_age(cache, first, 1000)
+        cache.save(second, [1], [0], [])
+        self.set_age(cache, second, 2000)
+        cache.load(first)
+        cache.max_size = cache.size()
+
+        cache.save(third, [1], [0], [])
+
+        self.assertIsNotNone(cache.load(first))
+        self.assertIsNone(cache.load(second))
+        self.assertIsNotNone(cache.load(third))
+
+    def test_fifo_eviction(self):
+        """Test that the oldest table is evicted when the cache is full, even if it
+        was recently loaded."""
+        cache = table_cache.TableCache(self.directory, eviction="fifo")
+        first, second, third = [self.get_key(threshold=value) for value in (1, 2, 3)]
+        cache.save(first, [1], [0], [])
+        self.set_age(cache, first, 1000)
+        cache.save(second, [1], [0], [])
+        self.set_age(cache, second, 2000)
+        cache.load(first)
+        cache.max_size = cache.size()
+
+        cache.save(third, [1], [0], [])
+
+        self.assertIsNone(cache.load(first))
+        self.assertIsNotNone(cache.load(second))
+        self.assertIsNotNone(cache.load(third))
+
+    def test_clear(self):
+        """Test that clearing the cache deletes every table."""
+        cache = table_cache.TableCache(self.directory)
+        cache.save(self.get_key(), [1], [0], [])
+
+        cache.clear()
+
+        self.assertEqual(cache.size(), 0)
+
+    def test_unknown_eviction_policy(self):
+        """Test that requesting an unknown eviction policy raises an error."""
+        with self.assertRaises(ValueError):
+            table_cache.TableCache(self.directory, eviction="unknown")
+
+
+class TestCachedGeometryTable(unittest.TestCase):
+    def setUp(self):
+        self.backend = backend.MemoryBackend()
+        backend.set_backend(self.backend)
+        self.addCleanup(backend.set_backend, None)
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+        rng = np.random.default_rng(0)
+        positions = rng.uniform(0.1, 1.0, size=(500, 3))
+        positions = np.concatenate((positions, positions * [-1.0, 1.0, 1.0]))
+        # Some vertices move away from their mirror, and some pairs get a
+        # second candidate close to their mirror position.
+        positions[:40] += rng.normal(scale=0.02, size=(40, 3))
+        positions = np.concatenate(
+            (positions, positions[450:500] * [-1.0, 1.0, 1.0] + 0.002)
+        )
+        self.backend.add_mesh("mesh", positions)
+
+    def assert_same_table(self, loaded, built):
+        np.testing.assert_array_equal(loaded.mirror_index, built.mirror_index)
+        self.assertEqual(loaded.report.as_dict(), built.report.as_dict())
+
+    def test_loaded_table_matches_built_table(self):
+        """Test that a table loaded from the cache gives the same table, flipped
+        table and report as a freshly built one."""
+        for engine in ("nearest", "vectorized"):
+            settings = dict(engine=engine, threshold=0.01)
+            cache = table_cache.TableCache(os.path.join(self.directory, engine))
+            built = table.GeometryTable("mesh", **settings)
+            table.GeometryTable("mesh", cache=cache, **settings)
+
+            loaded = table.GeometryTable("mesh", cache=cache, **settings)
+            self.assert_same_table(loaded, built)
+
+            loaded.direction = "negative"
+            built.direction = "negative"
+            self.assert_same_table(loaded, built)
+
+    def test_loaded_table_keeps_candidates(self):
+        """Test that a table of the "nearest" engine loaded from the cache
+        changes its direction and threshold without searching the mirror
+        candidates again."""
+        settings = dict(engine="nearest", threshold=0.01, max_radius=0.1)
+        cache = table_cache.TableCache(self.directory)
+        built = table.GeometryTable("mesh", **settings)
+        table.GeometryTable("mesh", cache=cache, **settings)
+
+        with mock.patch.object(
+            matching, "find_nearest_mirrors", side_effect=AssertionError
+        ):
+            loaded = table.GeometryTable("mesh", cache=cache, **settings)
+
+            loaded.direction = "negative"
+            built.direction = "negative"
+            self.assert_same_table(loaded, built)
+
+            self.assertTrue(loaded.can_filter(0.05))
+            loaded.threshold = 0.05
+            built.threshold = 0.05
+            self.assert_same_table(loaded, built)
@@ -19,4 +19,5 @@ class BaseGUITest(common.BaseTest):
         self.dialog.show()
 
     def tearDown(self):
+        self.connector.teardown()
         self.dialog.close()
@@ -312,6 +312,40 @@ class TestGUI(base_test.BaseGUITest):
 
         self.assertTrue("No action to undo." in captured.records[0].message)
 
+    def test_symmetry_slider_is_throttled(self):
+        """Test that the values of a slider received within a frame are only
+        computed once, and that the last one is computed on release."""
+        mc.select(self.sym_cube)
+        QtTest.QTest.mouseClick(self.gui.get_base_pb, QtCore.Qt.LeftButton)
+
+        mc.select(self.asym_cube)
+        self.gui.symmetry_slider.setValue(50)
+        self.gui.symmetry_slider.setValue(100)
+
+        self.assertEqual(self.connector.ctrl.executor.command.percentage, 50)
+
+        self.gui.symmetry_slider.sliderReleased.emit()
+
+        result = [
+            mc.pointPosition("{}.vtx[{}]".format(self.asym_cube, vtx), world=True)
+            for vtx in range(self.vtx_number)
+        ]
+        self.assertEqual(self.expected_sym_position, result)
+        self.assertEqual(len(self.connector.ctrl.executor.undo_queue), 1)
+
+    def test_threshold_is_debounced(self):
+        """Test that the threshold is only set once it stopped changing, or
+        when a button is clicked."""
+        self.gui.threshold_sb.setValue(0.1)
+        self.gui.threshold_sb.setValue(0.2)
+
+        self.assertEqual(self.connector.ctrl.threshold, 0.001)
+
+        mc.select(self.asym_threshold_cube)
+        QtTest.QTest.mouseClick(self.gui.get_base_pb, QtCore.Qt.LeftButton)
+
+        self.assertEqual(self.connector.ctrl.threshold, 0.2)
+
     def test_flip_no_base(self):
         mc.select(self.asym_cube)
         QtTest.QTest.mouseClick(self.gui.flip_pb, QtCore.Qt.LeftButton)